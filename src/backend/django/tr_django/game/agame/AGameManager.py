@@ -27,11 +27,16 @@ class GameStateError(Exception):
 @add_gamestate
 @add_game_physics
 @add_game_logic
+@add_ball_engine
+@add_continuous_collision
+@add_impact_schedule
 @add_game_flow
 @add_cls_methods
 class AGameManager:
 
     _game_types = {}
+    # straight sides given by vertices/normals, side distances can be vectorized
+    vectorized_sides = False
 
     def __init__(self, game_id):
         self.game_id = game_id
@@ -44,15 +49,58 @@ class AGameManager:
         self.players_key = f"game_players:{game_id}"
         self.running_key = f"game_running:{game_id}"
         self.settings_key = f"game_settings:{game_id}"
-        self.paddles_key = f"game_paddles:{game_id}"
+        self.inputs_key = f"game_inputs:{game_id}"  # paddle input mailbox
+        self.forfeit_key = f"game_forfeit:{game_id}"  # paddle index of a player who left
         self.lock_key = f"game_lock:{game_id}"
         self.type_key = f"game_type:{game_id}"
         self.vertices_key = f"game_vertices:{game_id}"  # New key for vertices
+        self.tick_stats_key = f"game_tick_stats:{game_id}"
+        self.keyframe_key = f"game_keyframe:{game_id}"  # set by joining clients
+        self.frame_clients_key = f"game_frame_clients:{game_id}"  # encoding -> connected clients
+
+        # in-memory game state, owned by the instance running start_game
+        self.state = None
+        self.ticks_since_sync = 0
+        # per tick state validation, see validate_game_state
+        self.validation_mode = "full"
+        self.validation_audit_interval = 1
+        self.ticks_since_audit = 0
+        # simulation ticks of the game, frames are sent every ticks_per_send ticks
+        self.tick = 0
+        self.tick_rate = 60
+        self.ticks_per_send = 1
+        self.last_send_tick = 0
+        self.pending_events = []  # events of the ticks since the last send
+        # ball speeds of the settings are per BASE_TICK_RATE tick
+        self.speed_scale = float(1.0)
+        # client frames, see state_frame: 0 sends every frame as keyframe
+        self.keyframe_interval = 0
+        self.ticks_since_keyframe = 0
+        self.keyframe_requested = False
+        self.frame_reference = None
+        self.frame_encodings = set()  # encodings with connected clients, read every tick
+        self.tick_stats = None  # TickStats of this game, set by the GameScheduler
+        self.paddle_positions = {}  # player index -> position
+        self.paddle_velocities = {}  # player index -> position change per tick (held keys)
+        self.input_acks = {}  # player index -> (last applied input seq, tick)
+        self.forfeit_index = None  # paddle index of a player who left the running game
+        # vectorized ball engine, selected in initialize
+        self.ball_engine = None
+        self.ball_arrays = None
+        self.ball_batch = None
 
         # game physic
         self.outer_boundary = float(1.0)
         self.inner_boundary = None
+        self.side_sectors = None  # angular sector -> sides, see calculate_side_sectors
+        self.sides = []  # Side geometry records, built in initialize
         self.scale = float(1.0)
+        # "discrete" (check end positions) or "continuous" (time of impact)
+        self.collision_mode = "discrete"
+        # speed cap in ball sizes per tick
+        self.max_speed_ratio = float(1.5)
+        # skip the collision checks of balls far from any side
+        self.impact_schedule = False
 
     # TODO: redis closing -> till register_game_type are the methods to solve this-> not solved yet
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -0,0 +1,325 @@
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # optional, games fall back to the dict engine
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class BallArrays:
+    """
+    Structure of arrays for the balls of one game.
+
+    Positions, velocities and sizes live in float64 arrays, which are views
+    into the buffers of a BallBatch, so movement, distances and side distances
+    are computed for all balls (of all batched games) at once. The ball dicts
+    of the game state are only read when the arrays get bound to a state and
+    written back in BallBatch.store(), before the state is serialized.
+    """
+
+    def __init__(self, balls):
+        self.balls = balls
+        self.batch = None  # BallBatch owning the buffers
+        self.x = np.array([ball["x"] for ball in balls], dtype=np.float64)
+        self.y = np.array([ball["y"] for ball in balls], dtype=np.float64)
+        self.vx = np.array([ball["velocity_x"] for ball in balls], dtype=np.float64)
+        self.vy = np.array([ball["velocity_y"] for ball in balls], dtype=np.float64)
+        self.size = np.array([ball["size"] for ball in balls], dtype=np.float64)
+        # position after the movement phase of the last tick
+        self.last_x = self.x.copy()
+        self.last_y = self.y.copy()
+        self.in_deadzone = np.ones(len(balls), dtype=bool)
+        # ticks left before the impact horizon, see impact_schedule.py
+        self.quiet_ticks = np.zeros(len(balls), dtype=np.int64)
+
+    def is_bound_to(self, balls) -> bool:
+        return self.balls is balls and len(balls) == len(self.x)
+
+    def read_ball(self, index):
+        """Take over the changes the dict engine made to one ball"""
+        ball = self.balls[index]
+        self.x[index] = ball["x"]
+        self.y[index] = ball["y"]
+        self.vx[index] = ball["velocity_x"]
+        self.vy[index] = ball["velocity_y"]
+        self.size[index] = ball["size"]
+
+    def write_ball(self, index):
+        """Hand one ball to the dict engine"""
+        ball = self.balls[index]
+        ball["x"] = float(self.x[index])
+        ball["y"] = float(self.y[index])
+        return ball
+
+
+# array phase of a game without balls to check this tick
+QUIET_PHASE = {
+    "active": (),
+    "distances": (),
+    "last_x": (),
+    "last_y": (),
+    "side_values": None,
+}
+
+
+class BallBatch:
+    """
+    Ball buffers of one or more games of the same class, stepped in one
+    vectorized call per tick. The BallArrays of the games are views into the
+    buffers; the static geometry (inner boundary, polygon sides padded to the
+    game with the most sides) is gathered per ball once when the batch is built.
+    """
+
+    FIELDS = (
+        "x",
+        "y",
+        "vx",
+        "vy",
+        "size",
+        "last_x",
+        "last_y",
+        "in_deadzone",
+        "quiet_ticks",
+    )
+
+    def __init__(self, games):
+        """
+        Args:
+            games (list): (game_manager, state) pairs
+        """
+        self.games = [game for game, _ in games]
+        self.arrays = [game.bind_ball_arrays(state) for game, state in games]
+        counts = [len(ball_arrays.x) for ball_arrays in self.arrays]
+        self.starts = np.cumsum([0] + counts[:-1]).tolist()
+        ends = np.cumsum(counts).tolist()
+        for name in self.FIELDS:
+            buffer = np.concatenate([getattr(ball_arrays, name) for ball_arrays in self.arrays])
+            setattr(self, name, buffer)
+            for ball_arrays, start, end in zip(self.arrays, self.starts, ends):
+                setattr(ball_arrays, name, buffer[start:end])
+        for ball_arrays in self.arrays:
+            ball_arrays.batch = self
+        self.balls = [ball for ball_arrays in self.arrays for ball in ball_arrays.balls]
+
+        self.game_of_ball = np.repeat(np.arange(len(games)), counts)
+        self.inner_offset = np.repeat(
+            [
+                game.inner_boundary - state["dimensions"]["paddle_width"]
+                for game, state in games
+            ],
+            counts,
+        )
+        self.num_sides = [game.num_sides for game in self.games]
+        self.max_sides = max(self.num_sides)
+        self.vertices = None
+        self.normals = None
+        if self.games[0].vectorized_sides:
+            vertices = np.zeros((len(games), self.max_sides, 2))
+            normals = np.zeros((len(games), self.max_sides, 2))
+            for index, game in enumerate(self.games):
+                vertices[index, : game.num_sides] = game.vertex_array
+                normals[index, : game.num_sides] = game.normal_array
+            self.vertices = vertices[self.game_of_ball]
+            self.normals = normals[self.game_of_ball]
+
+    def is_current(self, games) -> bool:
+        """Built for exactly these games and their current states"""
+        return len(games) == len(self.games) and all(
+            game is batched
+            and ball_arrays.batch is self
+            and game.ball_arrays is ball_arrays
+            and ball_arrays.is_bound_to(state["balls"])
+            for (game, state), batched, ball_arrays in zip(
+                games, self.games, self.arrays
+            )
+        )
+
+    def step(self):
+        """
+        Movement and boundary phase of all balls of the batch.
+
+        Returns:
+            list: per game the array phase for vectorized_game_logic: the
+            indices of the balls that need the per-ball collision pipeline,
+            with their distance to center, position of the last tick and
+            side values
+        """
+        x = self.x
+        y = self.y
+        # Movement Phase
+        x += self.vx
+        y += self.vy
+
+        # Boundary Phase
+        distances = np.sqrt(x * x + y * y)
+        dx = x - self.last_x
+        dy = y - self.last_y
+        movement = np.sqrt(dx * dx + dy * dy)
+        inner_boundary = (self.inner_offset - self.size) * 0.8  # get_inner_boundary
+        # quiet: stays in the deadzone without jumping over it, or before its
+        # impact horizon -> nothing to check
+        active = np.flatnonzero(
+            ~(
+                (distances < inner_boundary) & self.in_deadzone & (movement <= inner_boundary)
+                | (self.quiet_ticks > 0)
+            )
+        )
+        np.maximum(self.quiet_ticks - 1, 0, out=self.quiet_ticks)
+
+        phases = [QUIET_PHASE] * len(self.games)
+        if active.size:
+            # Collision Candidate Phase: side distances of the active balls
+            side_values = None
+            if self.vertices is not None:
+                vertices = self.vertices[active]
+                normals = self.normals[active]
+                signed = (x[active, None] - vertices[:, :, 0]) * normals[:, :, 0] + (
+                    y[active, None] - vertices[:, :, 1]
+                ) * normals[:, :, 1]
+                dots = (
+                    self.vx[active, None] * normals[:, :, 0]
+                    + self.vy[active, None] * normals[:, :, 1]
+                )
+                side_values = list(zip(signed.tolist(), dots.tolist()))
+
+            games_of_active = self.game_of_ball[active]
+            bounds = (np.flatnonzero(np.diff(games_of_active)) + 1).tolist()
+            active_games = games_of_active.tolist()
+            active_list = active.tolist()
+            distances = distances[active].tolist()
+            last_x = self.last_x[active].tolist()
+            last_y = self.last_y[active].tolist()
+            for first, last in zip([0] + bounds, bounds + [len(active_list)]):
+                index = active_games[first]
+                start = self.starts[index]
+                num_sides = self.num_sides[index]
+                game_side_values = None
+                if side_values:
+                    game_side_values = side_values[first:last]
+                    if num_sides != self.max_sides:
+                        game_side_values = [
+                            (ball_signed[:num_sides], ball_dots[:num_sides])
+                            for ball_signed, ball_dots in game_side_values
+                        ]
+                phases[index] = {
+                    "active": [ball - start for ball in active_list[first:last]],
+                    "distances": distances[first:last],
+                    "last_x": last_x[first:last],
+                    "last_y": last_y[first:last],
+                    "side_values": game_side_values,
+                }
+
+        self.last_x[:] = x
+        self.last_y[:] = y
+        return phases
+
+    def store(self):
+        """Write all balls back into the state dicts"""
+        for ball, x, y, vx, vy in zip(
+            self.balls,
+            self.x.tolist(),
+            self.y.tolist(),
+            self.vx.tolist(),
+            self.vy.tolist(),
+        ):
+            ball["x"] = x
+            ball["y"] = y
+            ball["velocity_x"] = vx
+            ball["velocity_y"] = vy
+
+
+def setup_ball_engine(self):
+    """
+    Select the ball engine from settings["ball_engine"]:
+    "python" -> dict engine, "numpy" -> vectorized engine,
+    "auto" -> vectorized from ball_engine_min_balls balls on, if numpy is installed
+    The continuous collision mode always uses the dict engine.
+    """
+    self.ball_engine = None
+    self.ball_arrays = None
+    self.ball_batch = None
+    engine = self.settings.get("ball_engine", "auto")
+    if engine == "python" or self.settings.get("collision_mode") == "continuous":
+        return
+    if np is None:
+        if engine == "numpy":
+            logger.warning(f"{self.game_id}: numpy not installed, using the dict ball engine")
+        return
+    if engine == "auto" and self.settings.get("num_balls", 1) < self.settings.get(
+        "ball_engine_min_balls", 2
+    ):
+        return
+    self.ball_engine = "numpy"
+    if self.vectorized_sides:
+        self.vertex_array = np.array(
+            [[vertex["x"], vertex["y"]] for vertex in self.vertices], dtype=np.float64
+        )
+        self.normal_array = np.array(
+            [[normal["x"], normal["y"]] for normal in self.side_normals],
+            dtype=np.float64,
+        )
+
+
+def bind_ball_arrays(self, state):
+    """Ball arrays of the state, rebuilt when the state was replaced"""
+    if self.ball_arrays is None or not self.ball_arrays.is_bound_to(state["balls"]):
+        arrays = BallArrays(state["balls"])
+        movements = self.previous_movements
+        for index in range(min(len(arrays.x), len(movements))):
+            arrays.in_deadzone[index] = movements.in_deadzone[index]
+            if movements.has_last_position[index]:
+                arrays.last_x[index] = movements.last_x[index]
+                arrays.last_y[index] = movements.last_y[index]
+        self.ball_arrays = arrays
+    return self.ball_arrays
+
+
+async def vectorized_game_logic(self, new_state, cycle_data, array_phase=None):
+    """
+    game_logic for the vectorized engine.
+    Movement and boundary phase run on the arrays (BallBatch.step); only balls
+    outside the quiet deadzone go through the dict engine (process_ball).
+    With array_phase given the game is part of a batch stepped by the caller,
+    which also stores the batch into the state dicts afterwards.
+    Returns True if the game is over.
+    """
+    batch = None
+    if array_phase is None:
+        batch = self.ball_batch
+        if batch is None or not batch.is_current([(self, new_state)]):
+            batch = self.ball_batch = BallBatch([(self, new_state)])
+        array_phase = batch.step()[0]
+    arrays = self.ball_arrays
+    movements = self.previous_movements
+    side_values = array_phase["side_values"]
+
+    game_over = False
+    for n, ball_index in enumerate(array_phase["active"]):
+        ball = arrays.write_ball(ball_index)
+        movements.set_last_position(
+            ball_index, array_phase["last_x"][n], array_phase["last_y"][n]
+        )
+        game_over = await self.process_ball(
+            ball_index,
+            ball,
+            array_phase["distances"][n],
+            new_state,
+            cycle_data,
+            side_values[n] if side_values else None,
+        )
+        arrays.read_ball(ball_index)
+        arrays.in_deadzone[ball_index] = movements.in_deadzone[ball_index]
+        if not movements.has_last_position[ball_index]:
+            arrays.last_x[ball_index] = ball["x"]
+            arrays.last_y[ball_index] = ball["y"]
+        if game_over:
+            break
+        if self.impact_schedule:
+            arrays.quiet_ticks[ball_index] = self.schedule_ball(
+                ball_index, ball, new_state
+            )
+    if batch is not None:
+        batch.store()
+    return game_over
@@ -0,0 +1,85 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# a ball counts as missed when its center is this many ball sizes (radius)
+# in front of the goal line, i.e. it is half across
+MISS_DEPTH = 0.5
+# impacts resolved per ball and tick, the rest of the tick is dropped after
+MAX_IMPACTS = 4
+
+
+async def sweep_ball(self, ball_index, ball, new_state, cycle_data):
+    """
+    Continuous collision mode: move the ball through the tick and resolve
+    every impact at its exact time of impact (find_time_of_impact), instead
+    of checking the end position and recovering from tunneling.
+
+    Returns:
+        bool: True if the game is over
+    """
+    remaining = 1.0
+    for _ in range(MAX_IMPACTS):
+        impact = self.find_time_of_impact(ball, remaining, new_state)
+        if impact is None:
+            break
+        time_of_impact, collision_candidate = impact
+        ball["x"] += ball["velocity_x"] * remaining * time_of_impact
+        ball["y"] += ball["velocity_y"] * remaining * time_of_impact
+        remaining *= 1.0 - time_of_impact
+
+        if collision_candidate.side_index in self.active_sides:
+            collision = self.handle_paddle(ball, collision_candidate, new_state)
+        else:
+            collision = self.handle_wall(ball, collision_candidate, new_state)
+        if not collision:
+            break
+        collision_result = self.collision_handler(
+            collision, ball, new_state, cycle_data, ball_index
+        )
+        if collision_result.get("game_over"):
+            from game.gamecoordinator.GameCoordinator import GameCoordinator
+
+            await GameCoordinator.set_to_finished_game(self.game_id)
+            return True
+        if collision["type"] == "miss":
+            # ball was reset to the center
+            return False
+    else:
+        logger.debug(f"{self.game_id}/ball[{ball_index}]: impact limit reached")
+        return False
+
+    ball["x"] += ball["velocity_x"] * remaining
+    ball["y"] += ball["velocity_y"] * remaining
+    return False
+
+
+def contact_planes(self, ball, side_index, new_state):
+    """
+    Distances of the ball center to a side at which something happens, in the
+    order the ball reaches them: (distance, kind)
+    """
+    if side_index in self.active_sides:
+        return (
+            (ball["size"] + new_state["dimensions"]["paddle_width"], "paddle"),
+            (ball["size"] * MISS_DEPTH, "goal"),
+        )
+    return ((ball["size"], "wall"),)
+
+
+def paddle_covers(self, new_state, side_index, relative_position):
+    """Is the point (0-1 along the side) covered by the side's paddle"""
+    paddle_half_length = new_state["dimensions"]["paddle_length"] / 2.0
+    paddle_center = new_state["paddles"][side_index]["position"]
+    return abs(relative_position - paddle_center) <= paddle_half_length
+
+
+def find_time_of_impact(self, ball, remaining, new_state):
+    """
+    Earliest impact of the ball moving for `remaining` of a tick.
+
+    Returns:
+        tuple: (time of impact as fraction of remaining, collision_candidate)
+        or None
+    """
+    raise NotImplementedError("Subclasses must implement this: find_time_of_impact!")
@@ -0,0 +1,108 @@
+import copy
+import json
+import msgpack
+
+# websocket subprotocol of clients that take msgpack frames (float32 coordinates)
+BINARY_SUBPROTOCOL = "pong.msgpack"
+# frame encodings, the game loop only encodes the ones with connected clients
+JSON_FRAMES = "json"
+BINARY_FRAMES = "msgpack"
+# seconds a keyframe request of a joining client waits for the game loop,
+# the first frame of a game is a keyframe anyway
+KEYFRAME_REQUEST_EXPIRY = 10
+
+
+def frame_group(game_id, encoding):
+    """Channel layer group of the clients of a game that take `encoding` frames"""
+    return f"game_{game_id}_{encoding}"
+
+
+def json_default(value):
+    """json.dumps fallback, the conversions of PongConsumer.sanitize_for_json"""
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8")
+    if hasattr(value, "to_dict"):  # value_types records
+        return value.to_dict()
+    if hasattr(value, "item"):  # numpy types
+        return value.item()
+    return str(value)
+
+
+def encode_frame(message):
+    """
+    Encode a client message once in the game loop. The consumers of the game
+    group send the text as it is, instead of sanitizing and encoding the
+    same state for every connection.
+    """
+    return json.dumps(message, default=json_default)
+
+
+def msgpack_default(value):
+    """msgpack fallback for the types json_default converts"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def encode_binary_frame(message):
+    """
+    Encode a client message for BINARY_SUBPROTOCOL clients: msgpack with all
+    floats packed as float32, about half the size of the JSON text.
+    """
+    return msgpack.packb(message, use_single_float=True, default=msgpack_default)
+
+
+def snapshot_state(state):
+    """
+    Copy of a broadcast state, the reference the next delta is taken against.
+    The game logic builds a new state dict every tick, nested values are
+    copied so later changes can not leak into the reference.
+    """
+    reference = {}
+    for key, value in state.items():
+        if key in ("balls", "paddles"):
+            reference[key] = [dict(item) for item in value]
+        else:
+            reference[key] = copy.deepcopy(value)
+    return reference
+
+
+def state_delta(reference, state):
+    """
+    Changes of `state` against `reference` (a snapshot_state), the reference
+    is updated to `state` on the way.
+
+    The delta holds the top level values that changed (scores, game_time, ...),
+    balls and paddles as {index: {field: value}} with the changed fields of
+    the changed items only - mostly the ball positions.
+
+    Returns:
+        dict or None: the delta, None if the shape of the state changed
+        (keys removed, different ball or paddle count) and a keyframe is needed
+    """
+    if reference.keys() - state.keys():
+        return None
+    delta = {}
+    for key, value in state.items():
+        if key in ("balls", "paddles"):
+            previous_items = reference.get(key)
+            if previous_items is None or len(previous_items) != len(value):
+                return None
+            items = {}
+            for index, (previous, item) in enumerate(zip(previous_items, value)):
+                changes = {
+                    field: field_value
+                    for field, field_value in item.items()
+                    if field not in previous or previous[field] != field_value
+                }
+                if changes:
+                    items[index] = changes
+                    previous.update(changes)
+            if items:
+                delta[key] = items
+        elif key not in reference or reference[key] != value:
+            delta[key] = value
+            reference[key] = copy.deepcopy(value)
+    return delta
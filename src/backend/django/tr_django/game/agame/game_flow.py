@@ -1,11 +1,20 @@
-import redis.asyncio as redis
 import msgpack
 import asyncio
 from .AGameManager import GameStateError
-import math
 from ..gamecoordinator.GameCoordinator import GameCoordinator, RedisLock
 import logging
 import time
+from .game_scheduler import GameScheduler
+from .paddle import MAX_INPUTS_PER_TICK
+from .frames import (
+    BINARY_FRAMES,
+    JSON_FRAMES,
+    encode_frame,
+    encode_binary_frame,
+    frame_group,
+    snapshot_state,
+    state_delta,
+)
 
 
 
@@ -49,15 +58,6 @@ async def start_game(self):
         players = self.settings.get("num_players")
         await GameCoordinator.set_to_waiting_game(self.game_id)
 
-        
-        redis_str = await GameCoordinator.get_redis(GameCoordinator.REDIS_GAME_URL)
-        redis_bin = await GameCoordinator.get_redis_binary(GameCoordinator.REDIS_GAME_URL)        
-
-        # Use async context managers for both Redis connections
-        # async with await GameCoordinator.get_redis(GameCoordinator.REDIS_GAME_URL) as redis_str, \
-        #          await GameCoordinator.get_redis_binary(GameCoordinator.REDIS_GAME_URL) as redis_bin:
-
-
         while True:
             async with RedisLock(self.redis_conn, f"{self.game_id}_player_situation"):
                 player_count = await self.redis_conn.scard(self.players_key)
@@ -114,13 +114,17 @@ async def start_game(self):
             await asyncio.sleep(1) 
 
         await GameCoordinator.set_to_running_game(self.game_id)
+        # from here on the state lives in memory, redis gets write-behind snapshots
+        await self.load_game_state()
 
-        while await self.redis_conn.get(self.running_key) == b"1":
-            game_over = await self.update_game()
-            if game_over:
-                await self.end_game()  # can be sync not async !
-                break
-            await asyncio.sleep(0.016)  # ~60 FPS
+        # all games of this process are stepped by one shared fixed-timestep ticker
+        scheduler = GameScheduler.get(
+            self.settings.get("tick_rate", 60),
+            self.settings.get("max_catchup_steps", 4),
+        )
+        game_over = await scheduler.run_game(self)
+        if game_over:
+            await self.end_game()  # can be sync not async !
     except Exception as e:
         logger.error(f"Error in start_game: {e}")
         await self.error_exit("Error in start_game" , f"{e}")
@@ -139,108 +143,85 @@ async def end_game(self):
         logger.error(f"Error ending game: {e}")
         await self.error_exit("Error in ending game" , f"{e}")
 
-async def update_game(self):
-    """Process-safe game update with enhanced error handling"""
+def state_frame(self, state):
+    """
+    Client frame of a send tick: a full game_state keyframe every
+    keyframe_interval frames and when a client joined, in between a game_delta with the changes
+    against the last frame (see frames.state_delta).
+    """
+    delta = None
+    if (
+        self.frame_reference is not None
+        and not self.keyframe_requested
+        and self.ticks_since_keyframe < self.keyframe_interval
+    ):
+        delta = state_delta(self.frame_reference, state)
+    if delta is None:
+        self.frame_reference = snapshot_state(state)
+        self.keyframe_requested = False
+        self.ticks_since_keyframe = 1
+        return {"type": "game_state", "game_state": state}
+    self.ticks_since_keyframe += 1
+    return {"type": "game_delta", "delta": delta}
+
+
+def queue_tick_reads(self, pipeline):
+    """
+    Queue the redis reads one tick needs into a shared pipeline.
+    The GameScheduler executes the pipeline once for all games of the process.
+    """
+    pipeline.get(self.running_key)
+    pipeline.lpop(self.inputs_key, MAX_INPUTS_PER_TICK)
+    pipeline.getdel(self.keyframe_key)
+    pipeline.hgetall(self.frame_clients_key)
+    pipeline.getdel(self.forfeit_key)
+    return 5
+
+
+def apply_tick_reads(self, results):
+    """Apply the results of queue_tick_reads, returns if the game is still running"""
+    running, inputs, keyframe, frame_clients, forfeit = results
+    self.apply_paddle_inputs(inputs)
+    if forfeit is not None:
+        # applied to the in-memory state in advance_game, ends the game
+        self.forfeit_index = int(forfeit)
+    if keyframe:
+        # a client joined and needs the full state
+        self.keyframe_requested = True
+    self.frame_encodings = {
+        encoding.decode() if isinstance(encoding, bytes) else encoding
+        for encoding, count in frame_clients.items()
+        if int(count) > 0
+    }
+    return running == b"1"
+
+
+def message_group(self, message):
+    """Channel layer group of a broadcast message, frames only go to the clients of their encoding"""
+    if "binary_frame" in message:
+        return frame_group(self.game_id, BINARY_FRAMES)
+    if "frame" in message:
+        return frame_group(self.game_id, JSON_FRAMES)
+    return f"game_{self.game_id}"
+
+
+async def update_game(self, steps=1):
+    """
+    Process-safe game update with enhanced error handling.
+    Runs `steps` simulation steps (more than 1 when the tick clock catches up)
+    and broadcasts the resulting state once.
+    Standalone version of one scheduler tick for a single game.
+    """
 
     try:
-        # Get current state with error handling
-        try:
-            state_data = await self.redis_conn.get(self.state_key)
-            current_state = msgpack.unpackb(state_data) if state_data else None
-        except msgpack.UnpackException as e:
-            logger.error(f"Error unpacking game state: {e}")
-            await self.channel_layer.group_send(
-                f"game_{self.game_id}",
-                {
-                    "type": "error",
-                    "error": "Game state corruption detected",
-                    "details": str(e),
-                },
-            )
-            return False
-
-        if not current_state:
-            await self.channel_layer.group_send(
-                f"game_{self.game_id}",
-                {
-                    "type": "error",
-                    "error": "Game state not found",
-                },
-            )
-            return False
-
-        # Verify state before proceeding
-        try:
-            self.verify_game_state(current_state)
-        except GameStateError as e:
-            logger.error(f"Game state validation error: {e}")
-            await self.channel_layer.group_send(
-                f"game_{self.game_id}",
-                {
-                    "type": "error",
-                    "error": "Invalid game state detected",
-                    "details": str(e),
-                },
-            )
-            return False
-
-        # Update paddle positions in state
-        paddle_positions = await self.get_paddle_positions()
-        active_paddle_count = 0
-        for paddle in current_state["paddles"]:
-            if paddle["active"]:
-                paddle["position"] = paddle_positions.get(active_paddle_count, 0.5)
-                active_paddle_count += 1
-        # Run game logic
-        new_state, game_over, cycle_data = await self.game_logic(current_state)
-
-        # Verify new state
-        try:
-            self.verify_game_state(new_state)
-        except GameStateError as e:
-            logger.error(f"New game state validation error: {e}")
-            await self.channel_layer.group_send(
-                f"game_{self.game_id}",
-                {
-                    "type": "error",
-                    "error": "Game logic produced invalid state",
-                    "details": str(e),
-                },
-            )
-            return False
-
-        # Save new state
-        try:
-            packed_state = msgpack.packb(new_state)
-            await self.redis_conn.set(self.state_key, packed_state)
-        except Exception as e:
-            logger.error(f"Error saving game state: {e}")
-            await self.channel_layer.group_send(
-                f"game_{self.game_id}",
-                {
-                    "type": "error",
-                    "error": "Failed to save game state",
-                    "details": str(e),
-                },
-            )
-            return False
-
-        # Broadcast update
-        winner = self.check_winner(new_state["scores"]) if game_over else None
-        await self.channel_layer.group_send(
-            f"game_{self.game_id}",
-            {
-                "type": "game_finished" if game_over else "game_state",
-                "game_state": new_state,
-                "winner": winner,
-            },
-        )
-        if len(cycle_data["events"]) > 0:
-            await self.channel_layer.group_send(
-                f"game_{self.game_id}",
-                {"type": "game_collision", "data": cycle_data["events"]},
-            )
-
+        pipeline = self.redis_conn.pipeline(transaction=False)
+        self.queue_tick_reads(pipeline)
+        self.apply_tick_reads(await pipeline.execute())
+        pipeline = self.redis_conn.pipeline()
+        game_over, messages = await self.advance_game(steps, pipeline)
+        await pipeline.execute()
+        for message in messages:
+            await self.channel_layer.group_send(self.message_group(message), message)
         return game_over
 
     except Exception as e:
@@ -249,5 +230,182 @@ async def update_game(self):
         return False
 
 
+async def advance_game(self, steps, pipeline):
+    """
+    Run `steps` simulation steps on the in-memory state.
+    No I/O of its own: redis writes are queued into `pipeline`, channel layer
+    messages are returned, so the caller can batch both across games.
+
+    Returns:
+        tuple: (game_over, messages)
+    """
+    current_state, messages = await self.prepare_advance()
+    if messages:
+        return False, messages
+
+    # Run game logic, a forfeit applied in prepare_advance ends the game right away
+    previous_scores = list(current_state["scores"])
+    new_state = current_state
+    events = []
+    game_over = self.apply_forfeit(current_state)
+    for _ in range(0 if game_over else steps):
+        self.move_paddles(new_state)
+        new_state, game_over, step_data = await self.game_logic(new_state)
+        self.tick += 1
+        events.extend(step_data["events"])
+        if game_over:
+            break
+
+    messages = await self.complete_advance(
+        new_state, game_over, events, previous_scores, pipeline
+    )
+    return game_over, messages
+
+
+async def prepare_advance(self):
+    """
+    First part of advance_game: get and verify the in-memory state and apply
+    the paddle positions of this tick.
+
+    Returns:
+        tuple: (state, error messages)
+    """
+    messages = []
+
+    # Get current state - in-memory, only loaded from redis if not there yet
+    loaded = False
+    try:
+        current_state = self.state
+        if current_state is None:
+            current_state = await self.load_game_state()
+            loaded = True
+    except msgpack.UnpackException as e:
+        logger.error(f"Error unpacking game state: {e}")
+        messages.append(
+            {
+                "type": "error",
+                "error": "Game state corruption detected",
+                "details": str(e),
+            }
+        )
+        return None, messages
+
+    if not current_state:
+        messages.append(
+            {
+                "type": "error",
+                "error": "Game state not found",
+            }
+        )
+        return None, messages
 
+    # Verify state before proceeding - the in-memory state was validated
+    # when it was kept at the end of the last tick
+    try:
+        if loaded:
+            self.verify_game_state(current_state)
+    except GameStateError as e:
+        logger.error(f"Game state validation error: {e}")
+        messages.append(
+            {
+                "type": "error",
+                "error": "Invalid game state detected",
+                "details": str(e),
+            }
+        )
+        return None, messages
+
+    # Update paddle positions in state
+    if loaded:
+        # positions of the last snapshot until the players move
+        active_paddles = [paddle for paddle in current_state["paddles"] if paddle["active"]]
+        for index, paddle in enumerate(active_paddles):
+            self.paddle_positions.setdefault(index, paddle["position"])
+    self.apply_paddle_positions(current_state)
+    return current_state, messages
+
+
+async def complete_advance(self, new_state, game_over, events, previous_scores, pipeline):
+    """
+    Last part of advance_game: verify and keep the new state, queue the
+    write-behind into `pipeline` and build the broadcast messages.
+    """
+    messages = []
+
+    # Verify new state
+    try:
+        self.validate_game_state(new_state)
+    except GameStateError as e:
+        logger.error(f"New game state validation error: {e}")
+        messages.append(
+            {
+                "type": "error",
+                "error": "Game logic produced invalid state",
+                "details": str(e),
+            }
+        )
+        return messages
 
+    # Keep new state in memory, write-behind to redis
+    previous_state = self.state
+    try:
+        self.state = new_state
+        score_changed = new_state["scores"] != previous_scores
+        await self.sync_game_state(force=game_over or score_changed, pipeline=pipeline)
+    except GameStateError as e:
+        # the state could not be packed, keep the last good one
+        self.state = previous_state
+        logger.error(f"New game state validation error: {e}")
+        messages.append(
+            {
+                "type": "error",
+                "error": "Game logic produced invalid state",
+                "details": str(e),
+            }
+        )
+        return messages
+    except Exception as e:
+        logger.error(f"Error saving game state: {e}")
+        messages.append(
+            {
+                "type": "error",
+                "error": "Failed to save game state",
+                "details": str(e),
+            }
+        )
+        return messages
+
+    # Broadcast update at the send rate, encoded once for all consumers of the group
+    self.pending_events.extend(events)
+    if not game_over and self.tick - self.last_send_tick < self.ticks_per_send:
+        return messages
+    self.last_send_tick = self.tick
+    events, self.pending_events = self.pending_events, []
+    server_time = time.time()
+    if game_over:
+        messages.append(
+            {
+                "type": "game_finished",
+                "game_state": new_state,
+                "winner": self.check_winner(new_state["scores"]),
+                "events": events,
+            }
+        )
+    elif self.frame_encodings:
+        frame = self.state_frame(new_state)
+        # server tick and time of the frame, for the interpolation of the clients
+        frame["tick"] = self.tick
+        frame["server_time"] = server_time
+        if events:
+            # collision events of the ticks since the last frame
+            frame["events"] = events
+        if self.input_acks:
+            # last applied input seq per player, for the client prediction
+            frame["inputs"] = self.input_acknowledgements()
+        # encoded once per encoding that has clients
+        if JSON_FRAMES in self.frame_encodings:
+            messages.append({"type": "game_state", "frame": encode_frame(frame)})
+        if BINARY_FRAMES in self.frame_encodings:
+            messages.append({"type": "game_state", "binary_frame": encode_binary_frame(frame)})
+
+    return messages
@@ -14,72 +14,113 @@ def initialize_cycle_data(self):
         "events": [],
         "highest_distance": 0,
         "state_updates": {},
-        "collision_data": [],
     }
 
 
-async def game_logic(self, current_state):
+async def game_logic(self, current_state, array_phase=None):
     """
     Main game logic orchestrator that uses the Step methods.
+    array_phase: movement/boundary phase already run by a BallBatch
+    (vectorized engine only)
     Returns (new_state, game_over, cycle_data)
     """
     game_over = False
     new_state = current_state.copy()
-    logger.debug(f"{self.game_id}: {new_state}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{self.game_id}: {new_state}")
     cycle_data = self.initialize_cycle_data()
     try:
+        if self.collision_mode == "continuous":
+            for ball_index, ball in enumerate(new_state["balls"]):
+                if self.impact_schedule and self.skip_to_horizon(ball_index, ball):
+                    continue
+                if await self.sweep_ball(ball_index, ball, new_state, cycle_data):
+                    game_over = True
+                    break
+                if self.impact_schedule:
+                    self.schedule_ball(ball_index, ball, new_state)
+            return new_state, game_over, cycle_data
+        if self.ball_engine is not None:
+            # vectorized movement/boundary phase, see ball_engine.py
+            game_over = await self.vectorized_game_logic(
+                new_state, cycle_data, array_phase
+            )
+            return new_state, game_over, cycle_data
         for ball_index, ball in enumerate(new_state["balls"]):
+            # nothing to check before the impact horizon, see impact_schedule.py
+            if self.impact_schedule and self.skip_to_horizon(ball_index, ball):
+                continue
             # Movement Phase
             self.move_ball(ball)
             # Boundary Phase
             distance_from_center = self.get_distance(ball)
             # self.update_distance_metrics(distance_from_center, cycle_data)
-            logger.debug(f"{self.game_id}/ball[{ball_index}]: {distance_from_center} / ball ({ball['x']} / {ball['x']})")
-            boundary_check = self.handle_distance_check(
+            if await self.process_ball(
                 ball_index, ball, distance_from_center, new_state, cycle_data
-            )
-            if boundary_check.get("skip_ball"):
-                if boundary_check.get("game_over"):
-                    game_over = True
-                    # self.add_game_over_event(cycle_data, new_state)
-                    break
-                continue
-
-            # if ball should be.
-            # Collision Candidate Phase
-            collision_candidate = self.find_collision_candidate(
-                ball, ball_index, new_state, distance_from_center
-            )
-            if not collision_candidate:
-                continue
-
-            # Collision Verification Phase
-            verified_collision = self.verify_collision_candidate(
-                ball, collision_candidate, new_state
-            )
-            if not verified_collision:
-                continue
-            logger.debug(
-                f"{self.game_id}/ball[{ball_index}]colliosion: {verified_collision}"
-            )
-            # Impact Processing Phase
-            collision_result = self.collision_handler(
-                verified_collision, ball, new_state, cycle_data, ball_index
-            )
-            if not collision_result:
-                continue
-            if collision_result.get("game_over"):
-                from game.gamecoordinator.GameCoordinator import GameCoordinator
-                await GameCoordinator.set_to_finished_game(self.game_id)
+            ):
                 game_over = True
-                
                 break
+            if self.impact_schedule:
+                self.schedule_ball(ball_index, ball, new_state)
         return new_state, game_over, cycle_data
     except Exception as e:
         logger.error(f"Error in game_logic: {e}")
         raise
 
 
+async def process_ball(
+    self, ball_index, ball, distance_from_center, new_state, cycle_data, side_values=None
+):
+    """
+    Boundary, collision and impact phase of one moved ball.
+    side_values: optional (signed_distances, dot_products) per side, precomputed
+    by the vectorized engine
+    Returns True if the game is over
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{self.game_id}/ball[{ball_index}]: {distance_from_center} / ball ({ball['x']} / {ball['x']})")
+    boundary_check = self.handle_distance_check(
+        ball_index, ball, distance_from_center, new_state, cycle_data
+    )
+    if boundary_check.get("skip_ball"):
+        return boundary_check.get("game_over", False)
+        # self.add_game_over_event(cycle_data, new_state)
+
+    # if ball should be.
+    # Collision Candidate Phase
+    if side_values is None:
+        collision_candidate = self.find_collision_candidate(
+            ball, ball_index, new_state, distance_from_center
+        )
+    else:
+        collision_candidate = self.find_collision_candidate(
+            ball, ball_index, new_state, distance_from_center, side_values
+        )
+    if not collision_candidate:
+        return False
+
+    # Collision Verification Phase
+    verified_collision = self.verify_collision_candidate(
+        ball, collision_candidate, new_state
+    )
+    if not verified_collision:
+        return False
+    logger.debug(
+        f"{self.game_id}/ball[{ball_index}]colliosion: {verified_collision}"
+    )
+    # Impact Processing Phase
+    collision_result = self.collision_handler(
+        verified_collision, ball, new_state, cycle_data, ball_index
+    )
+    if not collision_result:
+        return False
+    if collision_result.get("game_over"):
+        from game.gamecoordinator.GameCoordinator import GameCoordinator
+        await GameCoordinator.set_to_finished_game(self.game_id)
+        return True
+    return False
+
+
 # Movement Phase
 def move_ball(self, ball):
     """Move ball according to its velocity"""
@@ -110,13 +151,15 @@ def handle_distance_check(self, ball_index, ball, distance, state, cycle_data):
 
     inner_boundary = self.get_inner_boundary(state, ball)
 
+    movements = self.previous_movements
     # Get current deadzone state
-    was_in_deadzone = self.previous_movements[ball_index]["in_deadzone"]
+    was_in_deadzone = movements.in_deadzone[ball_index]
     is_in_deadzone = distance < inner_boundary
     # Calculate ball movement distance since last frame
-    prev_pos = self.previous_movements[ball_index].get(
-        "last_position", {"x": ball["x"], "y": ball["y"]}
-    )
+    if movements.has_last_position[ball_index]:
+        prev_pos = {"x": movements.last_x[ball_index], "y": movements.last_y[ball_index]}
+    else:
+        prev_pos = {"x": ball["x"], "y": ball["y"]}
     movement_distance = math.sqrt(
         (ball["x"] - prev_pos["x"]) ** 2 + (ball["y"] - prev_pos["y"]) ** 2
     )
@@ -144,13 +187,10 @@ def handle_distance_check(self, ball_index, ball, distance, state, cycle_data):
         self.reset_ball_movement(ball_index)
     # When exiting, just update the state
     elif was_in_deadzone and not is_in_deadzone:
-        self.previous_movements[ball_index]["in_deadzone"] = False
+        movements.in_deadzone[ball_index] = False
         logger.debug(f"{self.game_id}/ball[{ball_index}]: out of deadzone")
     # Store current position for next frame's comparison
-    self.previous_movements[ball_index]["last_position"] = {
-        "x": ball["x"],
-        "y": ball["y"],
-    }
+    movements.set_last_position(ball_index, ball["x"], ball["y"])
 
     if distance > self.outer_boundary:
         collision = self.handle_outside_boundary(ball, state)
@@ -188,14 +228,14 @@ def get_inner_boundary(self, state, ball):
 # Collision Verification Phase
 def verify_collision_candidate(self, ball, collision_candidate, new_state):
     """Handle interaction between ball and side"""
-    if collision_candidate["type"] == "tunneling":
+    if collision_candidate.type == "tunneling":
         return self.handle_tunneling(ball, collision_candidate, new_state)
 
     collision, active = self.get_collision_check_range(
         ball, collision_candidate, new_state
     )
     if collision:
-        if collision_candidate["type"] == "parallel":
+        if collision_candidate.type == "parallel":
             # Case 1: Ball moving parallel to side
             return self.handle_parallel(
                 ball, collision_candidate, new_state
@@ -212,11 +252,11 @@ def verify_collision_candidate(self, ball, collision_candidate, new_state):
 
 def get_collision_check_range(self, ball, collision_candidate, new_state):
 
-    side_index = collision_candidate["side_index"]
-    movement = collision_candidate["movement"]
+    side_index = collision_candidate.side_index
+    movement = collision_candidate.movement
 
     # Get basic collision parameters
-    collision_distance = movement["current_distance"]
+    collision_distance = movement.current_distance
     is_active_side = side_index in self.active_sides
 
     # Calculate collision threshold based on side type
@@ -237,13 +277,13 @@ def handle_parallel(self, ball, collision_candidate, new_state):
 
     Args:
         ball (dict): Ball object with position and size
-        collision_candidate (dict): Contains sector info like side_index, movement, projection
+        collision_candidate (CollisionCandidate): Contains sector info like side_index, movement, projection
         new_state (dict): Current game state with dimensions
 
     Returns:
         dict: Complete collision info with enhanced debugging info
     """
-    side_index = collision_candidate["side_index"]
+    side_index = collision_candidate.side_index
 
     # Check if this is a paddle side
     if side_index in self.active_sides:
@@ -263,10 +303,12 @@ def collision_handler(self, collision, ball, new_state, cycle_data, ball_index):
     if collision:
         if collision["type"] == "paddle":
             gameover.update(
-                self.collision_paddle(collision, ball, new_state, cycle_data)
+                self.collision_paddle(collision, ball, new_state, cycle_data, ball_index)
             )
         elif collision["type"] == "wall":
-            gameover.update(self.collision_wall(collision, ball, new_state, cycle_data))
+            gameover.update(
+                self.collision_wall(collision, ball, new_state, cycle_data, ball_index)
+            )
         elif collision["type"] == "miss":
             gameover.update(
                 self.collision_miss(collision, ball, new_state, cycle_data, ball_index)
@@ -274,7 +316,23 @@ def collision_handler(self, collision, ball, new_state, cycle_data, ball_index):
     return gameover
 
 
-def collision_paddle(self, collision, ball, new_state, cycle_data):
+def collision_event(self, event_type, collision, ball, ball_index):
+    """
+    Compact client event of a collision: the ball and side involved and the
+    position and velocity of the ball after the collision was handled.
+    """
+    return {
+        "type": event_type,
+        "ball_index": ball_index,
+        "side_index": collision.get("side_index"),
+        "x": ball["x"],
+        "y": ball["y"],
+        "velocity_x": ball["velocity_x"],
+        "velocity_y": ball["velocity_y"],
+    }
+
+
+def collision_paddle(self, collision, ball, new_state, cycle_data, ball_index=None):
     """Handle paddle collision with events"""
     # Step 1: Move ball to inner edge of paddle
     BUFFER = 0.001
@@ -297,22 +355,13 @@ def collision_paddle(self, collision, ball, new_state, cycle_data):
         ball["x"] += normal["x"] * BUFFER
         ball["y"] += normal["y"] * BUFFER
 
-    # Step 2: Apply bounce effects and get physics data
-    physics_data = self.bounce_paddle(ball, collision)
-
-    # Step 3: Create collision event data
-    event_data = {
-        "collision": collision,
-        "timing": {
-            "timestamp": time.time(),
-            "combo_timeout": self.combo_timeout,
-            "last_hit_time": self.last_hit_time,
-        },
-        "physics": physics_data,
-    }
+    # Step 2: Apply bounce effects
+    self.bounce_paddle(ball, collision)
 
-    # Store data
-    cycle_data["events"].append({"type": "paddle_hit", "data": event_data})
+    # Step 3: Store the client event
+    cycle_data["events"].append(
+        self.collision_event("paddle_hit", collision, ball, ball_index)
+    )
 
     return {"game_over": False}
 
@@ -359,7 +408,7 @@ def bounce_paddle(self, ball, collision):
     }
 
 
-def collision_wall(self, collision, ball, new_state, cycle_data):
+def collision_wall(self, collision, ball, new_state, cycle_data, ball_index=None):
     """
     Handle wall collision with events.
     Follows same pattern as paddle collisions but uses wall-specific bounce.
@@ -389,19 +438,13 @@ def collision_wall(self, collision, ball, new_state, cycle_data):
     ball["x"] = wall_outer_x + normal["x"] * (ball["size"] + BUFFER)
     ball["y"] = wall_outer_y + normal["y"] * (ball["size"] + BUFFER)
 
-    # Step 2: Apply bounce effects and get physics data
-    physics_data = self.bounce_wall(ball, collision)
+    # Step 2: Apply bounce effects
+    self.bounce_wall(ball, collision)
 
-    # Step 3: Create collision event data
-    event_data = {
-        "collision": collision,
-        "timing": {"timestamp": time.time()},
-        "physics": physics_data,
-    }
-
-    # Store data
-    cycle_data["collision_data"].append(event_data)
-    cycle_data["events"].append({"type": "wall_hit", "data": event_data})
+    # Step 3: Create collision event
+    cycle_data["events"].append(
+        self.collision_event("wall_hit", collision, ball, ball_index)
+    )
 
     return {"game_over": False}
 
@@ -476,8 +519,9 @@ def apply_ball_bounce_effect(self, ball, normal, offset=0, speed_multiplier=1.05
         # Smaller random adjustment for more direct hits
         angle_adjustment = random.uniform(-math.pi/12, math.pi/12)
     
-    # Apply speed-based angle adjustment (faster = less random)
-    speed_factor = min(current_speed / (ball["size"] * 1.5), 1.0)
+    # Apply speed-based angle adjustment (faster = less random), speeds are per
+    # tick: the threshold scales with the tick rate like the ball speeds
+    speed_factor = min(current_speed / (ball["size"] * 1.5 * self.speed_scale), 1.0)
     angle_adjustment *= (1 - speed_factor * 0.7)  # Reduce randomness at high speeds
     
     # Apply the adjusted angle
@@ -486,8 +530,8 @@ def apply_ball_bounce_effect(self, ball, normal, offset=0, speed_multiplier=1.05
     # Calculate new velocity components
     new_speed = current_speed * speed_multiplier
     
-    # Limit speed to prevent tunneling
-    MAX_SPEED = ball["size"] * 1.5
+    # Limit speed to prevent tunneling (higher in continuous collision mode)
+    MAX_SPEED = ball["size"] * self.max_speed_ratio
     if new_speed > MAX_SPEED:
         new_speed = MAX_SPEED
     
@@ -561,9 +605,8 @@ def collision_miss(self, collision, ball, new_state, cycle_data, ball_index):
     Returns:
         dict: Game over status based on score check
     """
-    # Step 1: Record initial state for physics data
-    initial_position = {"x": ball["x"], "y": ball["y"]}
-    initial_velocity = {"x": ball["velocity_x"], "y": ball["velocity_y"]}
+    # Step 1: Client event with the position where the ball left the field
+    event = self.collision_event("miss", collision, ball, ball_index)
 
     # Step 2: Update game state
     active_paddle_index = collision["active_paddle_index"]
@@ -577,16 +620,11 @@ def collision_miss(self, collision, ball, new_state, cycle_data, ball_index):
     self.hit_combo = 0
     self.last_hit_time = time.time()
 
-    # Step 3: Reset ball and collect physics data
+    # Step 3: Reset ball
     self.reset_ball(ball, ball_index)
 
-    # Step 3: Create collision event data
-    event_data = {
-        "collision": collision,
-        "timing": {"timestamp": time.time()},
-    }
     # Store data
-    cycle_data["events"].append({"type": "miss", "data": event_data})
+    cycle_data["events"].append(event)
     # Check for winners
     winners = self.check_winner(new_state["scores"])
     if winners:  # If we have any winners
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import weakref
+from channels.layers import get_channel_layer
+from .tick_clock import TickClock, TickStats
+from .ball_engine import BallBatch
+from ..gamecoordinator.GameCoordinator import GameCoordinator
+from ..gamecoordinator.redis_pools import RedisPools
+from ..gamecoordinator.redis_lock import LockStats
+
+logger = logging.getLogger(__name__)
+
+
+class GameScheduler:
+    """
+    One ticker per process (and tick rate / catch-up limit) that steps all running games.
+
+    Instead of every game running its own loop with its own sleep and redis
+    polling, games register here and are stepped on a common tick boundary:
+    - one redis pipeline for the reads of all games (running flag, paddle input mailbox)
+    - one redis pipeline for the write-behind snapshots of all games
+    - the channel layer sends of all games are issued concurrently
+    - the ball physics of games of the same class run as one vectorized batch
+    """
+
+    _schedulers = weakref.WeakKeyDictionary()  # event loop -> {(tick_rate, max_catchup_steps): scheduler}
+
+    def __init__(self, tick_rate: int = 60, max_catchup_steps: int = 4):
+        self.clock = TickClock(tick_rate, max_catchup_steps)
+        self.games = {}  # game_id -> (game_manager, future)
+        self.batches = {}  # game class -> BallBatch of its numpy engine games
+        self.task = None
+        self.redis_conn = None
+        self.channel_layer = None
+
+    @classmethod
+    def get(cls, tick_rate: int = 60, max_catchup_steps: int = 4) -> "GameScheduler":
+        """Get the scheduler of the running event loop for a tick rate and catch-up limit"""
+        schedulers = cls._schedulers.setdefault(asyncio.get_running_loop(), {})
+        key = (int(tick_rate), max(1, int(max_catchup_steps)))
+        if key not in schedulers:
+            schedulers[key] = cls(*key)
+        return schedulers[key]
+
+    async def run_game(self, game_manager) -> bool:
+        """
+        Register a game and wait till it stops running.
+
+        Returns:
+            bool: True if the game ended by game over, False if it was stopped
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.games[game_manager.game_id] = (game_manager, future)
+        game_manager.tick_stats = TickStats()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+        try:
+            return await future
+        finally:
+            self.games.pop(game_manager.game_id, None)
+
+    async def _run(self):
+        try:
+            self.redis_conn = await GameCoordinator.get_redis_binary(
+                GameCoordinator.REDIS_GAME_URL
+            )
+            self.channel_layer = get_channel_layer()
+            self.clock.start()
+            skipped_frames = self.clock.skipped_frames
+            while self.games:
+                await self.clock.wait()
+                steps = self.clock.due_steps()
+                if self.clock.skipped_frames > skipped_frames:
+                    skipped_frames = self.clock.skipped_frames
+                    logger.warning(
+                        f"game scheduler saturated ({len(self.games)} games), tick stats: {self.clock.stats()}, "
+                        f"redis pools: {RedisPools.stats()}, locks: {LockStats.stats()}"
+                    )
+                await self.tick(steps, self.clock.last_skipped)
+        except Exception as e:
+            logger.error(f"Error in game scheduler: {e}")
+            for _, future in list(self.games.values()):
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.batches.clear()
+            # before the await: a game registered while closing starts a new run
+            redis_conn, self.redis_conn = self.redis_conn, None
+            if self.task is asyncio.current_task():
+                self.task = None
+            if redis_conn:
+                await redis_conn.aclose()
+
+    @staticmethod
+    def first_error(results):
+        """The first failed command in pipeline results of raise_on_error=False"""
+        return next((result for result in results if isinstance(result, Exception)), None)
+
+    async def tick(self, steps: int, skipped: int = 0):
+        """Step every registered game once"""
+        games = [
+            (game_manager, future)
+            for game_manager, future in self.games.values()
+            if not future.done()
+        ]
+        if not games:
+            return
+        for game_manager, _ in games:
+            game_manager.tick_stats.record(steps, skipped)
+
+        # Reads: one round trip for all games, a failed command only stops its game
+        pipeline = self.redis_conn.pipeline(transaction=False)
+        counts = [game_manager.queue_tick_reads(pipeline) for game_manager, _ in games]
+        results = await pipeline.execute(raise_on_error=False)
+
+        # Simulation: writes queued into one pipeline, messages collected
+        pipeline = self.redis_conn.pipeline(transaction=False)
+        sends = []
+        runs = []
+        offset = 0
+        for (game_manager, future), count in zip(games, counts):
+            game_results = results[offset : offset + count]
+            offset += count
+            try:
+                error = self.first_error(game_results)
+                if error is not None:
+                    raise error
+                if not game_manager.apply_tick_reads(game_results):
+                    future.set_result(False)
+                    continue
+                state, messages = await game_manager.prepare_advance()
+            except Exception as e:
+                logger.error(f"{game_manager.game_id}: error in scheduler tick: {e}")
+                future.set_exception(e)
+                continue
+            if messages:
+                sends.extend(self.send(game_manager, messages))
+                continue
+            previous_scores = list(state["scores"])
+            runs.append(
+                {
+                    "game": game_manager,
+                    "future": future,
+                    "state": state,
+                    "previous_scores": previous_scores,
+                    "events": [],
+                    # a player left: the forfeit scores end the game without a step
+                    "game_over": game_manager.apply_forfeit(state),
+                }
+            )
+
+        for _ in range(steps):
+            await self.step(runs)
+
+        finished = []
+        writes = []  # (game_manager, future, first, end) commands of each game in pipeline
+        for run in runs:
+            game_manager, future = run["game"], run["future"]
+            if future.done():
+                continue
+            first = len(pipeline)
+            try:
+                messages = await game_manager.complete_advance(
+                    run["state"],
+                    run["game_over"],
+                    run["events"],
+                    run["previous_scores"],
+                    pipeline,
+                )
+            except Exception as e:
+                logger.error(f"{game_manager.game_id}: error in scheduler tick: {e}")
+                future.set_exception(e)
+                continue
+            writes.append((game_manager, future, first, len(pipeline)))
+            sends.extend(self.send(game_manager, messages))
+            if run["game_over"]:
+                finished.append(future)
+
+        # Writes and sends of all games
+        if len(pipeline):
+            results = await pipeline.execute(raise_on_error=False)
+            for game_manager, future, first, end in writes:
+                error = self.first_error(results[first:end])
+                if error is not None and not future.done():
+                    logger.error(f"{game_manager.game_id}: error in scheduler writes: {error}")
+                    future.set_exception(error)
+        if sends:
+            for result in await asyncio.gather(*sends, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error(f"Error in scheduler group_send: {result}")
+        for future in finished:
+            if not future.done():
+                future.set_result(True)
+
+    async def step(self, runs):
+        """
+        One simulation step of all games still running in this tick.
+        Games on the numpy engine are grouped by class, the movement and
+        boundary phase of each group runs as one BallBatch call.
+        """
+        runs = [run for run in runs if not run["game_over"] and not run["future"].done()]
+        phases, batches = self.batch_phases(runs)
+        for run in runs:
+            game_manager = run["game"]
+            try:
+                game_manager.move_paddles(run["state"])
+                state, game_over, step_data = await game_manager.game_logic(
+                    run["state"], phases.get(game_manager.game_id)
+                )
+            except Exception as e:
+                logger.error(f"{game_manager.game_id}: error in scheduler step: {e}")
+                run["future"].set_exception(e)
+                continue
+            run["state"] = state
+            game_manager.tick += 1
+            run["events"].extend(step_data["events"])
+            run["game_over"] = game_over
+        for batch in batches:
+            batch.store()
+
+    def batch_phases(self, runs):
+        """Step the ball batches, returns the array phases per game and the batches"""
+        groups = {}
+        for run in runs:
+            if run["game"].ball_engine == "numpy":
+                groups.setdefault(type(run["game"]), []).append(
+                    (run["game"], run["state"])
+                )
+        phases = {}
+        batches = []
+        for game_class, games in groups.items():
+            try:
+                batch = self.batches.get(game_class)
+                if batch is None or not batch.is_current(games):
+                    batch = self.batches[game_class] = BallBatch(games)
+                group_phases = batch.step()
+            except Exception as e:
+                # the games fall back to stepping their balls on their own
+                logger.error(f"Error in ball batch of {game_class.__name__}: {e}")
+                self.batches.pop(game_class, None)
+                continue
+            for (game_manager, _), phase in zip(games, group_phases):
+                phases[game_manager.game_id] = phase
+            batches.append(batch)
+        return phases, batches
+
+    def send(self, game_manager, messages):
+        return [
+            self.channel_layer.group_send(game_manager.message_group(message), message)
+            for message in messages
+        ]
@@ -3,6 +3,7 @@ import math
 from .ball_utils import BallUtils
 import time
 import logging
+from ..gamecoordinator.game_config import BASE_TICK_RATE
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,7 @@ def setup_game(cls, settings: Dict[str, Any]) -> dict:
         settings.update(cls.calculate_vertices(settings))
         settings.update(cls.calculate_sides_normals(settings))
         settings.update(cls.calculate_inner(settings))
+        settings.update(cls.calculate_side_sectors(settings))
         settings.update(cls.set_initial_state(settings))
         settings.update(cls.initialize_ball_movements(settings))
         return settings
@@ -37,6 +39,12 @@ def calculate_inner(cls, settings: Dict[str, Any]) -> dict:
     raise NotImplementedError("Subclasses must implement this: inner_boundaries!")
 
 
+@classmethod
+def calculate_side_sectors(cls, settings: Dict[str, Any]) -> dict:
+    """Optional sector index for the collision candidate phase"""
+    return {}
+
+
 @classmethod
 def initialize_ball_movements(cls, settings: Dict[str, Any]) -> dict:
     raise NotImplementedError("Subclasses must implement this: inner_boundaries!")
@@ -48,7 +56,12 @@ def set_initial_state(cls, settings: Dict[str, Any]) -> dict:
         scale = settings.get("scale")
         num_balls = settings.get("num_balls")
         ball_size = settings.get("ball_size") * scale
-        initial_speed = settings.get("initial_ball_speed") * scale
+        initial_speed = (
+            settings.get("initial_ball_speed")
+            * scale
+            * BASE_TICK_RATE
+            / settings.get("tick_rate", BASE_TICK_RATE)
+        )
         active_sides = settings.get("players_sides")
         num_sides = settings.get("sides")
 
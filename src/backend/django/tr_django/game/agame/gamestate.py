@@ -1,5 +1,48 @@
 from .AGameManager import GameStateError
 import msgpack
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def load_game_state(self):
+    """
+    Load the game state from redis into memory.
+    From here on the running game owns the state, redis only gets snapshots.
+    """
+    state_data = await self.redis_conn.get(self.state_key)
+    self.state = msgpack.unpackb(state_data) if state_data else None
+    self.ticks_since_sync = 0
+    return self.state
+
+
+async def sync_game_state(self, force=False, pipeline=None):
+    """
+    Write-behind of the in-memory state to redis.
+    Writes every `state_sync_interval` ticks or when forced (score change, game over).
+    Uses XX so a game already removed by cleanup_game is not recreated.
+    Tick stats of the game (overruns, skipped frames) go along in the same pipeline.
+    With a given pipeline the writes are only queued, the caller executes it.
+    """
+    self.ticks_since_sync += 1
+    if not force and self.ticks_since_sync < self.settings.get("state_sync_interval", 1):
+        return False
+    own_pipeline = pipeline is None
+    # the serialization check of the state: the bytes that are written
+    try:
+        state_data = msgpack.packb(self.state)
+    except Exception as e:
+        raise GameStateError(f"State cannot be serialized: {str(e)}")
+    if own_pipeline:
+        pipeline = self.redis_conn.pipeline()
+    pipeline.set(self.state_key, state_data, xx=True)
+    if self.tick_stats:
+        pipeline.hset(self.tick_stats_key, mapping=self.tick_stats.stats())
+    if own_pipeline:
+        await pipeline.execute()
+    self.ticks_since_sync = 0
+    return True
 
 
 def verify_game_state(self, state):
@@ -105,11 +148,6 @@ def verify_game_state(self, state):
                 "All dimensions must be float."
             )
 
-        # Try msgpack serialization
-        try:
-            msgpack.packb(state)
-        except Exception as e:
-            raise GameStateError(f"State cannot be serialized: {str(e)}")
 
         return True
 
@@ -119,3 +157,53 @@ def verify_game_state(self, state):
     except Exception as e:
         # Catch any other unexpected errors
         raise GameStateError(f"Unexpected error validating game state: {str(e)}")
+
+
+def validate_game_state(self, state):
+    """
+    Validation of the state of every tick, depending on settings["validation_mode"]:
+    "full" -> verify_game_state every tick
+    "cheap" -> check_game_state_invariants, with a full verify_game_state
+    every validation_audit_interval ticks
+    Serialization is checked where the state is packed (sync_game_state).
+    Raises GameStateError.
+    """
+    if self.validation_mode == "full":
+        return self.verify_game_state(state)
+    self.ticks_since_audit += 1
+    if self.ticks_since_audit >= self.validation_audit_interval:
+        self.ticks_since_audit = 0
+        return self.verify_game_state(state)
+    return self.check_game_state_invariants(state)
+
+
+def check_game_state_invariants(self, state):
+    """
+    Cheap check of what the physics can break: finite ball positions and
+    velocities, one score per active paddle and paddle positions in range.
+    The structure itself is only built in set_initial_state, verify_game_state
+    audits it periodically.
+    """
+    for i, ball in enumerate(state["balls"]):
+        if not (
+            math.isfinite(ball["x"])
+            and math.isfinite(ball["y"])
+            and math.isfinite(ball["velocity_x"])
+            and math.isfinite(ball["velocity_y"])
+        ):
+            raise GameStateError(
+                f"Ball {i} has a non-finite position or velocity: "
+                f"({ball['x']}, {ball['y']}) / ({ball['velocity_x']}, {ball['velocity_y']})"
+            )
+    if len(state["scores"]) != len(self.active_sides):
+        raise GameStateError(
+            f"Number of scores ({len(state['scores'])}) must match "
+            f"number of active paddles ({len(self.active_sides)})"
+        )
+    for side_index in self.active_sides:
+        position = state["paddles"][side_index]["position"]
+        if not 0 <= position <= 1:
+            raise GameStateError(
+                f"Paddle {side_index}: position must be between 0 and 1, got {position}"
+            )
+    return True
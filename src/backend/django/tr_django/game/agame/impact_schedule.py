@@ -0,0 +1,78 @@
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# ticks before the earliest possible contact from which the ball goes through
+# the collision pipeline again, so the movement tracking sees it approach
+HORIZON_MARGIN = 2
+
+
+def skip_to_horizon(self, ball_index, ball):
+    """
+    Between two bounces a ball moves on a straight line. As long as its impact
+    horizon (see schedule_ball) lies ahead, the ball is only moved.
+
+    Returns:
+        bool: True if the ball was moved and needs no further checks this tick
+    """
+    movements = self.previous_movements
+    quiet_ticks = movements.quiet_ticks[ball_index]
+    if quiet_ticks <= 0:
+        return False
+    ball["x"] += ball["velocity_x"]
+    ball["y"] += ball["velocity_y"]
+    movements.quiet_ticks[ball_index] = quiet_ticks - 1
+    # the tick after the horizon compares against this position
+    movements.set_last_position(ball_index, ball["x"], ball["y"])
+    return True
+
+
+def schedule_ball(self, ball_index, ball, new_state):
+    """
+    Compute the impact horizon of a ball after it went through the collision
+    pipeline (bounce, reset or horizon reached).
+    """
+    quiet_ticks = self.impact_horizon(ball, new_state)
+    self.previous_movements.quiet_ticks[ball_index] = quiet_ticks
+    return quiet_ticks
+
+
+def impact_horizon(self, ball, new_state):
+    """
+    Number of ticks the ball can move without any check: the ticks until it
+    could first reach the reach of a side (ball size plus paddle width, paddles
+    may move anywhere on their side meanwhile), minus HORIZON_MARGIN.
+    The discrete mode also checks the distance to the center against the
+    outer boundary, so the horizon ends before the ball gets there as well.
+    """
+    ticks = self.ticks_to_reach(
+        ball, ball["size"] + new_state["dimensions"]["paddle_width"]
+    )
+    if ticks is None:
+        return 0
+    if self.collision_mode != "continuous":
+        ticks = min(ticks, ticks_to_radius(ball, self.outer_boundary))
+    if not math.isfinite(ticks):
+        return 0
+    return max(0, int(ticks) - HORIZON_MARGIN)
+
+
+def ticks_to_reach(self, ball, reach):
+    """
+    Ticks (fractional) until the ball center comes within `reach` of a side,
+    None if unknown (the ball is then checked every tick)
+    """
+    return None
+
+
+def ticks_to_radius(ball, radius):
+    """Ticks until the ball center reaches the distance radius from the center"""
+    speed_squared = ball["velocity_x"] ** 2 + ball["velocity_y"] ** 2
+    if speed_squared == 0:
+        return math.inf
+    c = ball["x"] ** 2 + ball["y"] ** 2 - radius * radius
+    if c >= 0:
+        return 0.0
+    b = 2 * (ball["x"] * ball["velocity_x"] + ball["y"] * ball["velocity_y"])
+    return (-b + math.sqrt(b * b - 4 * speed_squared * c)) / (2 * speed_squared)
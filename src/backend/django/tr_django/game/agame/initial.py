@@ -4,6 +4,10 @@ import redis.asyncio as redis
 import random
 import math
 import logging
+from django.conf import settings as django_settings
+from .movement_tracker import MovementTracker
+from .value_types import Side
+from ..gamecoordinator.game_config import BASE_TICK_RATE
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +26,34 @@ async def initialize(self, create_new=False):
         self.vertices = self.settings.get("vertices")
         self.scale = self.settings.get("scale")
         self.side_normals = self.settings.get("normals")
+        self.sides = Side.from_polygon(self.vertices, self.side_normals)
         self.inner_boundary = self.settings.get("inner_boundary")
-        self.previous_movements = self.settings.get("ballmovements")
+        self.previous_movements = MovementTracker.from_settings(
+            self.settings.get("ballmovements"), self.num_sides
+        )
+        self.side_sectors = self.settings.get("side_sectors")
+        self.collision_mode = self.settings.get("collision_mode", "discrete")
+        if self.collision_mode == "continuous":
+            # no tunneling possible, the speed cap only limits gameplay
+            self.max_speed_ratio = self.settings.get("continuous_max_speed_ratio", 3.0)
+        # speeds in the settings are per BASE_TICK_RATE tick, at other tick
+        # rates the balls move the same distance per second in smaller steps
+        tick_rate = float(self.settings.get("tick_rate", BASE_TICK_RATE))
+        self.tick_rate = tick_rate
+        self.speed_scale = BASE_TICK_RATE / tick_rate
+        self.max_speed_ratio = self.max_speed_ratio * self.speed_scale
+        self.ticks_per_send = max(
+            1, round(tick_rate / float(self.settings.get("send_rate", tick_rate)))
+        )
+        self.impact_schedule = bool(self.settings.get("impact_schedule", False))
+        self.validation_mode = self.settings.get("validation_mode", "auto")
+        if self.validation_mode == "auto":
+            self.validation_mode = "full" if django_settings.DEBUG else "cheap"
+        self.validation_audit_interval = max(
+            1, int(self.settings.get("validation_audit_interval", 1))
+        )
+        self.keyframe_interval = max(0, int(self.settings.get("keyframe_interval", 0)))
+        self.setup_ball_engine()
 
     except Exception as e:
         logger.error(f"Error in initialize: {e}")
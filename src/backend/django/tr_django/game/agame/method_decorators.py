@@ -8,6 +8,7 @@ def add_cls_methods(cls):
         calculate_vertices,
         calculate_sides_normals,
         calculate_inner,
+        calculate_side_sectors,
         calculate_player_side_indices,
         set_initial_state,
     )
@@ -17,6 +18,7 @@ def add_cls_methods(cls):
         "calculate_vertices": calculate_vertices,
         "calculate_sides_normals": calculate_sides_normals,
         "calculate_inner": calculate_inner,
+        "calculate_side_sectors": calculate_side_sectors,
         "calculate_player_side_indices": calculate_player_side_indices,
         "set_initial_state": set_initial_state,
     }
@@ -31,11 +33,30 @@ def add_game_flow(cls):
     Decorator that adds game flow management methods to a class.
     Includes methods for starting, updating, and ending games with process-safe checks.
     """
-    from .game_flow import start_game, update_game, end_game, error_exit
+    from .game_flow import (
+        start_game,
+        update_game,
+        advance_game,
+        prepare_advance,
+        complete_advance,
+        state_frame,
+        queue_tick_reads,
+        apply_tick_reads,
+        message_group,
+        end_game,
+        error_exit,
+    )
 
     methods = {
         "start_game": start_game,
         "update_game": update_game,
+        "advance_game": advance_game,
+        "prepare_advance": prepare_advance,
+        "complete_advance": complete_advance,
+        "state_frame": state_frame,
+        "queue_tick_reads": queue_tick_reads,
+        "apply_tick_reads": apply_tick_reads,
+        "message_group": message_group,
         "end_game": end_game,
         "error_exit": error_exit
     }
@@ -52,6 +73,7 @@ def add_game_logic(cls):
     from .game_logic import (
         # main
         game_logic,
+        process_ball,
         # Movement Phase
         move_ball,
         # Boundary Phase
@@ -66,6 +88,7 @@ def add_game_logic(cls):
         handle_parallel,
         # Impact Processing Phase
         collision_handler,
+        collision_event,
         collision_paddle,
         bounce_paddle,
         collision_wall,
@@ -79,6 +102,7 @@ def add_game_logic(cls):
     methods = {
         #  main
         "game_logic": game_logic,
+        "process_ball": process_ball,
         # Movement Phase
         "move_ball": move_ball,
         # Boundary Phase
@@ -93,6 +117,7 @@ def add_game_logic(cls):
         "handle_parallel": handle_parallel,
         # Impact Processing Phase
         "collision_handler": collision_handler,
+        "collision_event": collision_event,
         "collision_paddle": collision_paddle,
         "bounce_paddle": bounce_paddle,
         "collision_wall": collision_wall,
@@ -126,9 +151,21 @@ def add_gamestate(cls):
     """
     gamestate
     """
-    from .gamestate import verify_game_state
+    from .gamestate import (
+        verify_game_state,
+        validate_game_state,
+        check_game_state_invariants,
+        load_game_state,
+        sync_game_state,
+    )
 
-    methods = {"verify_game_state": verify_game_state}
+    methods = {
+        "verify_game_state": verify_game_state,
+        "validate_game_state": validate_game_state,
+        "check_game_state_invariants": check_game_state_invariants,
+        "load_game_state": load_game_state,
+        "sync_game_state": sync_game_state,
+    }
 
     for name, method in methods.items():
         setattr(cls, name, method)
@@ -154,11 +191,24 @@ def add_paddle(cls):
     """
     paddle
     """
-    from .paddle import update_paddle, get_paddle_positions
+    from .paddle import (
+        update_paddle,
+        update_paddle_velocity,
+        queue_paddle_input,
+        apply_paddle_inputs,
+        move_paddles,
+        apply_paddle_positions,
+        input_acknowledgements,
+    )
 
     methods = {
         "update_paddle": update_paddle,
-        "get_paddle_positions": get_paddle_positions,
+        "update_paddle_velocity": update_paddle_velocity,
+        "queue_paddle_input": queue_paddle_input,
+        "apply_paddle_inputs": apply_paddle_inputs,
+        "move_paddles": move_paddles,
+        "apply_paddle_positions": apply_paddle_positions,
+        "input_acknowledgements": input_acknowledgements,
     }
 
     for name, method in methods.items():
@@ -170,9 +220,9 @@ def add_player(cls):
     """
     player
     """
-    from .player import add_player, remove_player, _handle_normal_pregame_leave, _handle_tournament_pregame_leave, _handle_ingame_leave
+    from .player import add_player, remove_player, _handle_normal_pregame_leave, _handle_tournament_pregame_leave, _handle_ingame_leave, apply_forfeit
 
-    methods = {"add_player": add_player, "remove_player": remove_player, "_handle_normal_pregame_leave": _handle_normal_pregame_leave, "_handle_tournament_pregame_leave": _handle_tournament_pregame_leave, "_handle_ingame_leave" : _handle_ingame_leave}
+    methods = {"add_player": add_player, "remove_player": remove_player, "_handle_normal_pregame_leave": _handle_normal_pregame_leave, "_handle_tournament_pregame_leave": _handle_tournament_pregame_leave, "_handle_ingame_leave" : _handle_ingame_leave, "apply_forfeit": apply_forfeit}
 
     for name, method in methods.items():
         setattr(cls, name, method)
@@ -194,3 +244,70 @@ def add_redis(cls):
     for name, method in methods.items():
         setattr(cls, name, method)
     return cls
+
+
+def add_ball_engine(cls):
+    """
+    vectorized ball engine
+    """
+    from .ball_engine import (
+        setup_ball_engine,
+        bind_ball_arrays,
+        vectorized_game_logic,
+    )
+
+    methods = {
+        "setup_ball_engine": setup_ball_engine,
+        "bind_ball_arrays": bind_ball_arrays,
+        "vectorized_game_logic": vectorized_game_logic,
+    }
+
+    for name, method in methods.items():
+        setattr(cls, name, method)
+    return cls
+
+
+def add_continuous_collision(cls):
+    """
+    continuous collision mode
+    """
+    from .continuous_collision import (
+        sweep_ball,
+        contact_planes,
+        paddle_covers,
+        find_time_of_impact,
+    )
+
+    methods = {
+        "sweep_ball": sweep_ball,
+        "contact_planes": contact_planes,
+        "paddle_covers": paddle_covers,
+        "find_time_of_impact": find_time_of_impact,
+    }
+
+    for name, method in methods.items():
+        setattr(cls, name, method)
+    return cls
+
+
+def add_impact_schedule(cls):
+    """
+    time-of-impact scheduling of the collision checks
+    """
+    from .impact_schedule import (
+        skip_to_horizon,
+        schedule_ball,
+        impact_horizon,
+        ticks_to_reach,
+    )
+
+    methods = {
+        "skip_to_horizon": skip_to_horizon,
+        "schedule_ball": schedule_ball,
+        "impact_horizon": impact_horizon,
+        "ticks_to_reach": ticks_to_reach,
+    }
+
+    for name, method in methods.items():
+        setattr(cls, name, method)
+    return cls
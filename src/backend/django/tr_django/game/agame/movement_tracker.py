@@ -0,0 +1,135 @@
+from array import array
+
+
+class MovementTracker:
+    """
+    Movement tracking of all balls of a game (previous_movements).
+
+    The values of the last tick per ball and side (distance, signed distance
+    and dot product of velocity and side normal) live in flat float arrays
+    indexed by slot(ball_index, side_index); the per ball values (deadzone
+    flag, position of the last tick, ticks before the impact horizon, angular
+    sector) in one array each. The arrays are allocated once per game,
+    updates and resets only overwrite them.
+    """
+
+    def __init__(self, num_balls, num_sides):
+        self.num_sides = num_sides
+        self.num_balls = 0
+        # per ball and side
+        self.distance = array("d")
+        self.signed_distance = array("d")
+        self.dot_product = array("d")
+        # per ball
+        self.in_deadzone = array("b")
+        self.has_last_position = array("b")
+        self.last_x = array("d")
+        self.last_y = array("d")
+        self.quiet_ticks = array("l")
+        self.sector = array("l")  # angular sector of the last candidate phase, -1: none
+        self.zero_sides = array("d", bytes(8 * num_sides))
+        self.grow(num_balls)
+
+    @classmethod
+    def from_settings(cls, ballmovements, num_sides):
+        """Tracker from the initial tracking data of the game settings"""
+        tracker = cls(len(ballmovements), num_sides)
+        for ball_index, tracking in enumerate(ballmovements):
+            tracker.in_deadzone[ball_index] = bool(tracking.get("in_deadzone", True))
+            last_position = tracking.get("last_position")
+            if last_position is None:
+                tracker.has_last_position[ball_index] = 0
+            else:
+                tracker.set_last_position(
+                    ball_index, last_position["x"], last_position["y"]
+                )
+            for side_index, side in enumerate(tracking.get("sides", ())):
+                slot = tracker.slot(ball_index, side_index)
+                tracker.distance[slot] = side["distance"]
+                tracker.signed_distance[slot] = side["signed_distance"]
+                tracker.dot_product[slot] = side["dot_product"]
+        return tracker
+
+    def __len__(self):
+        return self.num_balls
+
+    def __repr__(self):
+        return f"MovementTracker({self.to_list()})"
+
+    def grow(self, num_balls):
+        """Make room for num_balls balls, new balls start in the deadzone at the center"""
+        additional_balls = num_balls - self.num_balls
+        if additional_balls <= 0:
+            return
+        zeros = bytes(8 * additional_balls)
+        for values in (self.distance, self.signed_distance, self.dot_product):
+            values.frombytes(zeros * self.num_sides)
+        self.in_deadzone.frombytes(b"\x01" * additional_balls)
+        self.has_last_position.frombytes(b"\x01" * additional_balls)
+        self.last_x.frombytes(zeros)
+        self.last_y.frombytes(zeros)
+        self.quiet_ticks.extend(0 for _ in range(additional_balls))
+        self.sector.extend(-1 for _ in range(additional_balls))
+        self.num_balls = num_balls
+
+    def slot(self, ball_index, side_index):
+        return ball_index * self.num_sides + side_index
+
+    def update_side(self, ball_index, side_index, distance, dot_product, signed_distance):
+        slot = ball_index * self.num_sides + side_index
+        self.distance[slot] = distance
+        self.dot_product[slot] = dot_product
+        self.signed_distance[slot] = signed_distance
+
+    def set_last_position(self, ball_index, x, y):
+        self.has_last_position[ball_index] = 1
+        self.last_x[ball_index] = x
+        self.last_y[ball_index] = y
+
+    def reset(self, ball_index, last_position=None):
+        """
+        Reset the tracking of a ball into the deadzone.
+        last_position: (x, y) or None for no position (the next tick compares
+        the ball against its own position)
+        """
+        start = ball_index * self.num_sides
+        end = start + self.num_sides
+        self.distance[start:end] = self.zero_sides
+        self.signed_distance[start:end] = self.zero_sides
+        self.dot_product[start:end] = self.zero_sides
+        self.in_deadzone[ball_index] = 1
+        self.quiet_ticks[ball_index] = 0
+        self.sector[ball_index] = -1
+        if last_position is None:
+            self.has_last_position[ball_index] = 0
+        else:
+            self.set_last_position(ball_index, last_position[0], last_position[1])
+
+    def to_list(self):
+        """Tracking data in the form of the game settings (for debugging)"""
+        return [
+            {
+                "sides": [
+                    {
+                        "distance": self.distance[slot],
+                        "signed_distance": self.signed_distance[slot],
+                        "dot_product": self.dot_product[slot],
+                    }
+                    for slot in range(
+                        ball_index * self.num_sides, (ball_index + 1) * self.num_sides
+                    )
+                ],
+                "in_deadzone": bool(self.in_deadzone[ball_index]),
+                **(
+                    {
+                        "last_position": {
+                            "x": self.last_x[ball_index],
+                            "y": self.last_y[ball_index],
+                        }
+                    }
+                    if self.has_last_position[ball_index]
+                    else {}
+                ),
+            }
+            for ball_index in range(self.num_balls)
+        ]
@@ -6,57 +6,121 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-async def update_paddle(self, player_index, position):
-    """Update paddle position atomically with length-based limits"""
-    try:
-        # Get current paddle state to check if we're at a limit
-        try:
-            current_data = await self.redis_conn.hget(
-                self.paddles_key, str(player_index)
-            )
-            current_position = (
-                msgpack.unpackb(current_data)["position"] if current_data else 0.5
-            )
-        except:
-            current_position = 0.5  # Fallback if can't get current position
-
-        # Get paddle length from game settings
-        paddle_length = float(self.settings.get("paddle_length", 0.3))
-        half_length = paddle_length / 2.0
-
-        # Calculate valid range
-        min_valid = half_length
-        max_valid = 1.0 - half_length
-
-        # If at a limit and trying to move further out, maintain current position
-        if (current_position >= max_valid and position > current_position) or (
-            current_position <= min_valid and position < current_position
-        ):
-            return True
+# intents drained from the input mailbox per tick, the rest waits for the next tick
+MAX_INPUTS_PER_TICK = 256
+# the mailbox keeps the newest intents only and expires when no game loop drains it
+MAX_QUEUED_INPUTS = 4 * MAX_INPUTS_PER_TICK
+INPUTS_EXPIRY = 60  # seconds
+# kinds of the mailbox intents: (kind, player_index, value, seq)
+POSITION_INPUT = 0  # value: paddle position
+VELOCITY_INPUT = 1  # value: paddle speed in units per second (held key)
 
-        # Limit new position to valid range
-        position = float(max(min_valid, min(max_valid, position)))
 
-        try:
-            packed_data = msgpack.packb({"position": position})
-            await self.redis_conn.hset(self.paddles_key, str(player_index), packed_data)
-            return True
-        except msgpack.PackException as e:
-            logger.error(f"Error packing paddle data: {e}")
-            return False
+async def update_paddle(self, player_index, position, seq=None):
+    """
+    Queue a paddle position intent into the input mailbox of the game.
+    The game loop drains the mailbox once per tick (see queue_tick_reads)
+    and applies the intents with apply_paddle_inputs.
+    seq: input sequence number of the client, acknowledged in the frames
+    """
+    return await self.queue_paddle_input(POSITION_INPUT, player_index, position, seq)
+
+
+async def update_paddle_velocity(self, player_index, velocity, seq=None):
+    """
+    Queue a held-key intent: the paddle moves with `velocity` (units per
+    second, negative to the left) each tick until the next intent.
+    """
+    return await self.queue_paddle_input(VELOCITY_INPUT, player_index, velocity, seq)
+
+
+async def queue_paddle_input(self, kind, player_index, value, seq=None):
+    try:
+        packed_data = msgpack.packb(
+            (kind, int(player_index), float(value), None if seq is None else int(seq))
+        )
+        pipeline = self.redis_conn.pipeline(transaction=False)
+        pipeline.rpush(self.inputs_key, packed_data)
+        pipeline.ltrim(self.inputs_key, -MAX_QUEUED_INPUTS, -1)
+        pipeline.expire(self.inputs_key, INPUTS_EXPIRY)
+        await pipeline.execute()
+        return True
+    except msgpack.PackException as e:
+        logger.error(f"Error packing paddle data: {e}")
+        return False
     except Exception as e:
         logger.error(f"Error updating paddle: {e}")
         return False
 
 
-async def get_paddle_positions(self):
-    """Get all paddle positions atomically"""
-    try:
-        positions = await self.redis_conn.hgetall(self.paddles_key)
-        return {
-            int(idx): msgpack.unpackb(pos_data)["position"]
-            for idx, pos_data in positions.items()
+def apply_paddle_inputs(self, inputs):
+    """Apply the drained paddle intents in order, with length-based limits"""
+    if not inputs:
+        return
+    # Get paddle length from game settings
+    paddle_length = float(self.settings.get("paddle_length", 0.3))
+    half_length = paddle_length / 2.0
+
+    # Calculate valid range
+    min_valid = half_length
+    max_valid = 1.0 - half_length
+
+    for data in inputs:
+        try:
+            kind, player_index, value, seq = msgpack.unpackb(data)
+        except (msgpack.UnpackException, ValueError, TypeError) as e:
+            logger.error(f"Error unpacking paddle input: {e}")
+            continue
+        player_index = int(player_index)
+        if seq is not None:
+            # the input takes effect in the next simulated tick
+            self.input_acks[player_index] = (seq, self.tick + 1)
+        if kind == VELOCITY_INPUT:
+            # integrated per tick in move_paddles
+            if value:
+                self.paddle_velocities[player_index] = float(value) / self.tick_rate
+            else:
+                self.paddle_velocities.pop(player_index, None)
+            continue
+        # Limit new position to valid range
+        self.paddle_positions[player_index] = float(
+            max(min_valid, min(max_valid, value))
+        )
+
+
+def move_paddles(self, state):
+    """Move the paddles of held keys by one tick of their velocity"""
+    if not self.paddle_velocities:
+        return
+    half_length = float(self.settings.get("paddle_length", 0.3)) / 2.0
+    for player_index, velocity in self.paddle_velocities.items():
+        position = self.paddle_positions.get(player_index, 0.5) + velocity
+        self.paddle_positions[player_index] = max(
+            half_length, min(1.0 - half_length, position)
+        )
+    self.apply_paddle_positions(state)
+
+
+def apply_paddle_positions(self, state):
+    """Write the paddle positions of the players into the active paddles of `state`"""
+    paddle_positions = self.paddle_positions
+    active_paddle_count = 0
+    for paddle in state["paddles"]:
+        if paddle["active"]:
+            paddle["position"] = paddle_positions.get(active_paddle_count, 0.5)
+            active_paddle_count += 1
+
+
+def input_acknowledgements(self):
+    """
+    Per player the last applied input seq, the tick it was applied in and
+    the paddle position of the current tick, for the client prediction.
+    """
+    return {
+        player_index: {
+            "seq": seq,
+            "tick": applied_tick,
+            "position": self.paddle_positions.get(player_index, 0.5),
         }
-    except Exception as e:
-        logger.error(f"Error getting paddle positions: {e}")
-        return {}
+        for player_index, (seq, applied_tick) in self.input_acks.items()
+    }
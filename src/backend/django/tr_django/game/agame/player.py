@@ -1,6 +1,7 @@
 import asyncio
 import msgpack
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 from ..gamecoordinator.GameCoordinator import GameCoordinator as GC
 from ..gamecoordinator.GameCoordinator import RedisLock
 import logging
@@ -9,85 +10,107 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# seconds a forfeit waits in forfeit_key for the game loop, see apply_forfeit
+FORFEIT_EXPIRY = 60
+
+
+# add_player in one round trip: check the booking and the player limit,
+# take the first free side and write the player keys and indexes.
+# KEYS: players, booking, tournament booking, player_side, paddle_index,
+#       playing, join_time, GAME_KEYS / USER_GAMES / GAME_BOOKINGS / USER_BOOKINGS indexes,
+#       then the side_player key of each side (all keys in KEYS for Redis Cluster)
+# ARGV: player_id, game_id, invited (1: no booking needed), max players,
+#       join time, then side index and paddle index of each side
+# returns: the side index or one of the error codes below
+ADD_PLAYER_SCRIPT = """
+local player_id, game_id = ARGV[1], ARGV[2]
+if redis.call('SISMEMBER', KEYS[1], player_id) == 1 then
+    return -1
+end
+if ARGV[3] == '0' and redis.call('EXISTS', KEYS[2], KEYS[3]) == 0 then
+    return -2
+end
+if redis.call('SCARD', KEYS[1]) >= tonumber(ARGV[4]) then
+    return -3
+end
+local side_key_index = 11
+for i = 6, #ARGV, 2 do
+    side_key_index = side_key_index + 1
+    local side_key = KEYS[side_key_index]
+    if redis.call('EXISTS', side_key) == 0 then
+        redis.call('SADD', KEYS[1], player_id)
+        redis.call('SET', KEYS[4], ARGV[i])
+        redis.call('SET', KEYS[5], ARGV[i + 1])
+        redis.call('SET', side_key, player_id)
+        redis.call('SET', KEYS[6], '1')
+        redis.call('SET', KEYS[7], ARGV[5])
+        redis.call('DEL', KEYS[2], KEYS[3])
+        redis.call('SADD', KEYS[8], KEYS[4], KEYS[5], side_key, KEYS[6], KEYS[7])
+        redis.call('SADD', KEYS[9], game_id)
+        redis.call('SREM', KEYS[10], player_id)
+        redis.call('SREM', KEYS[11], game_id)
+        return tonumber(ARGV[i])
+    end
+end
+return -4
+"""
+# registered once, run with client= on the connection of the game
+_add_player = AsyncScript(None, ADD_PLAYER_SCRIPT.encode())
+NO_BOOKING = -2
+ADD_PLAYER_ERRORS = {
+    -1: "Already connected - switching to spectator mode",
+    NO_BOOKING: "No booking found - joining as spectator",
+    -3: "Game full - joining as spectator",
+    -4: "No positions available",
+}
+
 
 
 async def has_pending_invitations(user_id: str, redis_conn) -> bool:
    """Check if user has any pending invitations as sender or recipient"""
-   async with redis_conn.scan_iter(match=f"{cls.INVITATION_PREFIX}{user_id}:*:*") as scan1:
-       async for _ in scan1:
-           return True
-           
-   async with redis_conn.scan_iter(match=f"{cls.INVITATION_PREFIX}*:*:{user_id}") as scan2:
-       async for _ in scan2:
-           return True
-   
-   return False
+   return bool(await GC.get_user_invitations(redis_conn, user_id))
 
 
 
 async def add_player(self, player_id):
-    """Add player with process-safe checks"""
+    """Add player with process-safe checks, one ADD_PLAYER_SCRIPT call"""
     try:
-
-
-        # Check if player exists
-        if await self.redis_conn.sismember(self.players_key, player_id):
-            return {
-                "role": "spectator",
-                "message": "Already connected - switching to spectator mode",
-            }
- 
-        # Check if player is booked -> add also already tournament key
         booking_key = f"{GC.BOOKED_USER_PREFIX}{player_id}:{self.game_id}"
         tournament_key = f"{GC.TOURNAMENT_USER_PREFIX}{player_id}:{self.game_id}"
-        #invitation_key = f"{GC.INVITATION_PREFIX}{to_user_id}:{game_id}:{from_user_id}"
+        keys = [
+            self.players_key,
+            booking_key,
+            tournament_key,
+            f"{self.game_id}:player_side:{player_id}",
+            f"{self.game_id}:paddle_index:{player_id}",
+            f"{GC.PLAYING_USER_PREFIX}{player_id}:{self.game_id}",
+            f"player_join_time:{self.game_id}:{player_id}",
+            f"{GC.GAME_KEYS}:{self.game_id}",
+            f"{GC.USER_GAMES}:{player_id}",
+            f"{GC.GAME_BOOKINGS}:{self.game_id}",
+            f"{GC.USER_BOOKINGS}:{player_id}",
+        ]
+        # free sides are taken in the order of players_sides
+        sides = []
+        for side_index in self.settings.get("players_sides"):
+            sides.extend([side_index, self.active_sides.index(side_index)])
+            keys.append(f"{self.game_id}:side_player:{side_index}")
         logger.debug(f"KEYS: {booking_key} / {tournament_key}")
-        pipeline = self.redis_conn.pipeline() 
-        pipeline.exists(booking_key) 
-        pipeline.exists(tournament_key) 
-        is_booked, is_tournament_player = await pipeline.execute() 
-        
-    
-        if not (is_booked or is_tournament_player or has_pending_invitations(player_id, self.redis_conn)):
-  
-            return {  
-                "role": "spectator", 
-                "message": "No booking found - joining as spectator", 
-            }
-        # check max player
-        max_players = self.settings.get("num_players")
-        current_count = await self.redis_conn.scard(self.players_key)
-        if current_count >= max_players:
-            return {"role": "spectator", "message": "Game full - joining as spectator"}
-        
-        # get index_site
-        active_sides = self.settings.get("players_sides")
-        taken_index = []
-        for side_index in active_sides:
-            # Check if this position is taken
-            if await self.redis_conn.exists(f"{self.game_id}:side_player:{side_index}"):
-                taken_index.append(side_index)
-        
-        # Find first available position
-        available_index = None
-        for side_index in active_sides:
-            if side_index not in taken_index:
-                available_index = side_index
-                break
-        if available_index is None:
-            return {"role": "spectator", "message": "No positions available"}
+
+        args = [player_id, self.game_id, 0, self.settings.get("num_players"), time.time(), *sides]
+        result = await _add_player(keys=keys, args=args, client=self.redis_conn)
+        if result == NO_BOOKING and await has_pending_invitations(player_id, self.redis_conn):
+            # invited players need no booking
+            args[2] = 1
+            result = await _add_player(keys=keys, args=args, client=self.redis_conn)
+        if result < 0:
+            return {"role": "spectator", "message": ADD_PLAYER_ERRORS[result]}
+
+        available_index = result
         paddle_index = self.active_sides.index(available_index)
-        current_time = time.time()
-        pipeline = self.redis_conn.pipeline()
-        pipeline.sadd(self.players_key, player_id)
-        pipeline.set(f"{self.game_id}:player_side:{player_id}", str(available_index).encode())
-        pipeline.set(f"{self.game_id}:paddle_index:{player_id}", str(paddle_index).encode())
-        pipeline.set(f"{self.game_id}:side_player:{available_index}", player_id.encode())
-        pipeline.set(f"{GC.PLAYING_USER_PREFIX}{player_id}:{self.game_id}", b"1")
-        pipeline.set(f"player_join_time:{self.game_id}:{player_id}", str(current_time).encode())
-        pipeline.delete(booking_key)
-        pipeline.delete(tournament_key)
-        await pipeline.execute()
+        # a forfeit of an earlier leave must not end the game of the player who came back
+        await self.redis_conn.delete(self.forfeit_key)
+        await GC.refresh_lobby_players(self.game_id)
         return {
             "role": "player",
             "index": available_index,
@@ -97,9 +120,6 @@ async def add_player(self, player_id):
             "message": "Successfully joined as player",
         }
 
-
-
-
     except Exception as e:
         logger.error(f"Error adding player: {e}")
         return False
@@ -151,7 +171,9 @@ async def _handle_normal_pregame_leave(self, player_id: str, side_index: int):
         pipeline.delete(f"{self.game_id}:paddle_index:{player_id}")
         pipeline.delete(f"player_join_time:{self.game_id}:{player_id}")
         pipeline.delete(f"{GC.PLAYING_USER_PREFIX}{player_id}:{self.game_id}")
+        pipeline.srem(f"{GC.USER_GAMES}:{player_id}", self.game_id)
         await pipeline.execute()
+        await GC.refresh_lobby_players(self.game_id)
         
         # Notify other players
         #await self.channel_layer.group_send(
@@ -169,17 +191,17 @@ async def _handle_normal_pregame_leave(self, player_id: str, side_index: int):
         raise
 
 
-# not right !!
 async def _handle_tournament_pregame_leave(self, player_id: str, side_index: int):
     """Handle tournament player leaving before game starts"""
     try:
-        # Set score to 0 for forfeiting player in game state
+        # Set score to 0 for forfeiting player in game state.
+        # No game loop runs yet, it loads the stored state when the game starts
         state_data = await self.redis_conn.get(self.state_key)
         if state_data:
             current_state = msgpack.unpackb(state_data)
             current_state["scores"][side_index] = 0
             await self.redis_conn.set(self.state_key, msgpack.packb(current_state))
-        
+
         # Remove player data
         pipeline = self.redis_conn.pipeline()
         pipeline.srem(self.players_key, player_id)
@@ -187,7 +209,9 @@ async def _handle_tournament_pregame_leave(self, player_id: str, side_index: int
         pipeline.delete(f"{self.game_id}:side_player:{side_index}")
         pipeline.delete(f"player_join_time:{self.game_id}:{player_id}")
         pipeline.delete(f"{GC.PLAYING_USER_PREFIX}{player_id}:{self.game_id}")
+        pipeline.srem(f"{GC.USER_GAMES}:{player_id}", self.game_id)
         await pipeline.execute()
+        await GC.refresh_lobby_players(self.game_id)
         
         # Notify other players
         await self.channel_layer.group_send(
@@ -208,34 +232,22 @@ async def _handle_tournament_pregame_leave(self, player_id: str, side_index: int
 async def _handle_ingame_leave(self, player_id: str, side_index: int, player_count: int, paddle_index: int):
     """Handle player leaving during active game"""
     try:
-        # Use the same state lock as game_update
-        async with RedisLock(self.redis_conn, f"{self.game_id}_state"):
-            # Get current state to modify
-            state_data = await self.redis_conn.get(self.state_key)
-            if not state_data:
-                raise ValueError("Game state not found")
-            
-            
-            if player_count <= 2:
-                if not await self.redis_conn.exists(f"game_finished:{self.game_id}"):
-                    current_state = msgpack.unpackb(state_data)
-
-                    # Last player leaving gives opponents 11 points, themselves 0
-                    current_state["scores"] = [11 if i != paddle_index else 0 for i in range(len(current_state["scores"]))]
-                    await self.redis_conn.set(self.state_key, msgpack.packb(current_state))
-                game_over = True
-#            else:
-#                # Convert player's paddle to wall
-#                if "paddles" in current_state:
-#                    for paddle in current_state["paddles"]:
-#                        if paddle.get("side_index") == side_index:
-#                            paddle["is_wall"] = True
-#                            paddle["active"] = False
-#                current_state["scores"][side_index] = 0
-#                for i, ball in enumerate(current_state.get("balls", [])):
-#                    current_state["balls"][i] = self.reset_ball(ball, i)
-#                game_over = False
-#            # Update state within the same lock
+        # The game loop owns the state: the forfeit goes through forfeit_key,
+        # the loop applies the scores and ends the game (see apply_forfeit)
+        game_over = player_count <= 2
+        if game_over and not await self.redis_conn.exists(f"game_finished:{self.game_id}"):
+            await self.redis_conn.set(self.forfeit_key, paddle_index, ex=FORFEIT_EXPIRY)
+#        else:
+#            # Convert player's paddle to wall
+#            if "paddles" in current_state:
+#                for paddle in current_state["paddles"]:
+#                    if paddle.get("side_index") == side_index:
+#                        paddle["is_wall"] = True
+#                        paddle["active"] = False
+#            current_state["scores"][side_index] = 0
+#            for i, ball in enumerate(current_state.get("balls", [])):
+#                current_state["balls"][i] = self.reset_ball(ball, i)
+#            game_over = False
         
         # Notify other players
         await self.channel_layer.group_send(
@@ -246,20 +258,19 @@ async def _handle_ingame_leave(self, player_id: str, side_index: int, player_cou
                 "side_index": side_index,
                 "converted_to_wall": player_count > 2,
                 "game_over": game_over,
-                "state": current_state
             }
         )
         
-        if game_over:
-            await self.end_game()
-        # Remove player data - can be outside state lock since it's player-specific
+        # Remove player data
         pipeline = self.redis_conn.pipeline()
         pipeline.srem(self.players_key, player_id)
         pipeline.delete(f"{self.game_id}:player_side:{player_id}")
         pipeline.delete(f"{self.game_id}:side_player:{side_index}")
         pipeline.delete(f"player_join_time:{self.game_id}:{player_id}")
         pipeline.delete(f"{GC.PLAYING_USER_PREFIX}{player_id}:{self.game_id}")
+        pipeline.srem(f"{GC.USER_GAMES}:{player_id}", self.game_id)
         await pipeline.execute()
+        await GC.refresh_lobby_players(self.game_id)
         
         
     except Exception as e:
@@ -267,6 +278,19 @@ async def _handle_ingame_leave(self, player_id: str, side_index: int, player_cou
         raise
 
 
+def apply_forfeit(self, state):
+    """
+    Apply a forfeit read from forfeit_key (see apply_tick_reads) to the in-memory state:
+    the leaving player gets 0, the others 11.
+    Returns True if the game is over.
+    """
+    if self.forfeit_index is None:
+        return False
+    state["scores"] = [11 if i != self.forfeit_index else 0 for i in range(len(state["scores"]))]
+    self.forfeit_index = None
+    return True
+
+
     """
             if side_index:  # If we found their side index
                 pipeline = self.redis_conn.pipeline()
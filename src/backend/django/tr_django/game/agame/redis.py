@@ -1,11 +1,12 @@
 import redis.asyncio as redis
 from channels.layers import get_channel_layer
 import asyncio
+from ..gamecoordinator.GameCoordinator import GameCoordinator as GC
+from ..gamecoordinator.redis_pools import RedisPools
 
 
 async def setup_connections(self):
     """Set up Redis and channel layer connections"""
-    self.redis_conn = redis.Redis.from_url(
-        "redis://redis:6379/1", decode_responses=False
-    )
+    # shared pool, one game manager is built per websocket connection
+    self.redis_conn = RedisPools.client(GC.REDIS_GAME_URL, decode_responses=False)
     self.channel_layer = get_channel_layer()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TickClock:
+    """
+    Fixed-timestep clock for the game loop.
+
+    Deadlines are tracked against time.monotonic(), so the tick period does not
+    grow with compute time or redis latency. When the loop falls behind, the
+    missed ticks are returned as catch-up steps (bounded by max_catchup_steps),
+    everything beyond that is dropped and counted as skipped frames.
+    """
+
+    def __init__(self, tick_rate: int = 60, max_catchup_steps: int = 4):
+        self.tick_interval = 1.0 / float(tick_rate)
+        self.max_catchup_steps = max(1, int(max_catchup_steps))
+        self.next_tick = None
+        # stats
+        self.tick = 0
+        self.overruns = 0
+        self.skipped_frames = 0
+        self.last_skipped = 0
+
+    def start(self):
+        """Set the first deadline to now"""
+        self.next_tick = time.monotonic()
+
+    async def wait(self):
+        """Sleep until the next deadline (returns at once if already late)"""
+        if self.next_tick is None:
+            self.start()
+        delay = self.next_tick - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def due_steps(self) -> int:
+        """
+        Number of simulation steps to run for this deadline.
+        1 when on time, more when the loop has to catch up.
+        The frames dropped for this deadline are kept in last_skipped.
+        """
+        now = time.monotonic()
+        behind = now - self.next_tick
+        steps = 1 + int(behind // self.tick_interval) if behind > 0 else 1
+
+        if steps > 1:
+            self.overruns += 1
+        self.last_skipped = 0
+        if steps > self.max_catchup_steps:
+            self.last_skipped = steps - self.max_catchup_steps
+            self.skipped_frames += self.last_skipped
+            steps = self.max_catchup_steps
+            # drop the skipped frames instead of chasing them forever
+            self.next_tick = now + self.tick_interval
+        else:
+            self.next_tick += steps * self.tick_interval
+        self.tick += steps
+        return steps
+
+    def stats(self) -> dict:
+        return {
+            "tick": self.tick,
+            "overruns": self.overruns,
+            "skipped_frames": self.skipped_frames,
+        }
+
+
+class TickStats:
+    """
+    Tick counters of one game on a shared clock: ticks the game was stepped
+    in, overruns (ticks with catch-up steps) and frames skipped while it ran.
+    """
+
+    __slots__ = ("tick", "overruns", "skipped_frames")
+
+    def __init__(self):
+        self.tick = 0
+        self.overruns = 0
+        self.skipped_frames = 0
+
+    def record(self, steps: int, skipped: int = 0):
+        self.tick += steps
+        if steps > 1:
+            self.overruns += 1
+        self.skipped_frames += skipped
+
+    def stats(self) -> dict:
+        return {
+            "tick": self.tick,
+            "overruns": self.overruns,
+            "skipped_frames": self.skipped_frames,
+        }
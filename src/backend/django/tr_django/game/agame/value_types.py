@@ -0,0 +1,113 @@
+class Record:
+    """
+    Base of the __slots__ value types of the physics pipeline.
+
+    The fields are plain attributes. Item access and get() work like on the
+    dicts these records replace, to_dict() gives the dict shape wherever a
+    record has to be serialized.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def to_dict(self):
+        return {
+            name: value.to_dict() if isinstance(value, Record) else value
+            for name, value in ((name, getattr(self, name)) for name in self.__slots__)
+        }
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class SideMovement(Record):
+    """Movement of a ball relative to one side in the current tick"""
+
+    __slots__ = (
+        "is_approaching",
+        "current_distance",
+        "approach_speed",
+        "type",  # "approaching", "moving_away", "parallel" or "tunneling"
+        "signed_distance",
+    )
+
+    def __init__(
+        self, is_approaching, current_distance, approach_speed, type, signed_distance=None
+    ):
+        self.is_approaching = is_approaching
+        self.current_distance = current_distance
+        self.approach_speed = approach_speed
+        self.type = type
+        self.signed_distance = signed_distance
+
+
+class AngleData(Record):
+    """Angles of a ball in the circular layout"""
+
+    __slots__ = ("sector_angle", "ball_angle", "sector_size")
+
+    def __init__(self, sector_angle, ball_angle, sector_size):
+        self.sector_angle = sector_angle
+        self.ball_angle = ball_angle
+        self.sector_size = sector_size
+
+
+class CollisionCandidate(Record):
+    """Side a ball may collide with, input of the collision verification phase"""
+
+    __slots__ = ("side_index", "movement", "type", "projection", "angle_data")
+
+    def __init__(self, side_index, movement, type, projection=None, angle_data=None):
+        self.side_index = side_index
+        self.movement = movement  # SideMovement
+        self.type = type
+        self.projection = projection  # point of a tunneling ball on the side
+        self.angle_data = angle_data  # AngleData (circular layout)
+
+
+class Side(Record):
+    """Static geometry of one polygon side"""
+
+    __slots__ = (
+        "index",
+        "start_x",
+        "start_y",
+        "end_x",
+        "end_y",
+        "normal_x",
+        "normal_y",
+        "length_squared",
+        "normal",  # the normal dict of the settings, as used in collision results
+    )
+
+    def __init__(self, index, start, end, normal):
+        self.index = index
+        self.start_x = float(start["x"])
+        self.start_y = float(start["y"])
+        self.end_x = float(end["x"])
+        self.end_y = float(end["y"])
+        self.normal_x = float(normal["x"])
+        self.normal_y = float(normal["y"])
+        self.length_squared = (self.end_x - self.start_x) ** 2 + (
+            self.end_y - self.start_y
+        ) ** 2
+        self.normal = normal
+
+    @classmethod
+    def from_polygon(cls, vertices, normals):
+        """Sides of a polygon from its vertices and normals"""
+        if not vertices or not normals:
+            return []
+        count = len(normals)
+        return [
+            cls(index, vertices[index], vertices[(index + 1) % count], normals[index])
+            for index in range(count)
+        ]
@@ -1,4 +1,8 @@
 from ..agame.AGameManager import AGameManager
+from ..agame.continuous_collision import MISS_DEPTH
+from ..agame.impact_schedule import ticks_to_radius
+from ..agame.movement_tracker import MovementTracker
+from ..agame.value_types import AngleData, CollisionCandidate, SideMovement
 import math
 import random
 import msgpack
@@ -319,43 +323,109 @@ class CircularPongGame(AGameManager):
                 ball, sector_index, ball_index, new_state
             )
 
-            if ball_movement["is_approaching"]:
-                if ball_movement["type"] == "tunneling":
+            if ball_movement.is_approaching:
+                angle_data = AngleData(
+                    sector_index * sector_size, current_angle, sector_size
+                )
+                if ball_movement.type == "tunneling":
                     # Immediately return tunneling case, highest priority
-                    return {
-                        "side_index": sector_index,
-                        "movement": ball_movement,
-                        "type": "tunneling",
-                        "angle_data": {
-                            "sector_angle": sector_index * sector_size,
-                            "ball_angle": current_angle,
-                            "sector_size": sector_size,
-                        },
-                    }
+                    return CollisionCandidate(
+                        sector_index, ball_movement, "tunneling", angle_data=angle_data
+                    )
                 else:
                     # Add as potential candidate
                     collision_candidates.append(
-                        {
-                            "side_index": sector_index,
-                            "movement": ball_movement,
-                            "type": ball_movement["type"],
-                            "angle_data": {
-                                "sector_angle": sector_index * sector_size,
-                                "ball_angle": current_angle,
-                                "sector_size": sector_size,
-                            },
-                        }
+                        CollisionCandidate(
+                            sector_index,
+                            ball_movement,
+                            ball_movement.type,
+                            angle_data=angle_data,
+                        )
                     )
 
         # Select closest potential collision if any exist
         if collision_candidates:
             # print (collision_candidates)
             return min(
-                collision_candidates, key=lambda x: x["movement"]["current_distance"]
+                collision_candidates, key=lambda x: x.movement.current_distance
             )
 
         return None
 
+    def find_time_of_impact(self, ball, remaining, new_state):
+        """
+        Swept circle against the arc: earliest time the ball center reaches a
+        contact radius (outer_boundary minus a contact plane distance) where
+        the sector at the impact point has that kind of contact.
+
+        Returns:
+            tuple: (time of impact as fraction of remaining, collision_candidate)
+            or None
+        """
+        move_x = ball["velocity_x"] * remaining
+        move_y = ball["velocity_y"] * remaining
+        a = move_x * move_x + move_y * move_y
+        if a == 0:
+            return None
+        b = 2 * (ball["x"] * move_x + ball["y"] * move_y)
+        radial_distance_squared = ball["x"] ** 2 + ball["y"] ** 2
+        sector_size = 2 * math.pi / self.num_sides
+
+        # contact planes of paddle sectors and walls, in the order they are reached
+        contacts = (
+            (ball["size"] + new_state["dimensions"]["paddle_width"], "paddle"),
+            (ball["size"], "wall"),
+            (ball["size"] * MISS_DEPTH, "goal"),
+        )
+        for contact, kind in contacts:
+            contact_radius = self.outer_boundary - contact
+            c = radial_distance_squared - contact_radius * contact_radius
+            if c >= 0:
+                # already at or behind this radius, impact now if moving outward
+                if b <= 0:
+                    continue
+                time_of_impact = 0.0
+            else:
+                time_of_impact = (-b + math.sqrt(b * b - 4 * a * c)) / (2 * a)
+            if time_of_impact > 1.0:
+                break
+            impact_x = ball["x"] + move_x * time_of_impact
+            impact_y = ball["y"] + move_y * time_of_impact
+            impact_angle = math.atan2(impact_y, impact_x)
+            if impact_angle < 0:
+                impact_angle += 2 * math.pi
+            side_index = min(int(impact_angle / sector_size), self.num_sides - 1)
+            is_active = side_index in self.active_sides
+            if (kind == "wall") == is_active:
+                continue
+            relative_position = (impact_angle - side_index * sector_size) / sector_size
+            if kind == "paddle" and not self.paddle_covers(
+                new_state, side_index, relative_position
+            ):
+                continue
+            radial_velocity = (
+                impact_x * ball["velocity_x"] + impact_y * ball["velocity_y"]
+            ) / max(math.sqrt(impact_x**2 + impact_y**2), 1e-12)
+            movement = SideMovement(
+                is_approaching=True,
+                current_distance=float(contact),
+                approach_speed=float(abs(radial_velocity)),
+                type="approaching",
+            )
+            return time_of_impact, CollisionCandidate(
+                side_index,
+                movement,
+                "approaching",
+                angle_data=AngleData(
+                    side_index * sector_size, impact_angle, sector_size
+                ),
+            )
+        return None
+
+    def ticks_to_reach(self, ball, reach):
+        """Ticks until the ball center reaches the radius outer_boundary - reach"""
+        return ticks_to_radius(ball, self.outer_boundary - reach)
+
     def check_ball_movement_relative_to_side(
         self, ball, side_index, ball_index, new_state
     ):
@@ -405,9 +475,10 @@ class CircularPongGame(AGameManager):
         ) / radial_distance
 
         # Get previous state
-        previous_movement = self.previous_movements[ball_index]["sides"][side_index]
-        previous_signed_distance = float(previous_movement["signed_distance"])
-        previous_radial_velocity = float(previous_movement["dot_product"])
+        movements = self.previous_movements
+        slot = movements.slot(ball_index, side_index)
+        previous_signed_distance = movements.signed_distance[slot]
+        previous_radial_velocity = movements.dot_product[slot]
         was_approaching = previous_radial_velocity < 0
 
         PARALLEL_THRESHOLD = float(1e-10)
@@ -421,13 +492,13 @@ class CircularPongGame(AGameManager):
                 radial_velocity,
                 signed_distance,
             )
-            return {
-                "is_approaching": True,
-                "current_distance": float(current_distance),
-                "signed_distance": float(signed_distance),
-                "approach_speed": float(0.0),
-                "type": "parallel",
-            }
+            return SideMovement(
+                is_approaching=True,
+                current_distance=float(current_distance),
+                approach_speed=float(0.0),
+                type="parallel",
+                signed_distance=float(signed_distance),
+            )
 
         # Case 2: Ball is moving outward (approaching boundary)
         if radial_velocity > 0:
@@ -438,13 +509,13 @@ class CircularPongGame(AGameManager):
                 radial_velocity,
                 signed_distance,
             )
-            return {
-                "is_approaching": True,
-                "current_distance": float(current_distance),
-                "signed_distance": float(signed_distance),
-                "approach_speed": float(radial_velocity),
-                "type": "approaching",
-            }
+            return SideMovement(
+                is_approaching=True,
+                current_distance=float(current_distance),
+                approach_speed=float(radial_velocity),
+                type="approaching",
+                signed_distance=float(signed_distance),
+            )
 
         # Case 3: Ball is moving inward
         else:
@@ -457,13 +528,13 @@ class CircularPongGame(AGameManager):
                     radial_velocity,
                     signed_distance,
                 )
-                return {
-                    "is_approaching": False,
-                    "current_distance": float(current_distance),
-                    "signed_distance": float(signed_distance),
-                    "approach_speed": float(abs(radial_velocity)),
-                    "type": "moving_away",
-                }
+                return SideMovement(
+                    is_approaching=False,
+                    current_distance=float(current_distance),
+                    approach_speed=float(abs(radial_velocity)),
+                    type="moving_away",
+                    signed_distance=float(signed_distance),
+                )
 
             # Case 3b: Was moving outward last frame
             else:
@@ -479,13 +550,13 @@ class CircularPongGame(AGameManager):
                     # Case 3ba: Tunneling detected
                     if position_sign_changed:
                         # Don't update movement tracking for tunneling
-                        return {
-                            "is_approaching": True,
-                            "current_distance": float(current_distance),
-                            "signed_distance": float(signed_distance),
-                            "approach_speed": float(abs(radial_velocity)),
-                            "type": "tunneling",
-                        }
+                        return SideMovement(
+                            is_approaching=True,
+                            current_distance=float(current_distance),
+                            approach_speed=float(abs(radial_velocity)),
+                            type="tunneling",
+                            signed_distance=float(signed_distance),
+                        )
 
                 # Case 3bb: Regular moving inward
                 self.update_ball_movement(
@@ -495,13 +566,13 @@ class CircularPongGame(AGameManager):
                     radial_velocity,
                     signed_distance,
                 )
-                return {
-                    "is_approaching": False,
-                    "current_distance": float(current_distance),
-                    "signed_distance": float(signed_distance),
-                    "approach_speed": float(abs(radial_velocity)),
-                    "type": "moving_away",
-                }
+                return SideMovement(
+                    is_approaching=False,
+                    current_distance=float(current_distance),
+                    approach_speed=float(abs(radial_velocity)),
+                    type="moving_away",
+                    signed_distance=float(signed_distance),
+                )
 
     def handle_wall(self, ball, collision_candidate, new_state):
         """
@@ -509,19 +580,19 @@ class CircularPongGame(AGameManager):
 
         Args:
             ball (dict): Ball object with position and velocity
-            collision_candidate (dict): Contains collision detection info including angle data
+            collision_candidate (CollisionCandidate): Contains collision detection info including angle data
             new_state (dict): Current game state
 
         Returns:
             dict: Complete collision information with debug data
         """
-        side_index = collision_candidate["side_index"]
-        angle_data = collision_candidate["angle_data"]
+        side_index = collision_candidate.side_index
+        angle_data = collision_candidate.angle_data
 
         # Reuse pre-calculated angles
-        ball_angle = angle_data["ball_angle"]
-        sector_size = angle_data["sector_size"]
-        sector_start = angle_data["sector_angle"]
+        ball_angle = angle_data.ball_angle
+        sector_size = angle_data.sector_size
+        sector_start = angle_data.sector_angle
         sector_end = sector_start + sector_size
 
         # Calculate collision point on circle (use outer boundary as radius)
@@ -542,15 +613,15 @@ class CircularPongGame(AGameManager):
         return {
             "type": "wall",
             "side_index": side_index,
-            "distance": collision_candidate["movement"]["current_distance"],
+            "distance": collision_candidate.movement.current_distance,
             "normal": normal,
             "projection": collision_point,
             "hit_position": relative_position,
-            "approach_speed": collision_candidate["movement"]["approach_speed"],
+            "approach_speed": collision_candidate.movement.approach_speed,
             "debug_info": {
                 "relative_hit": relative_position,
                 "ball_size": ball["size"],
-                "impact_distance": collision_candidate["movement"]["current_distance"],
+                "impact_distance": collision_candidate.movement.current_distance,
                 "collision_point": collision_point,
                 "sector_info": {
                     "start_angle": float(sector_start),
@@ -559,7 +630,7 @@ class CircularPongGame(AGameManager):
                     "radius": float(self.outer_boundary),
                 },
                 "was_tunneling": (
-                    collision_candidate["movement"]["type"] == "tunneling"
+                    collision_candidate.movement.type == "tunneling"
                 ),
             },
         }
@@ -573,20 +644,20 @@ class CircularPongGame(AGameManager):
 
         Args:
             ball (dict): Ball object with position and velocity
-            collision_candidate (dict): Contains collision detection info including angle data
+            collision_candidate (CollisionCandidate): Contains collision detection info including angle data
             new_state (dict): Current game state
 
         Returns:
             dict: Complete collision info or None if ball should continue moving
         """
-        side_index = collision_candidate["side_index"]
-        angle_data = collision_candidate["angle_data"]
+        side_index = collision_candidate.side_index
+        angle_data = collision_candidate.angle_data
         paddle = new_state["paddles"][side_index]
 
         # Reuse pre-calculated angles
-        ball_angle = angle_data["ball_angle"]
-        sector_size = angle_data["sector_size"]
-        sector_start = angle_data["sector_angle"]
+        ball_angle = angle_data.ball_angle
+        sector_size = angle_data.sector_size
+        sector_start = angle_data.sector_angle
 
         # Calculate relative position along arc (0 to 1)
         relative_angle = ball_angle
@@ -622,14 +693,14 @@ class CircularPongGame(AGameManager):
             return {
                 "type": "paddle",
                 "side_index": side_index,
-                "distance": collision_candidate["movement"]["current_distance"],
+                "distance": collision_candidate.movement.current_distance,
                 "normal": normal,
                 "projection": collision_point,
                 "normalized_offset": normalized_offset,
                 "is_edge_hit": abs(abs(normalized_offset) - 1.0) < 0.1,
                 "paddle_index": side_index,
                 "hit_position": relative_position,
-                "approach_speed": collision_candidate["movement"]["approach_speed"],
+                "approach_speed": collision_candidate.movement.approach_speed,
                 "debug_info": {
                     "paddle_center": paddle_center,
                     "paddle_length": paddle_length,
@@ -643,7 +714,7 @@ class CircularPongGame(AGameManager):
                     "normalized_distance": distance_from_paddle_center
                     / paddle_half_length,
                     "was_tunneling": (
-                        collision_candidate["movement"]["type"] == "tunneling"
+                        collision_candidate.movement.type == "tunneling"
                     ),
                     "sector_info": {
                         "start_angle": float(sector_start),
@@ -654,7 +725,7 @@ class CircularPongGame(AGameManager):
             }
 
         # If no paddle hit, check if ball is within hitzone distance
-        current_distance = collision_candidate["movement"]["current_distance"]
+        current_distance = collision_candidate.movement.current_distance
         hitzone_distance = ball["size"]
 
         if abs(current_distance) >= hitzone_distance:
@@ -671,7 +742,7 @@ class CircularPongGame(AGameManager):
             },
             "projection": collision_point,
             "active_paddle_index": self.active_sides.index(side_index),
-            "approach_speed": collision_candidate["movement"]["approach_speed"],
+            "approach_speed": collision_candidate.movement.approach_speed,
             "debug_info": {
                 "paddle_center": paddle_center,
                 "paddle_length": paddle_length,
@@ -685,7 +756,7 @@ class CircularPongGame(AGameManager):
                     abs(relative_position - (paddle_center + paddle_half_length)),
                 ),
                 "was_tunneling": (
-                    collision_candidate["movement"]["type"] == "tunneling"
+                    collision_candidate.movement.type == "tunneling"
                 ),
                 "sector_info": {
                     "start_angle": float(sector_start),
@@ -702,7 +773,7 @@ class CircularPongGame(AGameManager):
 
         Args:
             ball (dict): Current ball state
-            current_sector (dict): Information about current sector if available
+            current_sector (CollisionCandidate): Information about current sector if available
             new_state (dict): Current game state
 
         Returns:
@@ -734,25 +805,21 @@ class CircularPongGame(AGameManager):
             )
 
             # Create standardized movement info matching format from check_ball_movement_relative_to_side
-            movement_info = {
-                "is_approaching": True,
-                "current_distance": float(0.0),  # At intersection point
-                "approach_speed": float(approach_speed),
-                "type": "tunneling",
-            }
+            movement_info = SideMovement(
+                is_approaching=True,
+                current_distance=float(0.0),  # At intersection point
+                approach_speed=float(approach_speed),
+                type="tunneling",
+            )
 
             # Create standardized sector info
-            standardized_sector = {
-                "side_index": side_index,
-                "movement": movement_info,
-                "type": "tunneling",
-                "projection": intersection,
-                "angle_data": {
-                    "sector_angle": side_index * sector_size,
-                    "ball_angle": angle,
-                    "sector_size": sector_size,
-                },
-            }
+            standardized_sector = CollisionCandidate(
+                side_index,
+                movement_info,
+                "tunneling",
+                projection=intersection,
+                angle_data=AngleData(side_index * sector_size, angle, sector_size),
+            )
 
             # Set ball position to intersection point
             ball["x"], ball["y"] = intersection["x"], intersection["y"]
@@ -764,7 +831,7 @@ class CircularPongGame(AGameManager):
                 return self.handle_wall(ball, standardized_sector, new_state)
 
         # Case 2: Already have sector info - use it directly
-        side_index = current_sector["side_index"]
+        side_index = current_sector.side_index
         if side_index in self.active_sides:
             return self.handle_paddle(ball, current_sector, new_state)
         else:
@@ -772,38 +839,17 @@ class CircularPongGame(AGameManager):
 
     def self_initialize_ball_movements(self, num_balls):
         """
-        Initialize the nested array structure for ball movement tracking in circular layout.
+        Initialize the movement tracking arrays in circular layout.
 
         Args:
             num_balls (int): Number of balls to track
 
-        Creates a data structure for each ball that tracks:
+        Tracks for each ball:
         - Per-sector movement data
         - Deadzone state
         - Last position (x,y)
-        - Last angular position
-        - Last radial distance
         """
-        self.previous_movements = [
-            {
-                "sides": [
-                    {
-                        "distance": float(0.0),  # Distance from boundary
-                        "signed_distance": float(
-                            0.0
-                        ),  # Signed distance (positive = outside)
-                        "dot_product": float(0.0),  # Radial velocity component
-                        "angle": float(0.0),  # Angular position within sector
-                    }
-                    for _ in range(self.num_sides)
-                ],
-                "in_deadzone": True,  # Start in deadzone (center)
-                "last_position": {"x": float(0.0), "y": float(0.0)},
-                "last_angle": float(0.0),  # Last angular position
-                "last_radial_distance": float(0.0),  # Last distance from center
-            }
-            for _ in range(num_balls)
-        ]
+        self.previous_movements = MovementTracker(num_balls, self.num_sides)
 
     def update_ball_movement(
         self, ball_index, side_index, distance, dot_product, signed_distance=None
@@ -818,47 +864,18 @@ class CircularPongGame(AGameManager):
             dot_product (float): Current radial velocity component
             signed_distance (float, optional): Signed distance value
         """
-        # Expand tracking array if needed for new balls
+        # Expand tracking arrays if needed for new balls
         if ball_index >= len(self.previous_movements):
-            additional_balls = ball_index - len(self.previous_movements) + 1
-            self.previous_movements.extend(
-                [
-                    {
-                        "sides": [
-                            {
-                                "distance": float(0.0),
-                                "signed_distance": float(0.0),
-                                "dot_product": float(0.0),
-                                "angle": float(0.0),
-                            }
-                            for _ in range(self.num_sides)
-                        ],
-                        "in_deadzone": True,
-                        "last_position": {"x": float(0.0), "y": float(0.0)},
-                        "last_angle": float(0.0),
-                        "last_radial_distance": float(0.0),
-                    }
-                    for _ in range(additional_balls)
-                ]
-            )
-
-        # Calculate current angle from last known position
-        current_angle = math.atan2(
-            self.previous_movements[ball_index]["last_position"]["y"],
-            self.previous_movements[ball_index]["last_position"]["x"],
-        )
-        if current_angle < 0:
-            current_angle += 2 * math.pi
+            self.previous_movements.grow(ball_index + 1)
 
         # Update sector-specific movement data
-        self.previous_movements[ball_index]["sides"][side_index] = {
-            "distance": float(distance),
-            "dot_product": float(dot_product),
-            "signed_distance": float(
-                signed_distance if signed_distance is not None else distance
-            ),
-            "angle": float(current_angle),
-        }
+        self.previous_movements.update_side(
+            ball_index,
+            side_index,
+            distance,
+            dot_product,
+            signed_distance if signed_distance is not None else distance,
+        )
 
     def reset_ball_movement(self, ball_index):
         """
@@ -870,25 +887,10 @@ class CircularPongGame(AGameManager):
         Resets all tracking data to initial values, including:
         - Per-sector movement data
         - Deadzone state
-        - Position tracking
-        - Angular tracking
+        - Position tracking (to the center)
         """
         if ball_index < len(self.previous_movements):
-            self.previous_movements[ball_index] = {
-                "sides": [
-                    {
-                        "distance": float(0.0),
-                        "signed_distance": float(0.0),
-                        "dot_product": float(0.0),
-                        "angle": float(0.0),
-                    }
-                    for _ in range(self.num_sides)
-                ],
-                "in_deadzone": True,
-                "last_position": {"x": float(0.0), "y": float(0.0)},
-                "last_angle": float(0.0),
-                "last_radial_distance": float(0.0),
-            }
+            self.previous_movements.reset(ball_index, (0.0, 0.0))
 
     def reset_ball(self, ball, ball_index, speed=0.006):
         """
@@ -4,6 +4,14 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from .agame.AGameManager import AGameManager
 from .gamecoordinator.GameCoordinator import GameCoordinator as GC
 from .gamecoordinator.GameCoordinator import RedisLock 
+from .agame.frames import (
+    BINARY_FRAMES,
+    BINARY_SUBPROTOCOL,
+    JSON_FRAMES,
+    KEYFRAME_REQUEST_EXPIRY,
+    encode_binary_frame,
+    frame_group,
+)
 import time
 import msgpack
 import redis.asyncio as redis
@@ -27,6 +35,13 @@ class PongConsumer(AsyncWebsocketConsumer):
         self.last_pong = time.time()
         self.ping_task = None
         self.check_connection_task = None
+        # msgpack frames for the game frames and initial_state
+        self.binary = False
+        # direction of the held key in the paddle_input mode
+        self.held_direction = None
+        self.last_input_seq = None
+        # frame encoding this client is counted for in frame_clients_key
+        self.frame_encoding = None
 
     async def connect(self):
         self.game_id = self.scope["url_route"]["kwargs"]["game_id"]
@@ -71,7 +86,20 @@ class PongConsumer(AsyncWebsocketConsumer):
                 logger.info(
                     f"Player[{self.player_id}] connected to game[{self.game_id}] as spectator"
                 )
-            await self.accept()
+            if BINARY_SUBPROTOCOL in self.scope.get("subprotocols", []):
+                self.binary = True
+                await self.accept(subprotocol=BINARY_SUBPROTOCOL)
+            else:
+                await self.accept()
+            # the game loop only encodes the frames of encodings with clients
+            frame_encoding = BINARY_FRAMES if self.binary else JSON_FRAMES
+            await self.channel_layer.group_add(
+                frame_group(self.game_id, frame_encoding), self.channel_name
+            )
+            await self.game_manager.redis_conn.hincrby(
+                self.game_manager.frame_clients_key, frame_encoding, 1
+            )
+            self.frame_encoding = frame_encoding
             # Healthcheck RFC 6455 -Start ping/pong mechanism after accepting connection
             # self.ping_task = asyncio.create_task(self.send_ping())
             # self.check_connection_task = asyncio.create_task(self.check_connection())
@@ -92,22 +120,28 @@ class PongConsumer(AsyncWebsocketConsumer):
             try:
 
                 player_names = await self.get_connected_players()
-                await self.send(
-                    text_data=json.dumps(
-                        {
-                            "type": "initial_state",
-                            "game_state": self.game_manager.settings["state"],
-                            "role": self.role,
-                            "player_index": (self.player_index if self.role == "player" else None),
-                            "player_names" : player_names, 
-                            "message": player_index.get("message", "no message given"),
-                            "player_values": self.player_values,
-                            "game_setup": {
-                                "type": game_type,
-                                "vertices": self.game_manager.vertices,
-                            },
-                        }
-                    )
+                initial_state = {
+                    "type": "initial_state",
+                    "game_state": self.game_manager.settings["state"],
+                    "role": self.role,
+                    "player_index": (self.player_index if self.role == "player" else None),
+                    "player_names" : player_names, 
+                    "message": player_index.get("message", "no message given"),
+                    "player_values": self.player_values,
+                    "game_setup": {
+                        "type": game_type,
+                        "vertices": self.game_manager.vertices,
+                        "tick_rate": self.game_manager.settings.get("tick_rate"),
+                        "send_rate": self.game_manager.settings.get("send_rate"),
+                    },
+                }
+                if self.binary:
+                    await self.send(bytes_data=encode_binary_frame(initial_state))
+                else:
+                    await self.send(text_data=json.dumps(initial_state))
+                # the game loop sends deltas, ask it for a full state next tick
+                await self.game_manager.redis_conn.set(
+                    self.game_manager.keyframe_key, b"1", ex=KEYFRAME_REQUEST_EXPIRY
                 )
             except Exception as e:
                 logger.error(f"Failed to load initial game state: {str(e)}")
@@ -126,11 +160,27 @@ class PongConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(self.game_group, self.channel_name)
+        if self.frame_encoding:
+            await self.channel_layer.group_discard(
+                frame_group(self.game_id, self.frame_encoding), self.channel_name
+            )
+            clients = await self.game_manager.redis_conn.hincrby(
+                self.game_manager.frame_clients_key, self.frame_encoding, -1
+            )
+            if clients < 0:
+                # the game was cleaned up meanwhile, do not leave a stray key
+                await self.game_manager.redis_conn.hdel(
+                    self.game_manager.frame_clients_key, self.frame_encoding
+                )
+            self.frame_encoding = None
         if self.ping_task:
             self.ping_task.cancel()
         if self.check_connection_task:
             self.check_connection_task.cancel()
         if self.role == "player":
+            if self.held_direction not in (None, "none"):
+                # release a held key
+                await self.game_manager.update_paddle_velocity(self.paddle_index, 0.0)
             await self.game_manager.remove_player(self.player_id)
             logger.info(
                 f"Player[{self.player_id}] disconnected from game[{self.game_id}]"
@@ -195,14 +245,31 @@ class PongConsumer(AsyncWebsocketConsumer):
             if action == "move_paddle":
                 direction = data.get("direction")
                 user_id = data.get("user_id")
-                await self.handle_paddle_move(direction, user_id)
+                await self.handle_paddle_move(direction, user_id, self.input_seq(data))
+            elif action == "paddle_input":
+                direction = data.get("direction")
+                user_id = data.get("user_id")
+                await self.handle_paddle_input(direction, user_id, self.input_seq(data))
 
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON received: {text_data}")
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
 
-    async def handle_paddle_move(self, direction, user_id):
+    def input_seq(self, data):
+        """
+        Optional input sequence number of the client, echoed in the frames
+        once the input was applied. Must increase, stale numbers are dropped.
+        """
+        seq = data.get("seq")
+        if not isinstance(seq, int) or isinstance(seq, bool):
+            return None
+        if self.last_input_seq is not None and seq <= self.last_input_seq:
+            return None
+        self.last_input_seq = seq
+        return seq
+
+    async def handle_paddle_move(self, direction, user_id, seq=None):
         if user_id != self.player_id:  # this could go into a cheatlog
             await self.send(
                 text_data=json.dumps(
@@ -225,9 +292,42 @@ class PongConsumer(AsyncWebsocketConsumer):
             return  # could send back feedback that is too fast or and log it in cheatlog
 
         if await self.is_valid_paddle_move(direction):
-            await self.update_paddle_position(direction)
+            await self.update_paddle_position(direction, seq)
             self.last_move_time = current_time
 
+    async def handle_paddle_input(self, direction, user_id, seq=None):
+        """
+        Held-key input: the client only sends key press and release
+        ("left", "right" or "none"), the game loop moves the paddle each tick
+        with the speed of the move_paddle messages at the move cooldown.
+        """
+        if user_id != self.player_id:  # this could go into a cheatlog
+            await self.send(
+                text_data=json.dumps(
+                    {
+                        "type": "error",
+                        "message": "Your are not allowed to move this player",
+                    }
+                )
+            )
+            return
+        if direction not in ["left", "right", "none"]:
+            await self.send(
+                text_data=json.dumps(
+                    {"type": "error", "message": "wrong input key [left , right, none]"}
+                )
+            )
+            return
+
+        speed = (
+            self.player_values["move_speed"]
+            * self.player_values["move_speed_boost"]
+            / self.player_values["move_cooldown"]
+        )
+        velocity = {"left": -speed, "right": speed, "none": 0.0}[direction]
+        await self.game_manager.update_paddle_velocity(self.paddle_index, velocity, seq)
+        self.held_direction = direction
+
     async def is_valid_paddle_move(self, direction):
         # check if directions are right
         if direction not in ["left", "right"]:
@@ -262,7 +362,7 @@ class PongConsumer(AsyncWebsocketConsumer):
 
         return True
 
-    async def update_paddle_position(self, direction):
+    async def update_paddle_position(self, direction, seq=None):
         move_amount = (
             self.player_values["move_speed"] * self.player_values["move_speed_boost"]
         )
@@ -278,7 +378,7 @@ class PongConsumer(AsyncWebsocketConsumer):
             )
 
         # Use player_index instead of index
-        await self.game_manager.update_paddle(self.paddle_index, self.current_pos)
+        await self.game_manager.update_paddle(self.paddle_index, self.current_pos, seq)
 
     async def power_up_event(self, event):
         """Handle power-up events from GameManager"""
@@ -315,22 +415,18 @@ class PongConsumer(AsyncWebsocketConsumer):
 
     async def game_state(self, event):
         """Handle game state update events"""
+        # encoded once per tick by the game loop, sent to the group of the encoding
+        if "binary_frame" in event:
+            await self.send(bytes_data=event["binary_frame"])
+            return
+        if "frame" in event:
+            await self.send(text_data=event["frame"])
+            return
         sanitized_state = self.sanitize_for_json(event["game_state"])
         await self.send(
             text_data=json.dumps({"type": "game_state", "game_state": sanitized_state})
         )
 
-    async def game_collision(self, event):
-        collisions = event.get("data")
-        logger.debug(f"collisons: {collisions}")
-        for event in collisions:
-            sanitized_event = self.sanitize_for_json(event)
-            await self.send(
-                text_data=json.dumps(
-                    {"type": "game_event", "game_state": sanitized_event}
-                )
-            )
-
     async def player_joined(self, event):
         """Handle player join notifications"""
         await self.send(
@@ -354,7 +450,6 @@ class PongConsumer(AsyncWebsocketConsumer):
                 "side_index":  event["side_index"],                                                          
                 "converted_to_wall":  event["converted_to_wall"],                                             
                 "game_over":  event["game_over"],                                                            
-                "state":  event["state"]        
             }))
 
     async def game_finished(self, event):
@@ -371,6 +466,7 @@ class PongConsumer(AsyncWebsocketConsumer):
                     "type": "game_finished",
                     "game_state": event["game_state"],
                     "winner": "you" if is_winner else "other",
+                    "events": event.get("events", []),
                 },
                 cls=DjangoJSONEncoder,
             )
@@ -461,3 +557,40 @@ class PongConsumer(AsyncWebsocketConsumer):
         
         return player_data
 
+
+
+class LobbyConsumer(AsyncWebsocketConsumer):
+    """
+    Live game list: a snapshot of the waiting and running games on connect,
+    then the add / update / remove events GameCoordinator publishes on
+    create, book, join, leave and state changes.
+    """
+
+    async def connect(self):
+        if not self.scope["user"].is_authenticated:
+            await self.close(code=4001)  # Not authenticated
+            return
+        # join the group before the snapshot, no change between both gets lost
+        await self.channel_layer.group_add(GC.LOBBY_GROUP, self.channel_name)
+        await self.accept()
+        try:
+            games = await GC.get_lobby_games(GC.LOBBY_LISTED)
+            await self.send(text_data=json.dumps({"type": "lobby_snapshot", "games": games}))
+        except Exception as e:
+            logger.error(f"Error sending lobby snapshot: {e}")
+            await self.close(code=1011)
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(GC.LOBBY_GROUP, self.channel_name)
+
+    async def lobby_update(self, event):
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "lobby_update",
+                    "event": event["event"],
+                    "game_id": event["game_id"],
+                    "game": event.get("game"),
+                }
+            )
+        )
@@ -1,38 +1,24 @@
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 import msgpack
+import json
 import time
 from typing import List, Dict, Optional
 import os
 import uuid
 import asyncio
 from .GameSettingsManager import GameSettingsManager
+from .redis_pools import RedisPools
+from .redis_lock import RedisLock
 import math
 import logging
 from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
 
 
 logger = logging.getLogger(__name__)
 
 
-class RedisLock:
-    def __init__(self, redis_conn: redis.Redis, lock_key: str, timeout: int = 10):
-        self.redis_conn = redis_conn
-        self.lock_key = lock_key
-        self.timeout = timeout
-
-    async def __aenter__(self):
-        start_time = time.time()
-        while True:
-            if await self.redis_conn.set(self.lock_key, "1", nx=True, ex=self.timeout):
-                return self
-            if time.time() - start_time > self.timeout:
-                raise TimeoutError(f"Could not acquire lock: {self.lock_key}")
-            await asyncio.sleep(0.1)
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.redis_conn.delete(self.lock_key)
-
-
 class GameCoordinator:
     """creates new games and manages all waiting and running games"""
 
@@ -66,6 +52,128 @@ class GameCoordinator:
     INVITATION_PREFIX = "invitation_"
     INVITATION_EXPIRY = 300  # 5 minutes
 
+    # secondary indexes (REDIS_GAME_URL), lookups per game or user without SCAN.
+    # Members are candidates: the indexed keys stay the truth (bookings and
+    # invitations expire), readers drop members whose key is gone.
+    GAME_KEYS = "game_keys"  # SET per game: per player keys of the game
+    GAME_BOOKINGS = "game_bookings"  # SET per game: booked user ids
+    USER_BOOKINGS = "user_bookings"  # SET per user: booked game ids
+    USER_GAMES = "user_games"  # SET per user: game ids the user plays in
+    USER_INVITATIONS = "user_invitations"  # SET per user: invitation keys as sender or recipient
+
+    # lobby (REDIS_GAME_URL): one HASH with the entries of the game lists,
+    # kept up to date on create, book, join, leave and state changes.
+    # fields per game (json):
+    #   "{game_id}"          static info from the settings
+    #   "{game_id}:status"   {"status": created|waiting|running|finished, "expires_at": ts or None}
+    #   "{game_id}:players"  {"current": n, "bookings": [expiry ts of each booking]}
+    LOBBY_SUMMARY = "lobby_summary"
+    LOBBY_LISTED = ("waiting", "running")  # statuses shown in the lobby
+    LOBBY_GROUP = "game_lobby"  # channel group of the LobbyConsumers
+    LOBBY_INFO_SETTINGS = (
+        "name",
+        "mode",
+        "type",
+        "sides",
+        "score",
+        "num_players",
+        "min_players",
+        "initial_ball_speed",
+        "paddle_length",
+        "paddle_width",
+        "ball_size",
+    )
+
+    # fixed keys of a game in REDIS_GAME_URL: f"{name}:{game_id}"
+    GAME_KEY_NAMES = (
+        "game_created_time",
+        "game_type",
+        "game_lock",
+        "game_settings",
+        "game_state",
+        "game_vertices",
+        "game_normals",
+        "game_players_sides",
+        "game_player_settings",
+        NUM_PLAYERS_PREFIX,
+        "game_players",
+        "game_booked_players",
+        "game_running",
+        "game_finished",
+        "game_recorded",
+        "game_start_time",
+        "game_inputs",
+        "game_forfeit",
+        "game_keyframe",
+        "game_frame_clients",
+        "game_tick_stats",
+        "game_is_tournament",
+        "tournament_game",
+        "tournament_id",
+        GAME_KEYS,
+        GAME_BOOKINGS,
+    )
+
+    # members ARGV of the index set KEYS[1] whose key KEYS[i + 1] exists,
+    # the others are removed from the index. All keys are passed in KEYS (Cluster)
+    LIVE_MEMBERS_SCRIPT = """
+    local live = {}
+    for i, member in ipairs(ARGV) do
+        if redis.call('EXISTS', KEYS[i + 1]) == 1 then
+            table.insert(live, member)
+        else
+            redis.call('SREM', KEYS[1], member)
+        end
+    end
+    return live
+    """
+    # the scripts are registered once, run with client= on the connection of the call
+    _live_members = AsyncScript(None, LIVE_MEMBERS_SCRIPT.encode())
+
+    # join_game in one script call: check the capacity, count the live bookings
+    # (dropping the expired ones) and book the slot.
+    # KEYS: num_players, game_players, GAME_BOOKINGS index, booking key,
+    #       USER_BOOKINGS index, GAME_KEYS index, then the booking key of each
+    #       user of ARGV[4..] (all keys in KEYS for Redis Cluster)
+    # ARGV: user_id, game_id, booking expiry, then the users of the GAME_BOOKINGS
+    #       index as read before the call
+    # returns: 1 booked, 0 no free slot, -1 game not found,
+    #          -2 the index changed since it was read (read it again and retry)
+    BOOK_SLOT_SCRIPT = """
+    local num_players = redis.call('GET', KEYS[1])
+    if not num_players then
+        return -1
+    end
+    if redis.call('SCARD', KEYS[3]) ~= #ARGV - 3 then
+        return -2
+    end
+    for i = 4, #ARGV do
+        if redis.call('SISMEMBER', KEYS[3], ARGV[i]) == 0 then
+            return -2
+        end
+    end
+    local reserved = 0
+    for i = 4, #ARGV do
+        if redis.call('EXISTS', KEYS[i + 3]) == 0 then
+            redis.call('SREM', KEYS[3], ARGV[i])
+        elseif ARGV[i] ~= ARGV[1] then
+            reserved = reserved + 1
+        end
+    end
+    if redis.call('SCARD', KEYS[2]) + reserved >= tonumber(num_players) then
+        return 0
+    end
+    redis.call('SET', KEYS[4], '', 'EX', ARGV[3])
+    redis.call('SADD', KEYS[3], ARGV[1])
+    redis.call('SADD', KEYS[5], ARGV[2])
+    redis.call('SADD', KEYS[6], KEYS[4])
+    return 1
+    """
+    _book_slot = AsyncScript(None, BOOK_SLOT_SCRIPT.encode())
+    BOOKING_EXPIRY = 5  # seconds to connect after join_game
+    BOOKING_INDEX_CHANGED = -2
+    BOOK_SLOT_ATTEMPTS = 5  # script calls while other joins change the bookings
+
     # more possible key
     # waiting_tournament_games_key  = "waiting_tournament_games" # tournament games has fixed players not pubblic
     # running_tournament_games_key  = "running_tournament_game"
@@ -92,13 +200,266 @@ class GameCoordinator:
 
     @classmethod
     async def get_redis(cls, url: str) -> redis.Redis:
-        """Get Redis connection for string operations"""
-        return await redis.Redis.from_url(url, decode_responses=True)
+        """Get Redis connection for string operations (on the shared pool of the url)"""
+        return await RedisPools.client(url, decode_responses=True)
 
     @classmethod
     async def get_redis_binary(cls, url: str) -> redis.Redis:
         """Get Redis connection for binary operations (msgpack)"""
-        return await redis.Redis.from_url(url, decode_responses=False)
+        return await RedisPools.client(url, decode_responses=False)
+
+    # secondary indexes
+
+    @classmethod
+    async def live_index_members(
+        cls, redis_conn: redis.Redis, index_key: str, key_prefix: str = "", key_suffix: str = ""
+    ) -> list:
+        """
+        Members of an index set whose key f"{key_prefix}{member}{key_suffix}" still
+        exists. Stale members (expired or deleted keys) are dropped in the same
+        script call. Members added after the SMEMBERS are left for the next read.
+        """
+        members = await redis_conn.smembers(index_key)
+        if not members:
+            return []
+        keys = [index_key]
+        for member in members:
+            if isinstance(member, bytes):
+                member = member.decode()
+            keys.append(f"{key_prefix}{member}{key_suffix}")
+        return await cls._live_members(keys=keys, args=list(members), client=redis_conn)
+
+    @classmethod
+    def index_game_keys(cls, pipeline, game_id: str, *keys):
+        """Register per player keys of a game for cleanup_game and set_game_expiration"""
+        pipeline.sadd(f"{cls.GAME_KEYS}:{game_id}", *keys)
+
+    @classmethod
+    def index_booking(cls, pipeline, user_id: str, game_id: str):
+        pipeline.sadd(f"{cls.USER_BOOKINGS}:{user_id}", game_id)
+        pipeline.sadd(f"{cls.GAME_BOOKINGS}:{game_id}", user_id)
+        cls.index_game_keys(pipeline, game_id, f"{cls.BOOKED_USER_PREFIX}{user_id}:{game_id}")
+
+    @classmethod
+    def unindex_booking(cls, pipeline, user_id: str, game_id: str):
+        pipeline.srem(f"{cls.USER_BOOKINGS}:{user_id}", game_id)
+        pipeline.srem(f"{cls.GAME_BOOKINGS}:{game_id}", user_id)
+
+    @classmethod
+    async def get_game_bookings(cls, redis_conn: redis.Redis, game_id: str) -> list:
+        """User ids with a valid booking for the game"""
+        return await cls.live_index_members(
+            redis_conn, f"{cls.GAME_BOOKINGS}:{game_id}", cls.BOOKED_USER_PREFIX, f":{game_id}"
+        )
+
+    @classmethod
+    async def get_user_bookings(cls, redis_conn: redis.Redis, user_id: str) -> list:
+        """Game ids with a valid booking of the user"""
+        return await cls.live_index_members(
+            redis_conn, f"{cls.USER_BOOKINGS}:{user_id}", f"{cls.BOOKED_USER_PREFIX}{user_id}:"
+        )
+
+    @classmethod
+    async def get_user_invitations(cls, redis_conn: redis.Redis, user_id: str) -> list:
+        """Invitation keys not yet expired with the user as sender or recipient"""
+        return await cls.live_index_members(redis_conn, f"{cls.USER_INVITATIONS}:{user_id}")
+
+    @classmethod
+    async def rebuild_indexes(cls) -> dict:
+        """
+        Build the secondary indexes and the missing lobby entries from the
+        existing keys with one SCAN over the game db. Migration path for keys
+        created before the indexes existed, see the rebuild_game_indexes
+        management command.
+        """
+        counts = {"bookings": 0, "playing": 0, "invitations": 0, "game_keys": 0, "lobby": 0}
+        game_ids = []
+        player_key_names = (":player_side:", ":paddle_index:", ":side_player:")
+        async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
+            pipe = redis_conn.pipeline()
+            async for key in redis_conn.scan_iter(count=1000):
+                parts = key.split(":")
+                if parts[0] in cls.GAME_KEY_NAMES:
+                    # fixed keys, also tournament_game / tournament_id
+                    if parts[0] == "game_settings":
+                        game_ids.append(parts[1])
+                    continue
+                if key.startswith(cls.BOOKED_USER_PREFIX) and len(parts) == 2:
+                    user_id = parts[0][len(cls.BOOKED_USER_PREFIX):]
+                    cls.index_booking(pipe, user_id, parts[1])
+                    counts["bookings"] += 1
+                elif key.startswith(cls.PLAYING_USER_PREFIX) and len(parts) == 2:
+                    user_id = parts[0][len(cls.PLAYING_USER_PREFIX):]
+                    pipe.sadd(f"{cls.USER_GAMES}:{user_id}", parts[1])
+                    cls.index_game_keys(pipe, parts[1], key)
+                    counts["playing"] += 1
+                elif key.startswith(cls.INVITATION_PREFIX) and len(parts) == 3:
+                    to_user_id = parts[0][len(cls.INVITATION_PREFIX):]
+                    pipe.sadd(f"{cls.USER_INVITATIONS}:{to_user_id}", key)
+                    pipe.sadd(f"{cls.USER_INVITATIONS}:{parts[2]}", key)
+                    cls.index_game_keys(pipe, parts[1], key)
+                    counts["invitations"] += 1
+                elif key.startswith(cls.TOURNAMENT_USER_PREFIX) and len(parts) == 2:
+                    cls.index_game_keys(pipe, parts[1], key)
+                    counts["game_keys"] += 1
+                elif parts[0] == "player_join_time" and len(parts) == 3:
+                    cls.index_game_keys(pipe, parts[1], key)
+                    counts["game_keys"] += 1
+                elif any(name in key for name in player_key_names):
+                    cls.index_game_keys(pipe, parts[0], key)
+                    counts["game_keys"] += 1
+                if len(pipe) >= 1000:
+                    await pipe.execute()
+            await pipe.execute()
+
+            for game_id in game_ids:
+                if await redis_conn.hexists(cls.LOBBY_SUMMARY, game_id):
+                    continue
+                pipe = redis_conn.pipeline()
+                pipe.get(f"game_finished:{game_id}")
+                pipe.get(f"game_running:{game_id}")
+                finished, running = await pipe.execute()
+                status = "finished" if finished == "1" else "running" if running == "1" else "waiting"
+                settings = await cls.get_all_settings_from_game(game_id)
+                pipe = redis_conn.pipeline()
+                cls.create_lobby_summary(pipe, game_id, settings, status)
+                await pipe.execute()
+                await cls.refresh_lobby_players(game_id)
+                counts["lobby"] += 1
+        logger.info(f"Rebuilt game indexes: {counts}")
+        return counts
+
+    # lobby summary
+
+    @classmethod
+    def create_lobby_summary(cls, pipeline, game_id: str, settings: dict, status: str = "created"):
+        """Queue the lobby entry of a new game"""
+        info = {"game_id": game_id}
+        info.update({name: settings.get(name) for name in cls.LOBBY_INFO_SETTINGS})
+        pipeline.hset(
+            cls.LOBBY_SUMMARY,
+            mapping={
+                game_id: json.dumps(info),
+                f"{game_id}:status": json.dumps({"status": status, "expires_at": None}),
+                f"{game_id}:players": json.dumps({"current": 0, "bookings": []}),
+            },
+        )
+
+    @classmethod
+    async def set_lobby_status(cls, game_id: str, status: str, expires_in: int = None):
+        """Set the lobby status of a game, expires_in: seconds until the game disappears from the lists"""
+        try:
+            expires_at = time.time() + expires_in if expires_in else None
+            async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
+                pipe = redis_conn.pipeline()
+                pipe.hget(cls.LOBBY_SUMMARY, f"{game_id}:status")
+                pipe.hset(
+                    cls.LOBBY_SUMMARY,
+                    f"{game_id}:status",
+                    json.dumps({"status": status, "expires_at": expires_at}),
+                )
+                previous = (await pipe.execute())[0]
+                was_listed = bool(previous) and json.loads(previous)["status"] in cls.LOBBY_LISTED
+                if status in cls.LOBBY_LISTED:
+                    event = "update" if was_listed else "add"
+                    await cls.publish_lobby_event(event, game_id, await cls.get_lobby_game(redis_conn, game_id))
+                elif was_listed:
+                    await cls.publish_lobby_event("remove", game_id)
+        except Exception as e:
+            logger.error(f"Error setting lobby status of game {game_id}: {e}")
+
+    @classmethod
+    async def refresh_lobby_players(cls, game_id: str):
+        """Recount players and bookings of the lobby entry of a game"""
+        try:
+            async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
+                current_players = await redis_conn.scard(f"game_players:{game_id}")
+                booked_users = await cls.get_game_bookings(redis_conn, game_id)
+                pipe = redis_conn.pipeline()
+                for user_id in booked_users:
+                    pipe.pttl(f"{cls.BOOKED_USER_PREFIX}{user_id}:{game_id}")
+                now = time.time()
+                bookings = [now + ttl / 1000 for ttl in await pipe.execute() if ttl > 0]
+                await redis_conn.hset(
+                    cls.LOBBY_SUMMARY,
+                    f"{game_id}:players",
+                    json.dumps({"current": current_players, "bookings": bookings}),
+                )
+                game_info = await cls.get_lobby_game(redis_conn, game_id)
+                if game_info and game_info["status"] in cls.LOBBY_LISTED:
+                    await cls.publish_lobby_event("update", game_id, game_info)
+        except Exception as e:
+            logger.error(f"Error refreshing lobby players of game {game_id}: {e}")
+
+    @classmethod
+    async def remove_lobby_summary(cls, redis_conn: redis.Redis, game_id: str):
+        if await redis_conn.hdel(cls.LOBBY_SUMMARY, game_id, f"{game_id}:status", f"{game_id}:players"):
+            await cls.publish_lobby_event("remove", game_id)
+
+    @classmethod
+    async def publish_lobby_event(cls, event: str, game_id: str, game_info: dict = None):
+        """
+        Push a change of the game lists to the LobbyConsumers.
+        event: add (newly listed), update (changed entry) or remove
+        """
+        try:
+            await get_channel_layer().group_send(
+                cls.LOBBY_GROUP,
+                {
+                    "type": "lobby_update",
+                    "event": event,
+                    "game_id": game_id,
+                    "game": game_info,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Error publishing lobby {event} of game {game_id}: {e}")
+
+    @classmethod
+    async def get_lobby_game(cls, redis_conn: redis.Redis, game_id: str) -> dict:
+        """Game list entry of one game, None if there is none"""
+        info, status, players = await redis_conn.hmget(
+            cls.LOBBY_SUMMARY, [game_id, f"{game_id}:status", f"{game_id}:players"]
+        )
+        if not info:
+            return None
+        return cls._lobby_game(info, status, players, time.time())
+
+    @classmethod
+    def _lobby_game(cls, info: str, status: str, players: str, now: float) -> dict:
+        """Game list entry from the lobby fields of a game, None if the game expired"""
+        status = json.loads(status) if status else {"status": "created", "expires_at": None}
+        if status["expires_at"] and status["expires_at"] < now:
+            return None
+        players = json.loads(players) if players else {"current": 0, "bookings": []}
+        game_info = json.loads(info)
+        game_info["status"] = status["status"]
+        game_info["expires_at"] = status["expires_at"]
+        game_info["players"] = {
+            "current": players["current"],
+            "reserved": sum(1 for expires_at in players["bookings"] if expires_at > now),
+            "total_needed": game_info.get("num_players") or 0,
+        }
+        return game_info
+
+    @classmethod
+    async def get_lobby_games(cls, statuses: tuple) -> list:
+        """Game list entries with one of the statuses, one HGETALL"""
+        async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
+            fields = await redis_conn.hgetall(cls.LOBBY_SUMMARY)
+            now = time.time()
+            games, expired = [], []
+            for field, info in fields.items():
+                if ":" in field:
+                    continue
+                game_info = cls._lobby_game(info, fields.get(f"{field}:status"), fields.get(f"{field}:players"), now)
+                if game_info is None:
+                    expired.append(field)
+                elif game_info["status"] in statuses:
+                    games.append(game_info)
+            for game_id in expired:
+                await cls.remove_lobby_summary(redis_conn, game_id)
+            return games
 
     # API from client
 
@@ -153,6 +514,7 @@ class GameCoordinator:
             # String values
             pipeline.set(f"game_type:{game_id}", settings.get("type"))
             pipeline.set(f"game_lock:{game_id}", "0")  # Initialize unlock state
+            cls.create_lobby_summary(pipeline, game_id, settings)
 
             await pipeline.execute()
 
@@ -175,11 +537,6 @@ class GameCoordinator:
                 msgpack.packb(settings.get("players_sides")),
             )
 
-            # Hash Operations (paddle positions)
-            paddle_positions = {str(i): msgpack.packb({"position": 0.5}) for i in range(settings.get("num_players"))}
-            if paddle_positions:
-                pipeline.hset(f"game_paddles:{game_id}", mapping=paddle_positions)
-
             # Initialize player values as msgpack
             pipeline.set(
                 f"game_player_settings:{game_id}",
@@ -219,7 +576,10 @@ class GameCoordinator:
                     print(f"user_id: {user_id}/{type(user_id)}")
                     # Book player
                     booking_key = f"{cls.TOURNAMENT_USER_PREFIX}{user_id}:{game_id}"
-                    await redis_conn.set(booking_key, "1")
+                    pipe = redis_conn.pipeline()
+                    pipe.set(booking_key, "1")
+                    cls.index_game_keys(pipe, game_id, booking_key)
+                    await pipe.execute()
                     # Add URL to list
                     player_urls.append((user_id, f"ws/game/{game_id}/"))
             return {"status": "running", "game_id": game_id, "player_urls": player_urls}
@@ -248,74 +608,6 @@ class GameCoordinator:
         async with await cls.get_redis(cls.REDIS_URL) as redis_conn:
             return await redis_conn.smembers(cls.RUNNING_GAMES)
 
-    @classmethod
-    async def _get_games_detail(cls, game_ids: list) -> list:
-        """
-        Shared method to get detailed game information for a list of game IDs
-        """
-        try:
-            # Early return if no games
-            if not game_ids:
-                return []
-
-            # Get all game settings in batch
-            async with await cls.get_redis_binary(cls.REDIS_GAME_URL) as redis_game:
-                pipe = redis_game.pipeline()
-                for game_id in game_ids:
-                    pipe.get(f"game_settings:{game_id}")
-                settings_results = await pipe.execute()
-
-            # Get all player counts in batch
-            async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
-                pipe = redis_conn.pipeline()
-                for game_id in game_ids:
-                    pipe.scard(f"game_players:{game_id}")
-                    pipe.keys(f"{cls.BOOKED_USER_PREFIX}*:{game_id}")
-                player_results = await pipe.execute()
-
-            # Process results
-            detailed_games = []
-            for idx, game_id in enumerate(game_ids):
-                try:
-                    settings_data = settings_results[idx]
-                    if not settings_data:
-                        continue
-
-                    game_settings = msgpack.unpackb(settings_data)
-                    current_players = player_results[idx * 2] or 0
-                    reserved_players = len(player_results[idx * 2 + 1]) if player_results[idx * 2 + 1] else 0
-
-                    game_info = {
-                        "game_id": game_id,
-                        "name": game_settings.get("name"),
-                        "mode": game_settings.get("mode"),
-                        "type": game_settings.get("type"),
-                        "sides": game_settings.get("sides"),
-                        "score": game_settings.get("score"),
-                        "num_players": game_settings.get("num_players"),
-                        "min_players": game_settings.get("min_players"),
-                        "initial_ball_speed": game_settings.get("initial_ball_speed"),
-                        "paddle_length": game_settings.get("paddle_length"),
-                        "paddle_width": game_settings.get("paddle_width"),
-                        "ball_size": game_settings.get("ball_size"),
-                        "players": {
-                            "current": current_players,
-                            "reserved": reserved_players,
-                            "total_needed": game_settings.get("num_players", 0),
-                        },
-                    }
-                    detailed_games.append(game_info)
-
-                except Exception as e:
-                    logger.error(f"Error processing game {game_id}: {e}")
-                    continue
-
-            return detailed_games
-
-        except Exception as e:
-            logger.error(f"Error getting games detail: {e}")
-            return []
-
     @classmethod
     async def get_all_games(cls):
         """Get all waiting and running game IDs"""
@@ -334,9 +626,7 @@ class GameCoordinator:
     async def get_all_games_info(cls) -> list:
         """Get detailed information for all active games (waiting and running)"""
         try:
-            games = await cls.get_all_games()
-            game_ids = [game_id.decode("utf-8") if isinstance(game_id, bytes) else game_id for game_id in games]
-            return await cls._get_games_detail(game_ids)
+            return await cls.get_lobby_games(cls.LOBBY_LISTED)
         except Exception as e:
             logger.error(f"Error getting all games info: {e}")
             return []
@@ -345,15 +635,10 @@ class GameCoordinator:
     async def get_waiting_games_info(cls) -> list:
         """Get detailed information for all waiting games"""
         try:
-            games = await cls.get_waiting_games()
+            games = await cls.get_lobby_games(("waiting",))
             if not games:
                 logger.info("No waiting games at the moment")
-                return []         
-            game_ids = [
-                game_id.decode("utf-8") if isinstance(game_id, bytes) else game_id
-                for game_id in games
-            ]
-            return await cls._get_games_detail(game_ids)
+            return games
         except Exception as e:
             logger.error(f"Error getting waiting games info: {e}")
             return []
@@ -362,9 +647,7 @@ class GameCoordinator:
     async def get_running_games_info(cls) -> list:
         """Get detailed information for all running games"""
         try:
-            games = await cls.get_running_games()
-            game_ids = [game_id.decode("utf-8") if isinstance(game_id, bytes) else game_id for game_id in games]
-            return await cls._get_games_detail(game_ids)
+            return await cls.get_lobby_games(("running",))
         except Exception as e:
             logger.error(f"Error getting running games info: {e}")
             return []
@@ -380,19 +663,22 @@ class GameCoordinator:
     async def is_player_playing(cls, user_id) -> bool:
         """
         Check if a player is currently booked or playing in any game.
-        Uses Redis EXISTS to check for presence of status keys.
+        Looks up the user's booking and game indexes.
         Returns True if player is playing/booked, False if they're available.
         """
         try:
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
-                # Check if either key exists using EXISTS command
-                async for key in redis_conn.scan_iter(f"{cls.BOOKED_USER_PREFIX}{user_id}:*"):
-                    logger.debug("player is booked: {key}")
+                bookings = await cls.get_user_bookings(redis_conn, user_id)
+                if bookings:
+                    logger.debug(f"player is booked: {bookings}")
                     return True
 
                 # Check for playing status
-                async for key in redis_conn.scan_iter(f"{cls.PLAYING_USER_PREFIX}{user_id}:*"):
-                    logger.debug("player is playing: {key}")
+                games = await cls.live_index_members(
+                    redis_conn, f"{cls.USER_GAMES}:{user_id}", f"{cls.PLAYING_USER_PREFIX}{user_id}:"
+                )
+                if games:
+                    logger.debug(f"player is playing: {games}")
                     return True
 
                 return False
@@ -412,9 +698,9 @@ class GameCoordinator:
 
         try:
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
-                # Use async generator iteration directly
-                async for key in redis_conn.scan_iter(match=f"{cls.INVITATION_PREFIX}{to_user_id}:*:{from_user_id}"):
-                    return {"status": False, "message": "Invitation already exists between these users"}
+                for key in await cls.get_user_invitations(redis_conn, to_user_id):
+                    if key.startswith(f"{cls.INVITATION_PREFIX}{to_user_id}:") and key.endswith(f":{from_user_id}"):
+                        return {"status": False, "message": "Invitation already exists between these users"}
 
                 # Create game
                 game_id = await cls.create_new_game(game_settings)
@@ -422,7 +708,12 @@ class GameCoordinator:
                     return {"status": False, "message": "Failed to create game"}
 
                 invitation_key = f"{cls.INVITATION_PREFIX}{to_user_id}:{game_id}:{from_user_id}"
-                await redis_conn.set(invitation_key, "1", ex=cls.INVITATION_EXPIRY)
+                pipe = redis_conn.pipeline()
+                pipe.set(invitation_key, "1", ex=cls.INVITATION_EXPIRY)
+                pipe.sadd(f"{cls.USER_INVITATIONS}:{to_user_id}", invitation_key)
+                pipe.sadd(f"{cls.USER_INVITATIONS}:{from_user_id}", invitation_key)
+                cls.index_game_keys(pipe, game_id, invitation_key)
+                await pipe.execute()
                 url = f"/ws/game/{game_id}/"
 
                 user_from = await sync_to_async(CustomUser.objects.get)(id=from_user_id)
@@ -446,9 +737,11 @@ class GameCoordinator:
         try:
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
                 invitations = []
-                pattern = f"{cls.INVITATION_PREFIX}{user_id}:*"
+                prefix = f"{cls.INVITATION_PREFIX}{user_id}:"
 
-                async for key in redis_conn.scan_iter(pattern):
+                for key in await cls.get_user_invitations(redis_conn, user_id):
+                    if not key.startswith(prefix):
+                        continue  # sent by the user
                     data = await redis_conn.get(key)
                     if data:
                         invitations.append(json.loads(data))
@@ -464,24 +757,13 @@ class GameCoordinator:
         """Cleanup invalid bookings using Redis commands"""
         try:
             async with RedisLock(redis_conn, f"{game_id}_cleanup_invalid_bookings"):
-                # Store booked user IDs in a temporary set
-                temp_set = f"temp_valid_bookings:{game_id}"
-                pipe = redis_conn.pipeline()
-                # Track if we found any booked users
-                found_bookings = False
-                # Get booked users using scan instead of keys
-                async for key in redis_conn.scan_iter(f"{cls.BOOKED_USER_PREFIX}*:{game_id}"):
-                    found_bookings = True
-                    user_id = key.split(":")[0].replace(f"{cls.BOOKED_USER_PREFIX}", "")
-                    pipe.sadd(temp_set, user_id)
-                if not found_bookings:
+                # booked user IDs, the index drops the expired bookings
+                if not await cls.get_game_bookings(redis_conn, game_id):
                     return True
-               # Use Redis SDIFF to find invalid users
-                pipe.sdiff(f"game_booked_players:{game_id}", temp_set)
-                pipe.delete(temp_set)
-
-                results = await pipe.execute()
-                invalid_users = results[-2]  # Get SDIFF result
+                # Use Redis SDIFF to find invalid users
+                invalid_users = await redis_conn.sdiff(
+                    f"game_booked_players:{game_id}", f"{cls.GAME_BOOKINGS}:{game_id}"
+                )
 
                 if invalid_users:
                     await redis_conn.srem(f"game_booked_players:{game_id}", *invalid_users)
@@ -497,15 +779,12 @@ class GameCoordinator:
         """Get player counts for frontend display - no locks needed"""
         try:
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
-                pipe = redis_conn.pipeline()
-                pipe.scard(f"game_players:{game_id}")
-                pipe.keys(f"{cls.BOOKED_USER_PREFIX}*:{game_id}")
-
-                results = await pipe.execute()
+                current_players = await redis_conn.scard(f"game_players:{game_id}")
+                bookings = await cls.get_game_bookings(redis_conn, game_id)
                 return {
                     "status": True,
-                    "current_players": results[0] or 0,
-                    "reserved_players": len(results[1]) if results[1] else 0,
+                    "current_players": current_players or 0,
+                    "reserved_players": len(bookings),
                 }
         except Exception as e:
             logger.error(f"Error getting player counts: {e}")
@@ -518,13 +797,11 @@ class GameCoordinator:
                 async with RedisLock(redis_conn, f"{game_id}_player_situation"):
                     # await cls.cleanup_invalid_bookings(redis_conn, game_id)
                     current_players = await redis_conn.scard(f"game_players:{game_id}")
-                    booking_count = 0
-                    async for _ in redis_conn.scan_iter(f"{cls.BOOKED_USER_PREFIX}*:{game_id}"):
-                        booking_count += 1
+                    bookings = await cls.get_game_bookings(redis_conn, game_id)
                     return {
                         "status": True,
                         "current_players": current_players,
-                        "reserved_players": booking_count,
+                        "reserved_players": len(bookings),
                     }
 
         except Exception as e:
@@ -535,33 +812,51 @@ class GameCoordinator:
     async def join_game(cls, user_id, game_id) -> dict:
         # session = request.session
         try:
-            # Get game settings to check player limits
+            # check the player limit and book a slot atomically (BOOK_SLOT_SCRIPT)
+            booking_key = f"{cls.BOOKED_USER_PREFIX}{user_id}:{game_id}"
+            game_bookings_key = f"{cls.GAME_BOOKINGS}:{game_id}"
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
-                num_players = await redis_conn.get(f"{cls.NUM_PLAYERS_PREFIX}:{game_id}")
-                if not num_players:
-                    return {
-                        "available": False,
-                        "message": "Game not found",
-                        "status": 404,
-                    }
-                async with RedisLock(redis_conn, f"{game_id}"):
-                    player_situation = await cls.player_situation(game_id)
-                    total_players = player_situation["current_players"] + player_situation["reserved_players"]
-                    if total_players >= int(num_players):
-                        return {
-                            "available": False,
-                            "message": "No available slots in this game",
-                            "status": 403,
-                        }
-                    async with RedisLock(redis_conn, f"{game_id}_player_situation"):
-                        # create
-                        await redis_conn.set(
-                            f"{cls.BOOKED_USER_PREFIX}{user_id}:{game_id}",
-                            "",
-                            ex=5,  # 5 sec None if tournament
-                        )
-                logger.debug(f"KEY: {cls.BOOKED_USER_PREFIX}{user_id}:{game_id}")
-                return {"available": True}
+                for _ in range(cls.BOOK_SLOT_ATTEMPTS):
+                    booked_users = list(await redis_conn.smembers(game_bookings_key))
+                    booked = await cls._book_slot(
+                        keys=[
+                            f"{cls.NUM_PLAYERS_PREFIX}:{game_id}",
+                            f"game_players:{game_id}",
+                            game_bookings_key,
+                            booking_key,
+                            f"{cls.USER_BOOKINGS}:{user_id}",
+                            f"{cls.GAME_KEYS}:{game_id}",
+                            *(
+                                f"{cls.BOOKED_USER_PREFIX}{booked_user}:{game_id}"
+                                for booked_user in booked_users
+                            ),
+                        ],
+                        args=[user_id, game_id, cls.BOOKING_EXPIRY, *booked_users],
+                        client=redis_conn,
+                    )
+                    if booked != cls.BOOKING_INDEX_CHANGED:
+                        break
+            if booked == cls.BOOKING_INDEX_CHANGED:
+                return {
+                    "available": False,
+                    "message": "Too many players joining at once, try again",
+                    "status": 409,
+                }
+            if booked == -1:
+                return {
+                    "available": False,
+                    "message": "Game not found",
+                    "status": 404,
+                }
+            if booked == 0:
+                return {
+                    "available": False,
+                    "message": "No available slots in this game",
+                    "status": 403,
+                }
+            await cls.refresh_lobby_players(game_id)
+            logger.debug(f"KEY: {booking_key}")
+            return {"available": True}
 
         except Exception as e:
             logger.error(f"Error in join_game: {e}")
@@ -587,30 +882,32 @@ class GameCoordinator:
                     await redis_conn.set(f"{cls.ALL_GAMES}:{game_id}",  game_id, ex=time)
                     await cls.set_game_expiration(game_id, time)
                     logger.info(f"game[{str(game_id)}] will set to ex:{time}")
+        await cls.set_lobby_status(game_id, "waiting", time)
     
     
     @classmethod
     async def set_game_expiration(cls, game_id: str, time: int):
         """
-        Set expiration for all Redis keys containing game_id in any position
+        Set expiration for all Redis keys of the game: the fixed keys of both
+        DBs and the per player keys of the GAME_KEYS index
         """
         try:
-            patterns = [
-                f"*{game_id}",    # Suffix match
-                f"{game_id}*",    # Prefix match
-                f"*{game_id}*"    # Contains match
-            ]
-            
             keys_updated = 0
-            
-            # Update both Redis DBs
-            for redis_url in [cls.REDIS_URL, cls.REDIS_GAME_URL]:
-                async with await cls.get_redis(redis_url) as redis_conn:
-                    for pattern in patterns:
-                        async for key in redis_conn.scan_iter(pattern):
-                            await redis_conn.expire(key, time)
-                            keys_updated += 1
-            
+
+            async with await cls.get_redis(cls.REDIS_URL) as redis_conn:
+                pipe = redis_conn.pipeline()
+                pipe.expire(f"{cls.ALL_GAMES}:{game_id}", time)
+                pipe.expire(f"{cls.WAITING_GAMES}:{game_id}", time)
+                keys_updated += sum(await pipe.execute())
+
+            async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
+                keys = [f"{name}:{game_id}" for name in cls.GAME_KEY_NAMES]
+                keys.extend(await redis_conn.smembers(f"{cls.GAME_KEYS}:{game_id}"))
+                pipe = redis_conn.pipeline()
+                for key in keys:
+                    pipe.expire(key, time)
+                keys_updated += sum(await pipe.execute())
+
             logger.info(f"Set {time}s expiration for {keys_updated} keys matching game {game_id}")
             return True
 
@@ -633,6 +930,7 @@ class GameCoordinator:
                 # Update game status in game database
                 async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_game:
                     await redis_game.set(f"game_running:{game_id}", "1")
+        await cls.set_lobby_status(game_id, "running")
 
     @classmethod
     async def set_to_finished_game(cls, game_id):
@@ -649,6 +947,7 @@ class GameCoordinator:
                 pipe.srem(cls.RUNNING_GAMES, str(game_id))
                 pipe.sadd(cls.FINISHED_GAMES, str(game_id))
                 await pipe.execute()
+        await cls.set_lobby_status(game_id, "finished")
 
 
     #
@@ -663,13 +962,24 @@ class GameCoordinator:
                 await redis_conn.srem(cls.FINISHED_GAMES, game_id)
 
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_game:
-                keys_to_delete = []
-                async for key in redis_game.scan_iter(f"*:{game_id}"):
-                    keys_to_delete.append(key)
+                pipe = redis_game.pipeline()
+                pipe.smembers(f"{cls.GAME_KEYS}:{game_id}")
+                pipe.smembers(f"game_players:{game_id}")
+                pipe.smembers(f"{cls.GAME_BOOKINGS}:{game_id}")
+                player_keys, players, booked_users = await pipe.execute()
+                keys_to_delete = [f"{name}:{game_id}" for name in cls.GAME_KEY_NAMES]
+                keys_to_delete.extend(player_keys)
 
-                if keys_to_delete:
-                    await redis_game.unlink(*keys_to_delete)
-                    logger.info(f"Cleaned up {len(keys_to_delete)} keys for game {game_id}")
+                pipe = redis_game.pipeline()
+                pipe.unlink(*keys_to_delete)
+                # the user indexes would drop the game on their next read anyway
+                for player_id in players:
+                    pipe.srem(f"{cls.USER_GAMES}:{player_id}", game_id)
+                for user_id in booked_users:
+                    pipe.srem(f"{cls.USER_BOOKINGS}:{user_id}", game_id)
+                deleted = (await pipe.execute())[0]
+                await cls.remove_lobby_summary(redis_game, game_id)
+                logger.info(f"Cleaned up {deleted} keys for game {game_id}")
             return True
         except Exception as e:
             logger.error(f"Error cleaning up game {game_id}: {e}")
@@ -915,9 +1225,10 @@ class GameCoordinator:
         """
         try:
             async with await cls.get_redis(cls.REDIS_GAME_URL) as redis_conn:
-                bookings = []
-                async for key in redis_conn.scan_iter(f"{cls.BOOKED_USER_PREFIX}{user_id}:*"):
-                    bookings.append(key)
+                bookings = [
+                    f"{cls.BOOKED_USER_PREFIX}{user_id}:{game_id}"
+                    for game_id in await cls.get_user_bookings(redis_conn, user_id)
+                ]
 
                 if not bookings:
                     return {
@@ -931,7 +1242,11 @@ class GameCoordinator:
                 for booking in bookings:
                     game_id = booking.split(":")[-1]
                     async with RedisLock(redis_conn, f"{game_id}_player_situation"):
-                        await redis_conn.delete(booking)
+                        pipe = redis_conn.pipeline()
+                        pipe.delete(booking)
+                        cls.unindex_booking(pipe, user_id, game_id)
+                        await pipe.execute()
+                    await cls.refresh_lobby_players(game_id)
 
                 return {
                     "status": True,
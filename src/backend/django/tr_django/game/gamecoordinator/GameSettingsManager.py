@@ -15,6 +15,7 @@ from .game_config import (
     INVITE_FIXED,
     DEFAULT_INVITE,
     DEFAULT_PLAYER,
+    DEFAULT_ENGINE,
 )
 import asyncio
 
@@ -66,6 +67,7 @@ class GameSettingsManager:
         player_values["player_settings"]["paddle_length"] = settings["paddle_length"]
 
         settings.update(player_values)
+        settings.update(DEFAULT_ENGINE)
         logger.debug(f"settings after step 2: {settings}")
         try:
             # 3. step: add calculations from AGameManager / PolygonPong / CircularPong
@@ -19,6 +19,40 @@ DEFAULT_PLAYER = {
     }
 }
 
+# tick rate the ball speeds of the settings are given for
+BASE_TICK_RATE = 60
+
+# game loop / engine values, not changeable by the client
+DEFAULT_ENGINE = {
+    # ticks between write-behind snapshots of the in-memory state to redis
+    "state_sync_interval": int(10),
+    # fixed timestep of the simulation, ball speeds are scaled from BASE_TICK_RATE
+    "tick_rate": int(60),
+    # frames per second broadcast to the clients (at most tick_rate), the
+    # frames carry the server tick and time for the interpolation of the clients
+    "send_rate": int(60),
+    # max simulation steps run back to back when the loop falls behind
+    "max_catchup_steps": int(4),
+    # "auto": numpy ball engine for multi-ball games (from ball_engine_min_balls on),
+    # "numpy" or "python"; numpy games of the same class are stepped as one batch
+    "ball_engine": "auto",
+    "ball_engine_min_balls": int(2),
+    # "discrete" or "continuous" (swept-circle time of impact, no tunneling)
+    "collision_mode": "discrete",
+    # speed cap in ball sizes per tick for continuous mode (discrete: 1.5)
+    "continuous_max_speed_ratio": float(3.0),
+    # opt-in: skip the collision checks of balls before their next possible
+    # impact, see impact_schedule.py
+    "impact_schedule": False,
+    # state validation per tick: "full", "cheap" (invariants only, full audit
+    # every validation_audit_interval ticks) or "auto" (full with DEBUG)
+    "validation_mode": "auto",
+    "validation_audit_interval": int(300),
+    # frames between full game_state frames, the frames in between are
+    # game_delta frames with the changed fields only (0: full state every frame)
+    "keyframe_interval": int(60),
+}
+
 
 REGULAR_FIXED = {"type": "polygon", "mode": "regular", "shape": "regular"}
 
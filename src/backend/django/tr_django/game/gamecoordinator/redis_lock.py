@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+import uuid
+import weakref
+import redis
+import redis.asyncio as aredis
+from redis.commands.core import AsyncScript, Script
+
+logger = logging.getLogger(__name__)
+
+
+# delete the lock only if the token still owns it, then wake one waiter.
+# the wake list keeps at most one token and expires with the lock timeout
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('LPUSH', KEYS[2], '1')
+    redis.call('LTRIM', KEYS[2], 0, 0)
+    redis.call('PEXPIRE', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+# registered once, the scripts run with client= on any connection (EVALSHA,
+# loaded into the server on the first NOSCRIPT)
+_release = Script(None, RELEASE_SCRIPT.encode())
+_async_release = AsyncScript(None, RELEASE_SCRIPT.encode())
+
+# seconds between SET attempts of waiters that do not get a BLPOP slot
+POLL_INTERVAL = 0.05
+
+# game / tournament ids in lock keys, the metrics are kept per lock name
+_LOCK_ID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+")
+
+
+class LockStats:
+    """
+    Process-wide lock metrics per lock name (the lock key with ids replaced by *).
+    acquired: acquisitions, contended: acquisitions that had to wait,
+    wait_total / wait_max: seconds waited, timeouts: gave up waiting,
+    lost: the lock expired before its release (another holder may have run)
+    """
+
+    _stats = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def lock_name(lock_key: str) -> str:
+        return _LOCK_ID.sub("*", lock_key)
+
+    @classmethod
+    def record(cls, lock_key: str, event: str, wait: float = 0.0):
+        name = cls.lock_name(lock_key)
+        with cls._lock:
+            stats = cls._stats.setdefault(
+                name,
+                {"acquired": 0, "contended": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0, "lost": 0},
+            )
+            stats[event] += 1
+            if wait:
+                stats["wait_total"] += wait
+                stats["wait_max"] = max(stats["wait_max"], wait)
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            return {
+                name: {
+                    **stats,
+                    "wait_avg": stats["wait_total"] / stats["contended"] if stats["contended"] else 0.0,
+                }
+                for name, stats in cls._stats.items()
+            }
+
+
+class _LockBase:
+    # BLPOP waiters per connection pool. A waiter holds a pooled connection until
+    # it is woken up, so at most half of the pool blocks and the others poll:
+    # the release of the holder always gets a connection
+    _waiters = weakref.WeakKeyDictionary()
+    _waiters_lock = threading.Lock()
+
+    def __init__(self, redis_conn: aredis.Redis | redis.Redis, lock_key: str, timeout: int = 10):
+        self.redis_conn = redis_conn
+        self.lock_key = lock_key
+        self.wake_key = f"{lock_key}:wake"
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+
+    def wait_time(self, start_time: float, pttl: int) -> float:
+        """
+        Seconds to block for a release: until the lock expires (holder crashed,
+        no wake-up) but not past the acquire timeout. 0: retry right away.
+        """
+        remaining = self.timeout - (time.time() - start_time)
+        if remaining <= 0:
+            raise TimeoutError(f"Could not acquire lock: {self.lock_key}")
+        if pttl == -2:
+            return 0  # released between SET and PTTL
+        if pttl == -1:
+            return remaining
+        # BLPOP takes the timeout in seconds, 0 would block forever
+        return max(min(remaining, pttl / 1000), 0.01)
+
+    def _start_waiting(self) -> bool:
+        pool = self.redis_conn.connection_pool
+        with self._waiters_lock:
+            waiters = self._waiters.get(pool, 0)
+            if waiters >= pool.max_connections // 2:
+                return False
+            self._waiters[pool] = waiters + 1
+            return True
+
+    def _stop_waiting(self):
+        with self._waiters_lock:
+            self._waiters[self.redis_conn.connection_pool] -= 1
+
+    def _acquired(self, start_time: float, waited: bool):
+        LockStats.record(self.lock_key, "acquired")
+        if waited:
+            LockStats.record(self.lock_key, "contended", time.time() - start_time)
+
+    def _timed_out(self):
+        LockStats.record(self.lock_key, "timeouts")
+        logger.warning(f"Lock timeout: {self.lock_key}")
+
+    def _released(self, released: int):
+        if not released:
+            LockStats.record(self.lock_key, "lost")
+            logger.warning(f"Lock {self.lock_key} expired before its release")
+
+
+class RedisLock(_LockBase):
+    """
+    asyncio redis lock with an owner token.
+    Waiters block on a wake-up list (BLPOP) instead of polling, the release
+    only deletes the lock if it is still owned by this token (RELEASE_SCRIPT).
+    A waiting BLPOP holds a pooled connection until it is woken up, waiters
+    beyond half of the pool poll instead.
+    """
+
+    async def __aenter__(self):
+        start_time = time.time()
+        waited = False
+        while True:
+            if await self.redis_conn.set(self.lock_key, self.token, nx=True, ex=self.timeout):
+                self._acquired(start_time, waited)
+                return self
+            waited = True
+            try:
+                wait = self.wait_time(start_time, await self.redis_conn.pttl(self.lock_key))
+            except TimeoutError:
+                self._timed_out()
+                raise
+            if not wait:
+                continue
+            if self._start_waiting():
+                try:
+                    await self.redis_conn.blpop([self.wake_key], timeout=wait)
+                finally:
+                    self._stop_waiting()
+            else:
+                await asyncio.sleep(min(wait, POLL_INTERVAL))
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._released(
+            await _async_release(
+                keys=[self.lock_key, self.wake_key],
+                args=[self.token, self.timeout * 1000],
+                client=self.redis_conn,
+            )
+        )
+
+
+class RedisSyncLock(_LockBase):
+    """Blocking version of RedisLock for the sync code (TournamentManager, models)"""
+
+    def __enter__(self):
+        start_time = time.time()
+        waited = False
+        while True:
+            if self.redis_conn.set(self.lock_key, self.token, nx=True, ex=self.timeout):
+                self._acquired(start_time, waited)
+                return self
+            waited = True
+            try:
+                wait = self.wait_time(start_time, self.redis_conn.pttl(self.lock_key))
+            except TimeoutError:
+                self._timed_out()
+                raise
+            if not wait:
+                continue
+            if self._start_waiting():
+                try:
+                    self.redis_conn.blpop([self.wake_key], timeout=wait)
+                finally:
+                    self._stop_waiting()
+            else:
+                time.sleep(min(wait, POLL_INTERVAL))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._released(
+            _release(
+                keys=[self.lock_key, self.wake_key],
+                args=[self.token, self.timeout * 1000],
+                client=self.redis_conn,
+            )
+        )
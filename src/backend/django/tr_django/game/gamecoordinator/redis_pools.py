@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import threading
+import weakref
+import redis
+import redis.asyncio as aredis
+from django.conf import settings as django_settings
+
+logger = logging.getLogger(__name__)
+
+
+class MeteredConnectionPool(aredis.BlockingConnectionPool):
+    """
+    Blocking asyncio pool that counts how often it ran out of connections.
+    exhausted: requests that had to wait for a free connection
+    timeouts: requests that gave up after `timeout` seconds
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exhausted = 0
+        self.timeouts = 0
+        self.peak_in_use = 0
+
+    async def get_connection(self, command_name=None, *keys, **options):
+        if not self.can_get_connection():
+            self.exhausted += 1
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except redis.ConnectionError as e:
+            if "No connection available" in str(e):
+                self.timeouts += 1
+                logger.error(f"Redis pool exhausted: {self.stats()}")
+            raise
+        self.peak_in_use = max(self.peak_in_use, len(self._in_use_connections))
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "available": len(self._available_connections),
+            "peak_in_use": self.peak_in_use,
+            "exhausted": self.exhausted,
+            "timeouts": self.timeouts,
+        }
+
+
+class RedisPools:
+    """
+    Process-wide redis connection pools, one per url and decode mode.
+
+    Clients handed out here share the pool of their url, closing a client
+    (`async with` / aclose) only returns its connection. asyncio connections
+    are bound to their event loop, so the asyncio pools are kept per loop;
+    the sync pools (TournamentManager) are shared by all threads.
+    Pool size and wait timeout: REDIS_POOL_MAX_CONNECTIONS and
+    REDIS_POOL_TIMEOUT in the django settings.
+    """
+
+    _pools = weakref.WeakKeyDictionary()  # event loop -> {(url, decode): pool}
+    _sync_pools = {}  # (url, decode) -> redis.BlockingConnectionPool
+    _sync_lock = threading.Lock()
+
+    @staticmethod
+    def pool_settings() -> dict:
+        return {
+            "max_connections": getattr(django_settings, "REDIS_POOL_MAX_CONNECTIONS", 50),
+            "timeout": getattr(django_settings, "REDIS_POOL_TIMEOUT", 5),
+        }
+
+    @classmethod
+    def get_pool(cls, url: str, decode_responses: bool) -> MeteredConnectionPool:
+        """asyncio pool of the running event loop"""
+        pools = cls._pools.setdefault(asyncio.get_running_loop(), {})
+        key = (url, decode_responses)
+        if key not in pools:
+            pools[key] = MeteredConnectionPool.from_url(
+                url, decode_responses=decode_responses, **cls.pool_settings()
+            )
+        return pools[key]
+
+    @classmethod
+    def client(cls, url: str, decode_responses: bool) -> aredis.Redis:
+        """asyncio client on the shared pool"""
+        return aredis.Redis(connection_pool=cls.get_pool(url, decode_responses))
+
+    @classmethod
+    def sync_client(cls, url: str, decode_responses: bool) -> redis.Redis:
+        """sync client on the shared pool"""
+        key = (url, decode_responses)
+        with cls._sync_lock:
+            if key not in cls._sync_pools:
+                cls._sync_pools[key] = redis.BlockingConnectionPool.from_url(
+                    url, decode_responses=decode_responses, **cls.pool_settings()
+                )
+        return redis.Redis(connection_pool=cls._sync_pools[key])
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Usage and exhaustion counters of the asyncio pools of the running loop"""
+        pools = cls._pools.get(asyncio.get_running_loop(), {})
+        return {
+            f"{url} ({'str' if decode else 'bin'})": pool.stats()
+            for (url, decode), pool in pools.items()
+        }
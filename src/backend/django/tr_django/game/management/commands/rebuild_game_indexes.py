@@ -0,0 +1,16 @@
+import asyncio
+from django.core.management.base import BaseCommand
+from game.gamecoordinator.GameCoordinator import GameCoordinator
+
+
+class Command(BaseCommand):
+    help = "Builds the GameCoordinator redis indexes (bookings, games, invitations, game keys) and lobby entries from the existing keys"
+
+    def handle(self, *args, **options):
+        self.stdout.write("Scanning game keys...")
+
+        counts = asyncio.run(GameCoordinator.rebuild_indexes())
+
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(self.style.SUCCESS("Game indexes rebuilt successfully!"))
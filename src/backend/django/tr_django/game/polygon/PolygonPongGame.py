@@ -27,6 +27,8 @@ logger = logging.getLogger(__name__)
 @add_abstract_implementations
 @add_cls_methods
 class PolygonPongGame(AGameManager):
+    vectorized_sides = True
+
     def __init__(self, game_id):
         super().__init__(game_id)
         #        self.num_sides = 4  # Default number of sides
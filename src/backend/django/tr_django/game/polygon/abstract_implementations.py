@@ -1,4 +1,6 @@
 import logging
+import math
+from ..agame.value_types import CollisionCandidate, SideMovement
 
 logger = logging.getLogger(__name__)
 
@@ -39,43 +41,145 @@ def calculate_inner_boundaries(self):
 
 
 # Collision Candidate Phase
-def find_collision_candidate(self, ball, ball_index, new_state, distance_from_center):
-
+def find_collision_candidate(
+    self, ball, ball_index, new_state, distance_from_center, side_values=None
+):
+    """
+    side_values: optional (signed_distances, dot_products) of the ball to every
+    side, precomputed for all balls at once by the vectorized engine
+    """
     collisions_candidates = []
 
-    for side_index in range(self.num_sides):
-        ball_movement = self.check_ball_movement_relative_to_side(
-            ball, side_index, ball_index, new_state
+    # only the sides in reach of the ball's angular sector
+    sides_to_check = range(self.num_sides)
+    if self.side_sectors:
+        angle = math.atan2(ball["y"], ball["x"]) % (2 * math.pi)
+        sector = min(
+            int(angle * len(self.side_sectors) / (2 * math.pi)), len(self.side_sectors) - 1
         )
-        if ball_movement["is_approaching"]:
-            if ball_movement["type"] == "tunneling":
+        sides_to_check = self.side_sectors[sector]
+        self.enter_sector(ball, ball_index, sector, side_values)
+
+    for side_index in sides_to_check:
+        if side_values is None:
+            ball_movement = self.check_ball_movement_relative_to_side(
+                ball, side_index, ball_index, new_state
+            )
+        else:
+            ball_movement = self.check_ball_movement_relative_to_side(
+                ball,
+                side_index,
+                ball_index,
+                new_state,
+                side_values[0][side_index],
+                side_values[1][side_index],
+            )
+        if ball_movement.is_approaching:
+            if ball_movement.type == "tunneling":
                 # Tunneling detected - return immediately
-                return {
-                    "side_index": side_index,
-                    "movement": ball_movement,
-                    "type": "tunneling",
-                }
+                return CollisionCandidate(side_index, ball_movement, "tunneling")
             else:
                 # Add collision candidate
                 collisions_candidates.append(
-                    {
-                        "side_index": side_index,
-                        "movement": ball_movement,
-                        "type": ball_movement["type"],
-                    }
+                    CollisionCandidate(side_index, ball_movement, ball_movement.type)
                 )
     # logger.debug("here are the candidates: ", collisions_candidates)
     if collisions_candidates:
         candidate = min(
-            collisions_candidates, key=lambda x: x["movement"]["current_distance"]
+            collisions_candidates, key=lambda x: x.movement.current_distance
         )
-        logger.debug(f"{self.game_id}: {candidate}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{self.game_id}: {candidate}")
         return candidate
 
     # No collisions found
     return None
 
 
+# Continuous collision (collision_mode "continuous")
+def find_time_of_impact(self, ball, remaining, new_state):
+    """
+    Swept circle against the side segments: earliest time the ball center
+    reaches a contact plane of a side (see contact_planes) within the extent
+    of the side.
+
+    Returns:
+        tuple: (time of impact as fraction of remaining, collision_candidate)
+        or None
+    """
+    move_x = ball["velocity_x"] * remaining
+    move_y = ball["velocity_y"] * remaining
+    best = None
+
+    for side in self.sides:
+        side_index = side.index
+        approach = move_x * side.normal_x + move_y * side.normal_y
+        if approach >= 0:
+            continue
+        distance = (ball["x"] - side.start_x) * side.normal_x + (
+            ball["y"] - side.start_y
+        ) * side.normal_y
+        if distance < -ball["size"]:
+            # behind the line of a concave side, not reachable from here
+            continue
+        side_x = side.end_x - side.start_x
+        side_y = side.end_y - side.start_y
+
+        for contact, kind in self.contact_planes(ball, side_index, new_state):
+            time_of_impact = max(0.0, (distance - contact) / -approach)
+            if time_of_impact > 1.0 or (best and time_of_impact >= best[0]):
+                break
+            impact_x = ball["x"] + move_x * time_of_impact - side.start_x
+            impact_y = ball["y"] + move_y * time_of_impact - side.start_y
+            relative_position = (
+                impact_x * side_x + impact_y * side_y
+            ) / side.length_squared
+            if not 0.0 <= relative_position <= 1.0:
+                continue
+            if kind == "paddle" and not self.paddle_covers(
+                new_state, side_index, relative_position
+            ):
+                continue
+            best = (time_of_impact, side_index, contact)
+            break
+
+    if best is None:
+        return None
+    time_of_impact, side_index, contact = best
+    side = self.sides[side_index]
+    movement = SideMovement(
+        is_approaching=True,
+        current_distance=float(contact),
+        approach_speed=float(
+            abs(ball["velocity_x"] * side.normal_x + ball["velocity_y"] * side.normal_y)
+        ),
+        type="approaching",
+    )
+    return time_of_impact, CollisionCandidate(side_index, movement, "approaching")
+
+
+# Impact schedule
+def ticks_to_reach(self, ball, reach):
+    """
+    Ticks until the ball center comes within reach of the line of a side it
+    moves towards. Lines the ball is behind (concave sides) can not be hit.
+    """
+    earliest = None
+    for side in self.sides:
+        approach = ball["velocity_x"] * side.normal_x + ball["velocity_y"] * side.normal_y
+        if approach >= 0:
+            continue
+        distance = (ball["x"] - side.start_x) * side.normal_x + (
+            ball["y"] - side.start_y
+        ) * side.normal_y
+        if distance < -ball["size"]:
+            continue
+        ticks = (distance - reach) / -approach
+        if earliest is None or ticks < earliest:
+            earliest = ticks
+    return earliest
+
+
 # Collision Verification Phase
 def handle_tunneling(self, ball, current_sector, new_state):
     """
@@ -83,7 +187,7 @@ def handle_tunneling(self, ball, current_sector, new_state):
 
     Args:
         ball (dict): Current ball state
-        current_sector (dict): Information about the current sector and collision
+        current_sector (CollisionCandidate): Information about the current sector and collision
         new_state (dict): Current game state
 
     Returns:
@@ -157,19 +261,16 @@ def handle_tunneling(self, ball, current_sector, new_state):
         ball["velocity_y"] = reflected_vy
 
         # Create standardized movement info
-        movement_info = {
-            "is_approaching": True,
-            "current_distance": float(0.0),
-            "approach_speed": float(approach_speed),
-            "type": "tunneling",
-        }
+        movement_info = SideMovement(
+            is_approaching=True,
+            current_distance=float(0.0),
+            approach_speed=float(approach_speed),
+            type="tunneling",
+        )
 
-        standardized_sector = {
-            "side_index": side_index,
-            "movement": movement_info,
-            "type": "tunneling",
-            "projection": intersection,
-        }
+        standardized_sector = CollisionCandidate(
+            side_index, movement_info, "tunneling", projection=intersection
+        )
 
         # Handle based on side type
         if side_index in self.active_sides:
@@ -186,7 +287,7 @@ def handle_tunneling(self, ball, current_sector, new_state):
 
 
     # Case 2: Already have sector info - use it directly
-    side_index = current_sector["side_index"]
+    side_index = current_sector.side_index
     if side_index in self.active_sides:
         return self.handle_paddle(ball, current_sector, new_state)
     else:
@@ -200,13 +301,13 @@ def handle_paddle(self, ball, collision_candidate, new_state):
 
     Args:
         ball (dict): Ball object with position and size
-        collision_candidate (dict): Contains sector info like side_index, movement, projection
+        collision_candidate (CollisionCandidate): Contains sector info like side_index, movement, projection
         new_state (dict): Current game state with paddles and dimensions
 
     Returns:
         dict: Complete collision info - either paddle hit or miss data with enhanced debugging info
     """
-    side_index = collision_candidate["side_index"]
+    side_index = collision_candidate.side_index
     paddle = new_state["paddles"][side_index]
     relative_position = self.calculate_relative_position(ball, side_index)
 
@@ -217,8 +318,8 @@ def handle_paddle(self, ball, collision_candidate, new_state):
 
     # Initialize collision point
     collision_point = None
-    if collision_candidate["movement"]["type"] == "tunneling":
-        collision_point = collision_candidate.get("projection", None)
+    if collision_candidate.movement.type == "tunneling":
+        collision_point = collision_candidate.projection
 
     if not collision_point:
         start = self.vertices[side_index]
@@ -237,14 +338,14 @@ def handle_paddle(self, ball, collision_candidate, new_state):
         return {
             "type": "paddle",
             "side_index": side_index,
-            "distance": collision_candidate["movement"]["current_distance"],
+            "distance": collision_candidate.movement.current_distance,
             "normal": self.side_normals[side_index],
             "projection": collision_point,
             "normalized_offset": normalized_offset,
             "is_edge_hit": abs(abs(normalized_offset) - 1.0) < 0.1,
             "paddle_index": side_index,
             "hit_position": relative_position,
-            "approach_speed": collision_candidate["movement"]["approach_speed"],
+            "approach_speed": collision_candidate.movement.approach_speed,
             # New debug/statistics information
             "debug_info": {
                 "paddle_center": paddle_center,  # Where paddle should be (0-1)
@@ -258,22 +359,22 @@ def handle_paddle(self, ball, collision_candidate, new_state):
                 "normalized_distance": distance_from_paddle_center
                 / paddle_half_length,  # 0-1 value where 1 is edge
                 "was_tunneling": (
-                    collision_candidate.get("movement", {}).get("type") == "tunneling"
+                    collision_candidate.movement.type == "tunneling"
                 ),
             },
         }
-    elif collision_candidate["movement"]["current_distance"] > ball["size"]:
+    elif collision_candidate.movement.current_distance > ball["size"]:
         return None
 
     # Ball missed the paddle - include miss statistics too
     return {
         "type": "miss",
         "side_index": side_index,
-        "distance": collision_candidate["movement"]["current_distance"],
+        "distance": collision_candidate.movement.current_distance,
         "normal": self.side_normals[side_index],
         "projection": collision_point,
         "active_paddle_index": self.active_sides.index(side_index),
-        "approach_speed": collision_candidate["movement"]["approach_speed"],
+        "approach_speed": collision_candidate.movement.approach_speed,
         # New debug/statistics for misses
         "debug_info": {
             "paddle_center": paddle_center,
@@ -288,7 +389,7 @@ def handle_paddle(self, ball, collision_candidate, new_state):
                 abs(relative_position - (paddle_center + paddle_half_length)),
             ),  # How far the miss was from nearest paddle edge
             "was_tunneling": (
-                collision_candidate.get("movement", {}).get("type") == "tunneling"
+                collision_candidate.movement.type == "tunneling"
             ),
         },
     }
@@ -301,19 +402,19 @@ def handle_wall(self, ball, collision_candidate, new_state):
 
     Args:
         ball (dict): Ball object with position and size
-        collision_candidate (dict): Contains sector info like side_index, movement, projection
+        collision_candidate (CollisionCandidate): Contains sector info like side_index, movement, projection
         new_state (dict): Current game state with dimensions
 
     Returns:
         dict: Complete collision info with enhanced debugging info
     """
-    side_index = collision_candidate["side_index"]
+    side_index = collision_candidate.side_index
     relative_position = self.calculate_relative_position(ball, side_index)
 
     # Initialize collision point
     collision_point = None
-    if collision_candidate["movement"]["type"] == "tunneling":
-        collision_point = collision_candidate.get("projection", None)
+    if collision_candidate.movement.type == "tunneling":
+        collision_point = collision_candidate.projection
 
     if not collision_point:
         start = self.vertices[side_index]
@@ -326,18 +427,16 @@ def handle_wall(self, ball, collision_candidate, new_state):
     return {
         "type": "wall",
         "side_index": side_index,
-        "distance": collision_candidate["movement"]["current_distance"],
+        "distance": collision_candidate.movement.current_distance,
         "normal": self.side_normals[side_index],
         "projection": collision_point,
         "hit_position": relative_position,
-        "approach_speed": collision_candidate["movement"]["approach_speed"],
+        "approach_speed": collision_candidate.movement.approach_speed,
         # Debug info matching paddle collision pattern
         "debug_info": {
             "relative_hit": relative_position,  # Where ball hit on wall (0-1)
             "ball_size": ball["size"],  # Size of the ball
-            "impact_distance": collision_candidate["movement"][
-                "current_distance"
-            ],  # Distance at impact
+            "impact_distance": collision_candidate.movement.current_distance,  # Distance at impact
             "collision_point": {  # Exact collision coordinates
                 "x": collision_point["x"],
                 "y": collision_point["y"],
@@ -352,7 +451,7 @@ def handle_wall(self, ball, collision_candidate, new_state):
                     "y": self.vertices[(side_index + 1) % self.num_sides]["y"],
                 },
             },
-            "was_tunneling": (collision_candidate["movement"]["type"] == "tunneling"),
+            "was_tunneling": (collision_candidate.movement.type == "tunneling"),
         },
     }
 
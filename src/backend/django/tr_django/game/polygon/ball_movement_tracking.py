@@ -1,36 +1,16 @@
+from ..agame.movement_tracker import MovementTracker
+
+
 def self_initialize_ball_movements(self, num_balls):
-    """Initialize the nested array structure for ball movement tracking"""
-    self.previous_movements = [
-        {
-            "sides": [
-                {
-                    "distance": float(0.0),
-                    "signed_distance": float(0.0),
-                    "dot_product": float(0.0),
-                }
-                for _ in range(self.num_sides)
-            ],
-            "in_deadzone": True,  # Start in deadzone since balls spawn at center
-            "last_position": {"x": float(0.0), "y": float(0.0)},
-        }
-        for _ in range(num_balls)
-    ]
+    """Initialize the movement tracking arrays (balls start in the deadzone)"""
+    self.previous_movements = MovementTracker(num_balls, self.num_sides)
 
 
 def reset_ball_movement(self, ball_index):
     """Reset movement tracking for a specific ball"""
     if ball_index < len(self.previous_movements):
-        self.previous_movements[ball_index] = {
-            "sides": [
-                {
-                    "distance": float(0.0),
-                    "signed_distance": float(0.0),
-                    "dot_product": float(0.0),
-                }
-                for _ in range(self.num_sides)
-            ],
-            "in_deadzone": True,  # Reset into deadzone since ball resets to center
-        }
+        # Reset into deadzone since ball resets to center
+        self.previous_movements.reset(ball_index)
 
 
 def update_ball_movement(
@@ -38,27 +18,44 @@ def update_ball_movement(
 ):
     """Update movement data for a specific ball and side"""
     if ball_index >= len(self.previous_movements):
-        # Expand array if needed
-        additional_balls = ball_index - len(self.previous_movements) + 1
-        self.previous_movements.extend(
-            [
-                {
-                    "sides": [
-                        {
-                            "distance": float(0.0),
-                            "signed_distance": float(0.0),
-                            "dot_product": float(0.0),
-                        }
-                        for _ in range(self.num_sides)
-                    ],
-                    "in_deadzone": True,  # New balls start in deadzone
-                }
-                for _ in range(additional_balls)
-            ]
-        )
+        # Expand arrays if needed
+        self.previous_movements.grow(ball_index + 1)
 
-    self.previous_movements[ball_index]["sides"][side_index] = {
-        "distance": float(distance),
-        "dot_product": float(dot_product),
-        "signed_distance": float(signed_distance),
-    }
+    self.previous_movements.update_side(
+        ball_index, side_index, distance, dot_product, signed_distance
+    )
+
+
+def enter_sector(self, ball, ball_index, sector, side_values=None):
+    """
+    Track the angular sector of a ball for find_collision_candidate.
+    Only the sides of its sector are checked, the tracking of the other sides
+    keeps the values of the tick the ball left their reach. A side entering
+    the sector starts from the current values, not from that old tick.
+    """
+    movements = self.previous_movements
+    if ball_index >= len(movements):
+        movements.grow(ball_index + 1)
+    previous_sector = movements.sector[ball_index]
+    movements.sector[ball_index] = sector
+    if previous_sector < 0 or previous_sector == sector:
+        return
+    previous_sides = self.side_sectors[previous_sector]
+    for side_index in self.side_sectors[sector]:
+        if side_index in previous_sides:
+            continue
+        if side_values is None:
+            side = self.sides[side_index]
+            signed_distance = float(
+                (ball["x"] - side.start_x) * side.normal_x
+                + (ball["y"] - side.start_y) * side.normal_y
+            )
+            dot_product = float(
+                ball["velocity_x"] * side.normal_x + ball["velocity_y"] * side.normal_y
+            )
+        else:
+            signed_distance = float(side_values[0][side_index])
+            dot_product = float(side_values[1][side_index])
+        movements.update_side(
+            ball_index, side_index, abs(signed_distance), dot_product, signed_distance
+        )
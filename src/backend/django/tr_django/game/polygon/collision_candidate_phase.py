@@ -1,31 +1,38 @@
 # Collision Candidate Phase
 import logging
+from ..agame.value_types import SideMovement
 
 logger = logging.getLogger(__name__)
 
 
-def check_ball_movement_relative_to_side(self, ball, side_index, ball_index, new_state):
-    # Get normal from class's side_normals
-    normal = self.side_normals[side_index]
-    start = self.vertices[side_index]
+def check_ball_movement_relative_to_side(
+    self, ball, side_index, ball_index, new_state, signed_distance=None, dot_product=None
+):
+    # Get the side geometry (start vertex and normal)
+    side = self.sides[side_index]
 
-    # Calculate current state
-    signed_distance = float(
-        (ball["x"] - start["x"]) * normal["x"] + (ball["y"] - start["y"]) * normal["y"]
-    )
+    # Calculate current state (unless precomputed by the vectorized engine)
+    if signed_distance is None:
+        signed_distance = float(
+            (ball["x"] - side.start_x) * side.normal_x
+            + (ball["y"] - side.start_y) * side.normal_y
+        )
 
     current_distance = abs(signed_distance)
-    current_dot_product = float(
-        ball["velocity_x"] * normal["x"] + ball["velocity_y"] * normal["y"]
-    )
+    if dot_product is None:
+        dot_product = (
+            ball["velocity_x"] * side.normal_x + ball["velocity_y"] * side.normal_y
+        )
+    current_dot_product = float(dot_product)
 
     PARALLEL_THRESHOLD = float(
         1e-10
     )  # can be global or const , in c it would stand in a h file
     # Get previous state
-    previous_movement = self.previous_movements[ball_index]["sides"][side_index]
-    previous_signed_distance = float(previous_movement["distance"])
-    previous_dot_product = float(previous_movement["dot_product"])
+    movements = self.previous_movements
+    slot = movements.slot(ball_index, side_index)
+    previous_signed_distance = movements.distance[slot]
+    previous_dot_product = movements.dot_product[slot]
     was_approaching = previous_dot_product < PARALLEL_THRESHOLD
 
     # Case 1: Ball is parallel to side
@@ -37,12 +44,12 @@ def check_ball_movement_relative_to_side(self, ball, side_index, ball_index, new
         self.update_ball_movement(
             ball_index, side_index, current_distance, current_dot_product
         )
-        return {
-            "is_approaching": True,
-            "current_distance": float(current_distance),
-            "approach_speed": float(0.0),
-            "type": "parallel",
-        }
+        return SideMovement(
+            is_approaching=True,
+            current_distance=float(current_distance),
+            approach_speed=float(0.0),
+            type="parallel",
+        )
 
     # Case 2: Ball is moving towards side
     if current_dot_product < 0:
@@ -54,12 +61,12 @@ def check_ball_movement_relative_to_side(self, ball, side_index, ball_index, new
             current_dot_product,
             signed_distance,
         )
-        return {
-            "is_approaching": True,
-            "current_distance": float(current_distance),
-            "approach_speed": float(abs(current_dot_product)),
-            "type": "approaching",
-        }
+        return SideMovement(
+            is_approaching=True,
+            current_distance=float(current_distance),
+            approach_speed=float(abs(current_dot_product)),
+            type="approaching",
+        )
 
     # Case 3: Ball is moving away from side
     else:
@@ -72,12 +79,12 @@ def check_ball_movement_relative_to_side(self, ball, side_index, ball_index, new
                 current_dot_product,
                 signed_distance,
             )
-            return {
-                "is_approaching": False,
-                "current_distance": float(current_distance),
-                "approach_speed": float(abs(current_dot_product)),
-                "type": "moving_away",
-            }
+            return SideMovement(
+                is_approaching=False,
+                current_distance=float(current_distance),
+                approach_speed=float(abs(current_dot_product)),
+                type="moving_away",
+            )
 
         # Case 3b: Was moving towards last frame
         else:
@@ -91,14 +98,14 @@ def check_ball_movement_relative_to_side(self, ball, side_index, ball_index, new
                     logger.debug(f"{self.game_id}: 3ba - tunneling detected")
                     # Don't update previous_movements for tunneling case
                     # This preserves the state before tunneling for proper bounce handling
-                    return {
-                        "is_approaching": True,  # Consider approaching for collision handling
-                        "current_distance": float(
+                    return SideMovement(
+                        is_approaching=True,  # Consider approaching for collision handling
+                        current_distance=float(
                             min(current_distance, previous_signed_distance)
                         ),
-                        "approach_speed": float(abs(current_dot_product)),
-                        "type": "tunneling",
-                    }
+                        approach_speed=float(abs(current_dot_product)),
+                        type="tunneling",
+                    )
             logger.debug(f"{self.game_id}: 3bb - tunneling detected - false positive ")
             # Case 3bb: Regular moving away (including post-bounce)
             self.update_ball_movement(
@@ -108,12 +115,12 @@ def check_ball_movement_relative_to_side(self, ball, side_index, ball_index, new
                 current_dot_product,
                 signed_distance,
             )
-            return {
-                "is_approaching": False,
-                "current_distance": float(current_distance),
-                "approach_speed": float(abs(current_dot_product)),
-                "type": "moving_away",
-            }
+            return SideMovement(
+                is_approaching=False,
+                current_distance=float(current_distance),
+                approach_speed=float(abs(current_dot_product)),
+                type="moving_away",
+            )
 
 
 def check_paddle(self, current_distance, new_state, side_index, ball):
@@ -12,20 +12,19 @@ def calculate_relative_position(self, ball, side_index):
     Returns:
         float: Relative position along the side (0 = start, 1 = end)
     """
-    start = self.vertices[side_index]
-    end = self.vertices[(side_index + 1) % self.num_sides]
+    side = self.sides[side_index]
 
     # Vector from start to end of side
-    side_vector_x = end["x"] - start["x"]
-    side_vector_y = end["y"] - start["y"]
+    side_vector_x = side.end_x - side.start_x
+    side_vector_y = side.end_y - side.start_y
 
     # Vector from start to ball
-    ball_vector_x = ball["x"] - start["x"]
-    ball_vector_y = ball["y"] - start["y"]
+    ball_vector_x = ball["x"] - side.start_x
+    ball_vector_y = ball["y"] - side.start_y
 
     # Calculate dot product and side length
     dot_product = side_vector_x * ball_vector_x + side_vector_y * ball_vector_y
-    side_length_squared = side_vector_x * side_vector_x + side_vector_y * side_vector_y
+    side_length_squared = side.length_squared
 
     if side_length_squared == 0:
         return 0.0
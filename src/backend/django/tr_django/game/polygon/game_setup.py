@@ -113,6 +113,64 @@ def calculate_sides_normals(cls, settings: Dict[str, Any]) -> dict:
     return {"normals": side_normals}
 
 
+@classmethod
+def calculate_side_sectors(cls, settings: Dict[str, Any]) -> dict:
+    """
+    Angular sector index for the collision candidate phase.
+    The circle is split into sectors (by angle of the ball position); each
+    sector lists the sides whose line can come within collision range
+    (paddle_width + ball_size) of a ball in that sector outside the deadzone.
+    Sides farther away can never be the chosen candidate, so the candidate
+    phase only needs to check the sides of the ball's sector.
+    """
+    vertices = settings.get("vertices")
+    side_normals = settings.get("normals")
+    num_sides = settings.get("sides")
+    scale = settings.get("scale")
+    if not vertices or not side_normals:
+        raise ValueError("Vertices and normals must be calculated before side sectors")
+
+    EPSILON = 1e-9
+    reach = (settings.get("paddle_width") + settings.get("ball_size")) * scale + EPSILON
+    # balls in the candidate phase are outside the deadzone (get_inner_boundary)
+    inner_radius = max(
+        0.0,
+        (
+            settings.get("inner_boundary")
+            - (settings.get("paddle_width") + settings.get("ball_size")) * scale
+        )
+        * 0.8,
+    )
+    outer_radius = max(1.0, max(math.hypot(v["x"], v["y"]) for v in vertices))
+    num_sectors = max(16, 4 * num_sides)
+    sector_size = 2 * math.pi / num_sectors
+
+    side_sectors = []
+    for sector in range(num_sectors):
+        start = sector * sector_size
+        end = start + sector_size
+        sides = []
+        for i in range(num_sides):
+            # signed distance to the side line: r * cos(phi - alpha) - c
+            normal = side_normals[i]
+            alpha = math.atan2(normal["y"], normal["x"])
+            c = vertices[i]["x"] * normal["x"] + vertices[i]["y"] * normal["y"]
+            cosines = [math.cos(start - alpha), math.cos(end - alpha)]
+            if (alpha - start) % (2 * math.pi) <= sector_size:
+                cosines.append(1.0)
+            if (alpha + math.pi - start) % (2 * math.pi) <= sector_size:
+                cosines.append(-1.0)
+            values = [
+                radius * cosine - c
+                for radius in (inner_radius, outer_radius)
+                for cosine in (min(cosines), max(cosines))
+            ]
+            if min(values) <= reach and max(values) >= -reach:
+                sides.append(i)
+        side_sectors.append(sides)
+    return {"side_sectors": side_sectors}
+
+
 #
 @classmethod
 def calculate_vertices(cls, settings: Dict[str, Any]) -> dict:
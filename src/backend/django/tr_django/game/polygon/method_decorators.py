@@ -9,6 +9,9 @@ def add_abstract_implementations(cls):
         # Boundary Phase
         # Collision Candidate Phase
         find_collision_candidate,
+        # Continuous collision
+        find_time_of_impact,
+        ticks_to_reach,
         # Collision Verification Phase
         handle_tunneling,
         handle_paddle,
@@ -23,6 +26,9 @@ def add_abstract_implementations(cls):
         # Boundary Phase
         # Collision Candidate Phase
         "find_collision_candidate": find_collision_candidate,
+        # Continuous collision
+        "find_time_of_impact": find_time_of_impact,
+        "ticks_to_reach": ticks_to_reach,
         # Collision Verification Phase
         "handle_tunneling": handle_tunneling,
         "handle_paddle": handle_paddle,
@@ -42,6 +48,7 @@ def add_cls_methods(cls):
         calculate_vertices,
         calculate_sides_normals,
         calculate_inner,
+        calculate_side_sectors,
         initialize_ball_movements,
     )
 
@@ -49,6 +56,7 @@ def add_cls_methods(cls):
         "calculate_vertices": calculate_vertices,
         "calculate_sides_normals": calculate_sides_normals,
         "calculate_inner": calculate_inner,
+        "calculate_side_sectors": calculate_side_sectors,
         "initialize_ball_movements": initialize_ball_movements,
     }
 
@@ -156,12 +164,14 @@ def add_ball_movement_tracking(cls):
         self_initialize_ball_movements,
         update_ball_movement,
         reset_ball_movement,
+        enter_sector,
     )
 
     methods = {
         "self_initialize_ball_movements": self_initialize_ball_movements,
         "update_ball_movement": update_ball_movement,
         "reset_ball_movement": reset_ball_movement,
+        "enter_sector": enter_sector,
     }
 
     for name, method in methods.items():
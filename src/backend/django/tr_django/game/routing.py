@@ -1,5 +1,5 @@
 from django.urls import path
-from .consumers import PongConsumer
+from .consumers import PongConsumer, LobbyConsumer
 from .tournamentmanager.TournamentNotification import TournamentNotificationConsumer
 
 websocket_urlpatterns = [
@@ -15,6 +15,9 @@ websocket_urlpatterns = [
     path("wss/pong/<int:game_id>/", PongConsumer.as_asgi()),
     #path("wss/pong/<uuid:game_id>/", PongConsumer.as_asgi()),
     path("wss/pong/<str:game_id>/", PongConsumer.as_asgi()),
+    # live game list
+    path("ws/lobby/", LobbyConsumer.as_asgi()),
+    path("wss/lobby/", LobbyConsumer.as_asgi()),
     # TournamentNotification
     path('ws/tournament/<str:tournament_id>/notifications/', TournamentNotificationConsumer.as_asgi()),
     path('wss/tournament/<str:tournament_id>/notifications/', TournamentNotificationConsumer.as_asgi()),
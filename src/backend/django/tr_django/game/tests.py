@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from datetime import timedelta
 from .models import (
@@ -13,10 +13,56 @@ from .models import (
 from users.models import CustomUser
 from django.core.exceptions import ValidationError
 from django.urls import reverse
+from channels.testing import WebsocketCommunicator
 import uuid
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ResponseError
 import json
 from .services.tournament_service import build_tournament_data, build_timetable_data
+from .agame.tick_clock import TickClock, TickStats
+from .agame.game_scheduler import GameScheduler
+from .agame.ball_engine import BallBatch, np
+from .agame.impact_schedule import HORIZON_MARGIN
+from .agame.movement_tracker import MovementTracker
+from .agame.value_types import CollisionCandidate, Side, SideMovement
+from .agame.frames import (
+    BINARY_FRAMES,
+    BINARY_SUBPROTOCOL,
+    JSON_FRAMES,
+    encode_binary_frame,
+    encode_frame,
+    frame_group,
+    snapshot_state,
+    state_delta,
+)
+from .agame.AGameManager import AGameManager
+from .consumers import LobbyConsumer, PongConsumer
+from .gamecoordinator.GameCoordinator import GameCoordinator
+from .gamecoordinator.redis_pools import RedisPools
+from .gamecoordinator.redis_lock import RedisLock, RedisSyncLock
+from .agame.paddle import (
+    INPUTS_EXPIRY,
+    MAX_INPUTS_PER_TICK,
+    MAX_QUEUED_INPUTS,
+    VELOCITY_INPUT,
+)
+from .agame.player import ADD_PLAYER_ERRORS, NO_BOOKING
+from .polygon.PolygonPongGame import PolygonPongGame
+from .circular.CircularPongGame import CircularPongGame
+from .gamecoordinator.GameSettingsManager import GameSettingsManager
+from unittest import skipIf
+from types import SimpleNamespace
+import asyncio
+import copy
+import msgpack
+import math
+import random
+
+try:
+    import fakeredis
+    import lupa  # the redis script tests need fakeredis with Lua support
+except ImportError:
+    fakeredis = None
 
 
 class GameModeTestCase(TestCase):
@@ -1253,3 +1299,1228 @@ class TournamentServiceTest(TestCase):
         data = build_tournament_data(tournament)
         self.assertFalse(data["isTimetableAvailable"])
         self.assertIsNone(data["timetable"])
+
+
+class TickClockTest(TestCase):
+    def setUp(self):
+        self.clock = TickClock(tick_rate=10, max_catchup_steps=4)
+        self.now = 100.0
+        patcher = patch("game.agame.tick_clock.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clock.start()
+
+    def test_on_time(self):
+        """One step per deadline while the loop keeps up"""
+        for _ in range(3):
+            self.assertEqual(self.clock.due_steps(), 1)
+            self.now += 0.1
+        self.assertEqual(
+            self.clock.stats(), {"tick": 3, "overruns": 0, "skipped_frames": 0}
+        )
+
+    def test_catch_up(self):
+        """A late loop runs the missed ticks as catch-up steps"""
+        self.clock.due_steps()
+        self.now += 0.35
+        self.assertEqual(self.clock.due_steps(), 3)
+        self.assertEqual(self.clock.overruns, 1)
+        self.assertEqual(self.clock.last_skipped, 0)
+        # the deadlines stay on the fixed grid
+        self.assertAlmostEqual(self.clock.next_tick, 100.4)
+
+    def test_skip(self):
+        """Steps beyond max_catchup_steps are dropped and counted"""
+        self.clock.due_steps()
+        self.now += 1.0
+        self.assertEqual(self.clock.due_steps(), 4)
+        self.assertEqual(self.clock.last_skipped, 6)
+        self.assertEqual(self.clock.skipped_frames, 6)
+        self.assertAlmostEqual(self.clock.next_tick, self.now + 0.1)
+        self.now += 0.1
+        self.assertEqual(self.clock.due_steps(), 1)
+        self.assertEqual(self.clock.last_skipped, 0)
+
+    def test_game_tick_stats(self):
+        """Each game only counts the ticks it was stepped in"""
+        first, second = TickStats(), TickStats()
+        first.record(1)
+        first.record(4, 6)
+        second.record(2)
+        self.assertEqual(first.stats(), {"tick": 5, "overruns": 1, "skipped_frames": 6})
+        self.assertEqual(second.stats(), {"tick": 2, "overruns": 1, "skipped_frames": 0})
+
+
+class GameSchedulerTest(TestCase):
+    def test_scheduler_per_tick_settings(self):
+        """Games share a scheduler only with the same tick rate and catch-up limit"""
+
+        async def get_schedulers():
+            return (
+                GameScheduler.get(60, 4),
+                GameScheduler.get(60, 4),
+                GameScheduler.get(60, 8),
+            )
+
+        first, same, other = asyncio.run(get_schedulers())
+        self.assertIs(first, same)
+        self.assertIsNot(first, other)
+        self.assertEqual(other.clock.max_catchup_steps, 8)
+
+    class ReadsOnlyGame:
+        """Game that only reads `key` each tick and stops when it is not set"""
+
+        def __init__(self, game_id, key):
+            self.game_id = game_id
+            self.key = key
+
+        def queue_tick_reads(self, pipeline):
+            pipeline.get(self.key)
+            return 1
+
+        def apply_tick_reads(self, results):
+            return False
+
+    def run_scheduler(self, test, aclose_delay=0.0):
+        """
+        Run test(scheduler, server, closing) with the scheduler connections on a
+        fake server, `closing` is set when a run starts closing its connection
+        """
+        server = fakeredis.FakeServer()
+        closing = asyncio.Event()
+
+        async def get_redis_binary(url):
+            redis_conn = fakeredis.FakeAsyncRedis(server=server)
+            aclose = redis_conn.aclose
+
+            async def slow_aclose():
+                closing.set()
+                await asyncio.sleep(aclose_delay)
+                await aclose()
+
+            redis_conn.aclose = slow_aclose
+            return redis_conn
+
+        with patch.object(
+            GameCoordinator, "get_redis_binary", AsyncMock(side_effect=get_redis_binary)
+        ), patch("game.agame.game_scheduler.get_channel_layer"):
+            asyncio.run(test(GameScheduler(60, 4), server, closing))
+
+    @skipIf(fakeredis is None, "fakeredis[lua] is not installed")
+    def test_register_while_closing(self):
+        """A game registered while the last run closes its connection gets a new run"""
+
+        async def test(scheduler, server, closing):
+            self.assertFalse(await scheduler.run_game(self.ReadsOnlyGame("first", "running")))
+            await closing.wait()
+            second = self.ReadsOnlyGame("second", "running")
+            self.assertFalse(await asyncio.wait_for(scheduler.run_game(second), 1))
+
+        self.run_scheduler(test, aclose_delay=0.1)
+
+    @skipIf(fakeredis is None, "fakeredis[lua] is not installed")
+    def test_failed_read_stops_its_game_only(self):
+        """A failed command only ends the game that queued it"""
+
+        async def test(scheduler, server, closing):
+            redis_conn = fakeredis.FakeAsyncRedis(server=server)
+            await redis_conn.lpush("list_key", "1")
+            broken = asyncio.create_task(
+                scheduler.run_game(self.ReadsOnlyGame("broken", "list_key"))
+            )
+            other = asyncio.create_task(
+                scheduler.run_game(self.ReadsOnlyGame("other", "running"))
+            )
+            self.assertFalse(await other)
+            with self.assertRaises(ResponseError):
+                await broken
+            await redis_conn.aclose()
+
+        self.run_scheduler(test)
+
+
+async def _no_connections():
+    pass
+
+
+def create_test_game(user_settings, game_id="test_game", seed=1, **settings):
+    """Game manager without redis / channel layer and a copy of its initial state"""
+    random.seed(seed)
+    game_settings = GameSettingsManager().create_game_settings(user_settings, game_id)
+    game_settings.update(settings)
+    game_class = PolygonPongGame if game_settings["type"] == "polygon" else CircularPongGame
+    game = game_class(game_id)
+    game.settings = game_settings
+    game.setup_connections = _no_connections
+    asyncio.run(game.initialize())
+    return game, copy.deepcopy(game_settings["state"])
+
+
+def run_test_games(games, ticks, batched=False, seed=42):
+    """
+    Step (game, state) pairs `ticks` times like the GameScheduler does,
+    with batched=True the balls of all games move in one BallBatch.
+    Returns the final states and the number of collision events.
+    """
+
+    async def run():
+        random.seed(seed)
+        states = [state for _, state in games]
+        running = list(range(len(games)))
+        events = 0
+        batch = None
+        for _ in range(ticks):
+            phases = [None] * len(running)
+            if batched:
+                pairs = [(games[index][0], states[index]) for index in running]
+                if batch is None or not batch.is_current(pairs):
+                    batch = BallBatch(pairs)
+                phases = batch.step()
+            for index, phase in zip(list(running), phases):
+                states[index], game_over, step_data = await games[index][0].game_logic(
+                    states[index], phase
+                )
+                events += len(step_data["events"])
+                if game_over:
+                    running.remove(index)
+            if batched:
+                batch.store()
+            if not running:
+                break
+        return states, events
+
+    with patch(
+        "game.gamecoordinator.GameCoordinator.GameCoordinator.set_to_finished_game"
+    ):
+        return asyncio.run(run())
+
+
+@skipIf(np is None, "numpy is not installed")
+class BallEngineTest(TestCase):
+    def assertSameStates(self, states, expected_states):
+        for state, expected in zip(states, expected_states):
+            self.assertEqual(state["scores"], expected["scores"])
+            for ball, expected_ball in zip(state["balls"], expected["balls"]):
+                for key in ("x", "y", "velocity_x", "velocity_y"):
+                    self.assertAlmostEqual(ball[key], expected_ball[key], places=9)
+
+    def test_numpy_engine_parity(self):
+        """The NumPy engine plays the same game as the dict engine"""
+        for user_settings in (
+            {"mode": "regular", "num_balls": 6},
+            {"mode": "irregular", "sides": 6, "num_players": 3, "num_balls": 6},
+            {"mode": "circular", "num_balls": 6},
+        ):
+            with self.subTest(mode=user_settings["mode"]):
+                results = [
+                    run_test_games(
+                        [create_test_game(user_settings, ball_engine=engine)], 600
+                    )
+                    for engine in ("python", "numpy")
+                ]
+                self.assertEqual(results[0][1], results[1][1])
+                self.assertGreater(results[0][1], 0)
+                self.assertSameStates(results[1][0], results[0][0])
+
+    def test_auto_engine(self):
+        """"auto" keeps single-ball games on the dict engine"""
+        for num_balls, engine in ((1, None), (2, "numpy")):
+            game, _ = create_test_game({"mode": "regular", "num_balls": num_balls})
+            self.assertEqual(game.ball_engine, engine)
+
+    def test_batched_games_parity(self):
+        """Games stepped in one BallBatch play like games stepped one by one"""
+        user_settings = {"mode": "regular", "num_balls": 4}
+        python_games = [
+            create_test_game(user_settings, f"game_{seed}", seed, ball_engine="python")
+            for seed in range(3)
+        ]
+        numpy_games = [
+            create_test_game(user_settings, f"game_{seed}", seed, ball_engine="numpy")
+            for seed in range(3)
+        ]
+        states, events = run_test_games(python_games, 600)
+        batched_states, batched_events = run_test_games(numpy_games, 600, batched=True)
+        self.assertGreater(events, 0)
+        self.assertEqual(batched_events, events)
+        self.assertSameStates(batched_states, states)
+
+
+class SideSectorTest(TestCase):
+    CASES = (
+        {"mode": "regular", "sides": 5},
+        {"mode": "irregular", "sides": 6, "num_players": 3},
+        {"mode": "irregular", "sides": 8, "num_players": 4, "shape": "star"},
+    )
+
+    def test_sectors_cover_sides_in_reach(self):
+        """Every side a full scan finds in collision range is in the ball's sector"""
+        for user_settings in self.CASES:
+            game, _ = create_test_game(user_settings)
+            settings = game.settings
+            reach = (settings["paddle_width"] + settings["ball_size"]) * settings["scale"]
+            inner_radius = max(0.0, (settings["inner_boundary"] - reach) * 0.8)
+            sectors = game.side_sectors
+            self.assertTrue(sectors)
+            rng = random.Random(7)
+            with self.subTest(**user_settings):
+                for _ in range(2000):
+                    angle = rng.uniform(0, 2 * math.pi)
+                    radius = rng.uniform(inner_radius, 1.0)
+                    x, y = radius * math.cos(angle), radius * math.sin(angle)
+                    sector = int(
+                        (math.atan2(y, x) % (2 * math.pi)) * len(sectors) / (2 * math.pi)
+                    )
+                    sides = sectors[min(sector, len(sectors) - 1)]
+                    for side_index in range(game.num_sides):
+                        vertex = settings["vertices"][side_index]
+                        normal = settings["normals"][side_index]
+                        distance = (x - vertex["x"]) * normal["x"] + (y - vertex["y"]) * normal["y"]
+                        if abs(distance) <= reach:
+                            self.assertIn(side_index, sides)
+
+    def test_side_entering_sector(self):
+        """A fast ball changing sectors is checked against sides it came into reach of now"""
+        game, state = create_test_game({"mode": "regular", "sides": 8}, ball_engine="python")
+        sectors = game.side_sectors
+        sector_angle = 2 * math.pi / len(sectors)
+        first, second = next(
+            (sector, sector + 1)
+            for sector in range(len(sectors) - 1)
+            if set(sectors[sector + 1]) - set(sectors[sector])
+        )
+        entering = next(iter(set(sectors[second]) - set(sectors[first])))
+        side = game.sides[entering]
+
+        def ball_at(sector):
+            # moving away from the entering side at speed, across the sectors
+            angle = (sector + 0.5) * sector_angle
+            return {
+                "x": 0.8 * math.cos(angle),
+                "y": 0.8 * math.sin(angle),
+                "velocity_x": side.normal_x * 0.03 - side.normal_y * 0.001,
+                "velocity_y": side.normal_y * 0.03 + side.normal_x * 0.001,
+                "size": state["balls"][0]["size"],
+            }
+
+        ball = ball_at(first)
+        game.find_collision_candidate(ball, 0, state, 0.8)
+        # tracking of the out of reach side, many ticks old: approaching from behind
+        game.previous_movements.update_side(0, entering, -0.5, -0.03, -0.5)
+        ball = ball_at(second)
+        candidate = game.find_collision_candidate(ball, 0, state, 0.8)
+        self.assertFalse(candidate is not None and candidate.type == "tunneling")
+        slot = game.previous_movements.slot(0, entering)
+        self.assertGreater(game.previous_movements.dot_product[slot], 0)
+        self.assertEqual(game.previous_movements.sector[0], second)
+
+    def test_sector_lookup_parity(self):
+        """Games play the same with the sector lookup and with the full side scan"""
+        for user_settings in self.CASES:
+            with self.subTest(**user_settings):
+                user_settings = {**user_settings, "num_balls": 4}
+                results = [
+                    run_test_games(
+                        [create_test_game(user_settings, ball_engine="python", **extra)], 600
+                    )
+                    for extra in ({"side_sectors": None}, {})
+                ]
+                self.assertEqual(results[1][1], results[0][1])
+                self.assertEqual(results[1][0][0]["scores"], results[0][0][0]["scores"])
+                self.assertEqual(results[1][0][0]["balls"], results[0][0][0]["balls"])
+
+
+def ball_towards(side, distance, speed, size=0.05):
+    """Ball at `distance` from the middle of a side, moving straight at it"""
+    return {
+        "x": (side.start_x + side.end_x) / 2 + side.normal_x * distance,
+        "y": (side.start_y + side.end_y) / 2 + side.normal_y * distance,
+        "velocity_x": -side.normal_x * speed,
+        "velocity_y": -side.normal_y * speed,
+        "size": size,
+    }
+
+
+class ContinuousCollisionTest(TestCase):
+    def setUp(self):
+        self.game, self.state = create_test_game(
+            {"mode": "regular", "sides": 4}, collision_mode="continuous"
+        )
+        self.paddle_width = self.state["dimensions"]["paddle_width"]
+        self.wall = next(
+            side for side in self.game.sides if side.index not in self.game.active_sides
+        )
+        self.goal = self.game.sides[self.game.active_sides[0]]
+
+    def test_wall_impact(self):
+        """A wall is hit when the ball center is one ball size from its line"""
+        ball = ball_towards(self.wall, 0.05 + 0.02, 0.04)
+        time_of_impact, candidate = self.game.find_time_of_impact(ball, 1.0, self.state)
+        self.assertAlmostEqual(time_of_impact, 0.5)
+        self.assertEqual(candidate.side_index, self.wall.index)
+        self.assertAlmostEqual(candidate.movement.current_distance, 0.05)
+
+    def test_paddle_impact(self):
+        """A covered paddle side is hit at the paddle surface"""
+        self.state["paddles"][self.goal.index]["position"] = 0.5
+        ball = ball_towards(self.goal, 0.05 + self.paddle_width + 0.02, 0.02)
+        time_of_impact, candidate = self.game.find_time_of_impact(ball, 2.0, self.state)
+        self.assertAlmostEqual(time_of_impact, 0.5)
+        self.assertEqual(candidate.side_index, self.goal.index)
+        self.assertAlmostEqual(candidate.movement.current_distance, 0.05 + self.paddle_width)
+
+    def test_missed_paddle(self):
+        """Past the paddle the ball reaches the goal plane"""
+        self.state["paddles"][self.goal.index]["position"] = 0.85
+        ball = ball_towards(self.goal, 0.05 + self.paddle_width + 0.02, 0.2)
+        time_of_impact, candidate = self.game.find_time_of_impact(ball, 1.0, self.state)
+        self.assertEqual(candidate.side_index, self.goal.index)
+        self.assertLess(candidate.movement.current_distance, 0.05)
+        self.assertAlmostEqual(
+            time_of_impact, (0.07 + self.paddle_width - candidate.movement.current_distance) / 0.2
+        )
+
+    def test_no_impact(self):
+        """No impact within the tick or when moving away"""
+        ball = ball_towards(self.wall, 0.5, 0.04)
+        self.assertIsNone(self.game.find_time_of_impact(ball, 1.0, self.state))
+        ball = ball_towards(self.wall, 0.06, -0.04)
+        self.assertIsNone(self.game.find_time_of_impact(ball, 1.0, self.state))
+
+
+class ImpactScheduleTest(TestCase):
+    def setUp(self):
+        self.game, self.state = create_test_game({"mode": "regular", "sides": 4})
+        self.side = self.game.sides[1]
+
+    def test_ticks_to_reach(self):
+        """Ticks until the ball comes within reach of the side it moves towards"""
+        ball = ball_towards(self.side, 0.3, 0.01)
+        self.assertAlmostEqual(self.game.ticks_to_reach(ball, 0.11), 19.0)
+        # moving away from every side it is close to: the far side counts
+        ball = ball_towards(self.side, 0.3, -0.01)
+        self.assertGreater(self.game.ticks_to_reach(ball, 0.11), 19.0)
+        ball["velocity_x"] = ball["velocity_y"] = 0.0
+        self.assertIsNone(self.game.ticks_to_reach(ball, 0.11))
+
+    def test_impact_horizon(self):
+        """The horizon ends HORIZON_MARGIN ticks before the first possible contact"""
+        ball = ball_towards(self.side, 0.3, 0.01)
+        reach = ball["size"] + self.state["dimensions"]["paddle_width"]
+        expected = int((0.3 - reach) / 0.01) - HORIZON_MARGIN
+        self.assertEqual(self.game.impact_horizon(ball, self.state), expected)
+        ball = ball_towards(self.side, reach, 0.01)
+        self.assertEqual(self.game.impact_horizon(ball, self.state), 0)
+
+    def test_schedule_parity(self):
+        """Skipping the checks before the horizon does not change the game"""
+        for engine in ("python", "numpy") if np is not None else ("python",):
+            with self.subTest(engine=engine):
+                results = [
+                    run_test_games(
+                        [
+                            create_test_game(
+                                {"mode": "regular", "sides": 8, "num_balls": 4},
+                                ball_engine=engine,
+                                impact_schedule=impact_schedule,
+                            )
+                        ],
+                        1000,
+                    )
+                    for impact_schedule in (False, True)
+                ]
+                self.assertEqual(results[1][1], results[0][1])
+                self.assertEqual(results[1][0][0]["scores"], results[0][0][0]["scores"])
+                self.assertEqual(results[1][0][0]["balls"], results[0][0][0]["balls"])
+
+
+class MovementTrackerTest(TestCase):
+    def setUp(self):
+        self.tracker = MovementTracker(2, 3)
+        self.tracker.update_side(0, 1, 0.5, -0.1, 0.4)
+        self.tracker.update_side(1, 2, 0.7, 0.2, -0.6)
+        self.tracker.in_deadzone[1] = 0
+        self.tracker.set_last_position(1, 0.3, -0.2)
+        self.tracker.quiet_ticks[1] = 5
+
+    def test_grow(self):
+        """New balls start in the deadzone at the center, existing balls are kept"""
+        tracking = self.tracker.to_list()
+        self.tracker.grow(4)
+        self.assertEqual(len(self.tracker), 4)
+        self.assertEqual(len(self.tracker.distance), 4 * 3)
+        self.assertEqual(self.tracker.to_list()[:2], tracking)
+        for ball_index in (2, 3):
+            self.assertEqual(self.tracker.in_deadzone[ball_index], 1)
+            self.assertEqual(self.tracker.quiet_ticks[ball_index], 0)
+            self.assertEqual(
+                self.tracker.to_list()[ball_index]["last_position"], {"x": 0.0, "y": 0.0}
+            )
+        # growing to fewer balls changes nothing
+        self.tracker.grow(1)
+        self.assertEqual(len(self.tracker), 4)
+
+    def test_reset(self):
+        """A reset only clears the tracking of its ball"""
+        self.tracker.reset(1)
+        tracking = self.tracker.to_list()
+        self.assertEqual(self.tracker.in_deadzone[1], 1)
+        self.assertEqual(self.tracker.quiet_ticks[1], 0)
+        self.assertNotIn("last_position", tracking[1])
+        self.assertEqual(
+            tracking[1]["sides"],
+            [{"distance": 0.0, "signed_distance": 0.0, "dot_product": 0.0}] * 3,
+        )
+        self.assertEqual(
+            tracking[0]["sides"][1],
+            {"distance": 0.5, "signed_distance": 0.4, "dot_product": -0.1},
+        )
+        self.tracker.reset(0, (0.1, 0.2))
+        self.assertEqual(self.tracker.to_list()[0]["last_position"], {"x": 0.1, "y": 0.2})
+
+    def test_settings_round_trip(self):
+        """to_list gives the settings form from_settings reads"""
+        tracking = self.tracker.to_list()
+        self.assertEqual(MovementTracker.from_settings(tracking, 3).to_list(), tracking)
+
+
+class ValueTypesTest(TestCase):
+    def test_dict_access(self):
+        """Records keep the item access of the dicts they replace"""
+        movement = SideMovement(True, 0.2, 0.01, "approaching")
+        candidate = CollisionCandidate(3, movement, "approaching")
+        self.assertEqual(candidate["side_index"], 3)
+        self.assertIs(candidate["movement"], movement)
+        self.assertIsNone(candidate.get("projection"))
+        self.assertEqual(candidate.get("missing", "default"), "default")
+        with self.assertRaises(KeyError):
+            candidate["missing"]
+        with self.assertRaises(AttributeError):
+            candidate.missing = 1
+        self.assertEqual(
+            candidate.to_dict()["movement"],
+            {
+                "is_approaching": True,
+                "current_distance": 0.2,
+                "approach_speed": 0.01,
+                "type": "approaching",
+                "signed_distance": None,
+            },
+        )
+
+    def test_sides_from_polygon(self):
+        """Each side runs from its vertex to the next one, the last closes the polygon"""
+        vertices = [{"x": 1.0, "y": 0.0}, {"x": 0.0, "y": 1.0}, {"x": -1.0, "y": 0.0}]
+        normals = [{"x": -0.5, "y": -0.5}, {"x": 0.5, "y": -0.5}, {"x": 0.0, "y": 1.0}]
+        sides = Side.from_polygon(vertices, normals)
+        self.assertEqual([side.index for side in sides], [0, 1, 2])
+        self.assertEqual((sides[2].end_x, sides[2].end_y), (1.0, 0.0))
+        self.assertAlmostEqual(sides[0].length_squared, 2.0)
+        self.assertIs(sides[1].normal, normals[1])
+        self.assertEqual(Side.from_polygon([], []), [])
+
+
+def apply_delta(state, delta):
+    """Client side of a game_delta (applyStateDelta of the frontend)"""
+    new_state = dict(state)
+    for key, value in delta.items():
+        if key in ("balls", "paddles"):
+            items = list(state[key])
+            for index, changes in value.items():
+                items[index] = {**items[index], **changes}
+            new_state[key] = items
+        else:
+            new_state[key] = value
+    return new_state
+
+
+class TickRateTest(TestCase):
+    def test_bounce_independent_of_tick_rate(self):
+        """A bounce turns the ball by the same angle at every tick rate"""
+        directions = []
+        for tick_rate in (60, 120):
+            game, _ = create_test_game({"mode": "regular"}, tick_rate=tick_rate)
+            speed = 0.05 * game.speed_scale
+            ball = {"velocity_x": speed, "velocity_y": -speed, "size": 0.05}
+            random.seed(3)
+            velocity = game.apply_ball_bounce_effect(ball, {"x": 0.0, "y": 1.0})
+            directions.append(math.atan2(velocity["velocity_y"], velocity["velocity_x"]))
+        self.assertAlmostEqual(directions[0], directions[1])
+
+
+class StateDeltaTest(TestCase):
+    def setUp(self):
+        self.game, self.state = create_test_game({"mode": "regular", "num_balls": 2})
+
+    def test_snapshot_is_a_copy(self):
+        """Changes of the state after the snapshot do not leak into it"""
+        reference = snapshot_state(self.state)
+        self.assertEqual(reference, self.state)
+        self.state["balls"][0]["x"] += 0.1
+        self.state["scores"][0] += 1
+        self.assertNotEqual(reference["balls"][0]["x"], self.state["balls"][0]["x"])
+        self.assertNotEqual(reference["scores"], self.state["scores"])
+
+    def test_delta_updates_reference_in_place(self):
+        """The delta holds the changed fields only, the reference takes them over"""
+        reference = snapshot_state(self.state)
+        first_ball = reference["balls"][0]
+        self.state["balls"][0]["x"] += 0.1
+        self.state["scores"][1] += 1
+        delta = state_delta(reference, self.state)
+        self.assertEqual(
+            delta,
+            {"balls": {0: {"x": self.state["balls"][0]["x"]}}, "scores": self.state["scores"]},
+        )
+        self.assertIs(reference["balls"][0], first_ball)
+        self.assertEqual(reference, self.state)
+        self.assertIsNot(reference["scores"], self.state["scores"])
+        self.assertEqual(state_delta(reference, self.state), {})
+
+    def test_shape_change_needs_keyframe(self):
+        """A different ball count or a removed key gives no delta"""
+        reference = snapshot_state(self.state)
+        self.state["balls"].pop()
+        self.assertIsNone(state_delta(reference, self.state))
+        reference = snapshot_state(self.state)
+        del self.state["scores"]
+        self.assertIsNone(state_delta(reference, self.state))
+
+    def test_applied_deltas_give_the_full_state(self):
+        """A client applying every delta to the keyframe has the full state of every tick"""
+
+        async def run():
+            state = self.state
+            reference = snapshot_state(state)
+            client_state = copy.deepcopy(state)
+            for _ in range(300):
+                state, game_over, _ = await self.game.game_logic(state)
+                if game_over:
+                    break
+                delta = state_delta(reference, state)
+                client_state = apply_delta(client_state, delta)
+                self.assertEqual(client_state, state)
+
+        random.seed(3)
+        with patch(
+            "game.gamecoordinator.GameCoordinator.GameCoordinator.set_to_finished_game"
+        ):
+            asyncio.run(run())
+
+
+def advance_test_game(game, steps=1):
+    """advance_game of a create_test_game game, writes queued into a mock pipeline"""
+    with patch(
+        "game.gamecoordinator.GameCoordinator.GameCoordinator.set_to_finished_game"
+    ):
+        return asyncio.run(game.advance_game(steps, MagicMock()))
+
+
+class FrameEncodingTest(TestCase):
+    def setUp(self):
+        self.game, self.game.state = create_test_game({"mode": "regular"})
+
+    def test_frame_encoded_once_per_encoding(self):
+        """One frame per encoding for all clients of its group, also after catch-up steps"""
+        self.game.frame_encodings = {JSON_FRAMES, BINARY_FRAMES}
+        with patch(
+            "game.agame.game_flow.encode_frame", wraps=encode_frame
+        ) as json_encode, patch(
+            "game.agame.game_flow.encode_binary_frame", wraps=encode_binary_frame
+        ) as binary_encode:
+            _, messages = advance_test_game(self.game, steps=3)
+        json_encode.assert_called_once()
+        binary_encode.assert_called_once()
+        self.assertEqual(
+            [self.game.message_group(message) for message in messages],
+            [
+                frame_group(self.game.game_id, JSON_FRAMES),
+                frame_group(self.game.game_id, BINARY_FRAMES),
+            ],
+        )
+        frame = json.loads(messages[0]["frame"])
+        self.assertEqual(frame["type"], "game_state")
+        self.assertEqual(frame["tick"], 3)
+        self.assertEqual(msgpack.unpackb(messages[1]["binary_frame"])["tick"], 3)
+
+    def test_collision_events_inside_frame(self):
+        """A collision goes out inside the frame of its tick, not as a message of its own"""
+        self.game.frame_encodings = {JSON_FRAMES}
+        random.seed(3)
+        for _ in range(300):
+            game_over, messages = advance_test_game(self.game)
+            self.assertFalse(game_over)
+            self.assertEqual([message["type"] for message in messages], ["game_state"])
+            frame = json.loads(messages[0]["frame"])
+            if "events" in frame:
+                break
+        else:
+            self.fail("no collision in 300 ticks")
+        event = frame["events"][0]
+        self.assertEqual(
+            sorted(event),
+            ["ball_index", "side_index", "type", "velocity_x", "velocity_y", "x", "y"],
+        )
+
+    def test_events_of_ticks_without_frame(self):
+        """Events of the ticks between two frames are sent with the next frame"""
+        self.game.frame_encodings = {JSON_FRAMES}
+        self.game.ticks_per_send = 2
+        state = self.game.state
+        events = [
+            {"type": "wall_hit", "ball_index": 0, "side_index": side_index}
+            for side_index in range(2)
+        ]
+
+        async def complete(tick_events):
+            self.game.tick += 1
+            return await self.game.complete_advance(
+                state, False, tick_events, list(state["scores"]), MagicMock()
+            )
+
+        self.assertEqual(asyncio.run(complete(events[:1])), [])
+        messages = asyncio.run(complete(events[1:]))
+        self.assertEqual(json.loads(messages[0]["frame"])["events"], events)
+        self.assertEqual(self.game.pending_events, [])
+
+    def test_no_frame_without_clients(self):
+        """Nothing is encoded while no client is connected"""
+        with patch("game.agame.game_flow.encode_frame") as json_encode:
+            _, messages = advance_test_game(self.game)
+        json_encode.assert_not_called()
+        self.assertEqual(messages, [])
+
+
+class PaddleInputTest(TestCase):
+    def setUp(self):
+        self.game, self.state = create_test_game({"mode": "regular"})
+
+    def test_held_key_velocity(self):
+        """A held key moves the paddle by its speed per second at any tick rate, within the bounds"""
+        speed = 0.6
+        for tick_rate in (60, 120):
+            game, state = create_test_game({"mode": "regular"}, tick_rate=tick_rate)
+            game.apply_paddle_inputs([msgpack.packb((VELOCITY_INPUT, 0, speed, None))])
+            for _ in range(tick_rate // 6):
+                game.move_paddles(state)
+            paddle = next(paddle for paddle in state["paddles"] if paddle["active"])
+            self.assertAlmostEqual(paddle["position"], 0.5 + speed / 6)
+
+        half_length = float(game.settings.get("paddle_length", 0.3)) / 2.0
+        for _ in range(tick_rate):
+            game.move_paddles(state)
+        self.assertAlmostEqual(game.paddle_positions[0], 1.0 - half_length)
+        game.apply_paddle_inputs([msgpack.packb((VELOCITY_INPUT, 0, -speed, None))])
+        for _ in range(3 * tick_rate):
+            game.move_paddles(state)
+        self.assertAlmostEqual(game.paddle_positions[0], half_length)
+
+        # key released: the paddle stays
+        game.apply_paddle_inputs([msgpack.packb((VELOCITY_INPUT, 0, 0.0, None))])
+        self.assertEqual(game.paddle_velocities, {})
+        game.move_paddles(state)
+        self.assertAlmostEqual(game.paddle_positions[0], half_length)
+
+    @skipIf(fakeredis is None, "fakeredis[lua] is not installed")
+    def test_mailbox_limits(self):
+        """The mailbox keeps the newest intents and expires, a tick drains a bounded batch"""
+
+        async def test():
+            redis_conn = fakeredis.FakeAsyncRedis()
+            self.game.redis_conn = redis_conn
+            dropped = 10
+            for seq in range(MAX_QUEUED_INPUTS + dropped):
+                self.assertTrue(await self.game.update_paddle(0, 0.5, seq))
+            self.assertEqual(await redis_conn.llen(self.game.inputs_key), MAX_QUEUED_INPUTS)
+            self.assertTrue(0 < await redis_conn.ttl(self.game.inputs_key) <= INPUTS_EXPIRY)
+
+            pipeline = redis_conn.pipeline(transaction=False)
+            self.game.queue_tick_reads(pipeline)
+            self.game.apply_tick_reads(await pipeline.execute())
+            self.assertEqual(
+                await redis_conn.llen(self.game.inputs_key),
+                MAX_QUEUED_INPUTS - MAX_INPUTS_PER_TICK,
+            )
+            # the oldest intents were trimmed, the drained ones applied in order
+            self.assertEqual(self.game.input_acks[0][0], dropped + MAX_INPUTS_PER_TICK - 1)
+            await redis_conn.aclose()
+
+        asyncio.run(test())
+
+
+@skipIf(fakeredis is None, "fakeredis[lua] is not installed")
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class GameConsumerTest(TestCase):
+    """PongConsumer connections against fakeredis and the in-memory channel layer"""
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        for patcher in (
+            patch.object(
+                RedisPools,
+                "client",
+                side_effect=lambda url, decode_responses: fakeredis.FakeAsyncRedis(
+                    server=self.server, decode_responses=decode_responses
+                ),
+            ),
+            patch.object(GameCoordinator, "refresh_lobby_players", AsyncMock()),
+            # the tests step the game themselves
+            patch.object(AGameManager, "start_game", AsyncMock()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def create_game(self, user_ids):
+        """Game with a booking for each user and its game manager"""
+        game_id = await GameCoordinator.create_new_game(
+            {"mode": "regular", "num_players": len(user_ids)}
+        )
+        for user_id in user_ids:
+            await GameCoordinator.join_game(user_id, game_id)
+        async with await GameCoordinator.get_redis(GameCoordinator.REDIS_GAME_URL) as redis_conn:
+            game_type = await redis_conn.get(f"game_type:{game_id}")
+        game = await AGameManager.get_instance(game_id, game_type)
+        await game.load_game_state()
+        return game
+
+    async def connect(self, game_id, user_id, subprotocols=()):
+        communicator = WebsocketCommunicator(
+            PongConsumer.as_asgi(), f"/ws/game/{game_id}/", subprotocols=list(subprotocols)
+        )
+        communicator.scope["url_route"] = {"kwargs": {"game_id": game_id}}
+        communicator.scope["user"] = SimpleNamespace(
+            id=user_id, username=f"user_{user_id}", is_authenticated=True
+        )
+        connected, subprotocol = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator, subprotocol
+
+    async def receive(self, communicator, message_type):
+        """Next message of a type, binary frames decoded as msgpack, text as JSON"""
+        while True:
+            output = await communicator.receive_output(1)
+            self.assertEqual(output["type"], "websocket.send")
+            if output.get("bytes") is not None:
+                message = msgpack.unpackb(output["bytes"])
+            else:
+                message = json.loads(output["text"])
+            if message["type"] == message_type:
+                return message, output
+
+    async def tick(self, game):
+        """One game loop tick, the messages go out over the channel layer"""
+        pipeline = game.redis_conn.pipeline(transaction=False)
+        game.queue_tick_reads(pipeline)
+        game.apply_tick_reads(await pipeline.execute())
+        pipeline = game.redis_conn.pipeline()
+        _, messages = await game.advance_game(1, pipeline)
+        await pipeline.execute()
+        for message in messages:
+            await game.channel_layer.group_send(game.message_group(message), message)
+        return messages
+
+    def test_msgpack_subprotocol(self):
+        """msgpack clients get binary frames, the others JSON text of the same frame"""
+
+        async def test():
+            user_ids = [str(uuid.uuid4()) for _ in range(2)]
+            game = await self.create_game(user_ids)
+            binary, subprotocol = await self.connect(
+                game.game_id, user_ids[0], [BINARY_SUBPROTOCOL]
+            )
+            self.assertEqual(subprotocol, BINARY_SUBPROTOCOL)
+            text, subprotocol = await self.connect(game.game_id, user_ids[1], ["json"])
+            self.assertIsNone(subprotocol)
+            _, output = await self.receive(binary, "initial_state")
+            self.assertIsNotNone(output.get("bytes"))
+            _, output = await self.receive(text, "initial_state")
+            self.assertIsNotNone(output.get("text"))
+            self.assertEqual(
+                await game.redis_conn.hgetall(game.frame_clients_key),
+                {BINARY_FRAMES.encode(): b"1", JSON_FRAMES.encode(): b"1"},
+            )
+
+            await self.tick(game)
+            binary_frame, output = await self.receive(binary, "game_state")
+            self.assertIsNotNone(output.get("bytes"))
+            text_frame, _ = await self.receive(text, "game_state")
+            self.assertEqual(binary_frame["tick"], text_frame["tick"])
+            for ball, text_ball in zip(
+                binary_frame["game_state"]["balls"], text_frame["game_state"]["balls"]
+            ):
+                # float32 coordinates
+                self.assertAlmostEqual(ball["x"], text_ball["x"], places=5)
+                self.assertAlmostEqual(ball["y"], text_ball["y"], places=5)
+
+            # no binary frames are encoded once the last msgpack client left
+            await binary.disconnect()
+            messages = await self.tick(game)
+            self.assertEqual([sorted(message) for message in messages], [["frame", "type"]])
+            await self.receive(text, "game_delta")
+            await text.disconnect()
+
+        asyncio.run(test())
+
+    def test_stale_input_seq_dropped(self):
+        """Seq numbers not above the last one of the connection are dropped, the acks never go back"""
+
+        async def test():
+            user_ids = [str(uuid.uuid4()) for _ in range(2)]
+            game = await self.create_game(user_ids)
+            communicator, _ = await self.connect(game.game_id, user_ids[0])
+            await self.receive(communicator, "initial_state")
+            await game.redis_conn.set(game.running_key, b"1")
+            for seq in (5, 3, 5, 6, True):
+                await communicator.send_json_to(
+                    {
+                        "action": "paddle_input",
+                        "direction": "right",
+                        "user_id": user_ids[0],
+                        "seq": seq,
+                    }
+                )
+            await communicator.send_json_to(
+                {"action": "paddle_input", "direction": "none", "user_id": user_ids[0]}
+            )
+            # the inputs still apply, without their seq
+            for _ in range(100):
+                inputs = await game.redis_conn.lrange(game.inputs_key, 0, -1)
+                if len(inputs) == 6:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(
+                [msgpack.unpackb(data)[3] for data in inputs], [5, None, None, 6, None, None]
+            )
+
+            game.frame_encodings = {JSON_FRAMES}
+            messages = await self.tick(game)
+            frame = json.loads(messages[0]["frame"])
+            acks = frame["inputs"]
+            self.assertEqual(acks["0"]["seq"], 6)
+            self.assertEqual(acks["0"]["tick"], 1)
+            paddle = next(paddle for paddle in frame["game_state"]["paddles"] if paddle["active"])
+            self.assertEqual(acks["0"]["position"], paddle["position"])
+            await communicator.disconnect()
+
+        asyncio.run(test())
+
+
+@skipIf(fakeredis is None, "fakeredis[lua] is not installed")
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class LobbyConsumerTest(TestCase):
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        patcher = patch.object(
+            RedisPools,
+            "client",
+            side_effect=lambda url, decode_responses: fakeredis.FakeAsyncRedis(
+                server=server, decode_responses=decode_responses
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def connect(self, is_authenticated=True):
+        communicator = WebsocketCommunicator(LobbyConsumer.as_asgi(), "/ws/lobby/")
+        communicator.scope["user"] = SimpleNamespace(is_authenticated=is_authenticated)
+        return communicator, await communicator.connect()
+
+    def test_snapshot_and_updates(self):
+        """The listed games on connect, then the add / update / remove events"""
+
+        async def test():
+            listed = await GameCoordinator.create_new_game({"mode": "regular", "num_players": 2})
+            await GameCoordinator.set_to_waiting_game(listed)
+            created = await GameCoordinator.create_new_game({"mode": "regular", "num_players": 2})
+            lobby, (connected, _) = await self.connect()
+            self.assertTrue(connected)
+            snapshot = await lobby.receive_json_from(1)
+            self.assertEqual(snapshot["type"], "lobby_snapshot")
+            self.assertEqual([game["game_id"] for game in snapshot["games"]], [listed])
+
+            await GameCoordinator.set_to_waiting_game(created)
+            update = await lobby.receive_json_from(1)
+            self.assertEqual(
+                (update["type"], update["event"], update["game_id"]),
+                ("lobby_update", "add", created),
+            )
+            self.assertEqual(update["game"]["status"], "waiting")
+
+            await GameCoordinator.join_game(str(uuid.uuid4()), created)
+            update = await lobby.receive_json_from(1)
+            self.assertEqual((update["event"], update["game_id"]), ("update", created))
+            self.assertEqual(update["game"]["players"]["reserved"], 1)
+
+            await GameCoordinator.set_to_running_game(listed)
+            update = await lobby.receive_json_from(1)
+            self.assertEqual((update["event"], update["game"]["status"]), ("update", "running"))
+            await GameCoordinator.set_to_finished_game(listed)
+            update = await lobby.receive_json_from(1)
+            self.assertEqual(
+                (update["event"], update["game_id"], update["game"]), ("remove", listed, None)
+            )
+            self.assertTrue(await lobby.receive_nothing())
+            await lobby.disconnect()
+
+        asyncio.run(test())
+
+    def test_not_authenticated(self):
+        async def test():
+            lobby, (connected, code) = await self.connect(is_authenticated=False)
+            self.assertFalse(connected)
+            self.assertEqual(code, 4001)
+
+        asyncio.run(test())
+
+
+@skipIf(fakeredis is None, "fakeredis[lua] is not installed")
+class RedisScriptTest(TestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+
+    def run_redis(self, test, decode_responses=True):
+        async def run():
+            redis_conn = fakeredis.FakeAsyncRedis(
+                server=self.server, decode_responses=decode_responses
+            )
+            try:
+                return await test(redis_conn)
+            finally:
+                await redis_conn.aclose()
+
+        return asyncio.run(run())
+
+    def test_live_index_members(self):
+        """Members whose key is gone are returned no more and dropped from the index"""
+
+        async def test(redis_conn):
+            await redis_conn.sadd("bookings:game", "1", "2", "3")
+            await redis_conn.set("booked_1:game", "")
+            await redis_conn.set("booked_3:game", "")
+            live = await GameCoordinator.live_index_members(
+                redis_conn, "bookings:game", "booked_", ":game"
+            )
+            self.assertEqual(sorted(live), ["1", "3"])
+            self.assertEqual(await redis_conn.smembers("bookings:game"), {"1", "3"})
+            self.assertEqual(
+                await GameCoordinator.live_index_members(redis_conn, "missing_index"), []
+            )
+
+        self.run_redis(test)
+
+    def test_live_index_members_binary(self):
+        """Binary connections get the members as bytes"""
+
+        async def test(redis_conn):
+            await redis_conn.sadd("user_invitations:1", "invitation_1:game:2", "invitation_1:old:2")
+            await redis_conn.set("invitation_1:game:2", "1")
+            live = await GameCoordinator.live_index_members(redis_conn, "user_invitations:1")
+            self.assertEqual(live, [b"invitation_1:game:2"])
+
+        self.run_redis(test, decode_responses=False)
+
+    def patch_game_redis(self):
+        """GameCoordinator connections on the fake server"""
+        patcher = patch.object(
+            GameCoordinator,
+            "get_redis",
+            AsyncMock(
+                side_effect=lambda url: fakeredis.FakeAsyncRedis(
+                    server=self.server, decode_responses=True
+                )
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(GameCoordinator, "refresh_lobby_players", AsyncMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_book_slot(self):
+        """Bookings count against the player limit until they expire"""
+        self.patch_game_redis()
+
+        async def test(redis_conn):
+            await redis_conn.set(f"{GameCoordinator.NUM_PLAYERS_PREFIX}:game", "2")
+            self.assertTrue((await GameCoordinator.join_game("1", "game"))["available"])
+            self.assertTrue((await GameCoordinator.join_game("2", "game"))["available"])
+            # booking again keeps the own slot
+            self.assertTrue((await GameCoordinator.join_game("2", "game"))["available"])
+            self.assertEqual((await GameCoordinator.join_game("3", "game"))["status"], 403)
+            await redis_conn.delete(f"{GameCoordinator.BOOKED_USER_PREFIX}1:game")
+            self.assertTrue((await GameCoordinator.join_game("3", "game"))["available"])
+            self.assertEqual(
+                await redis_conn.smembers(f"{GameCoordinator.GAME_BOOKINGS}:game"), {"2", "3"}
+            )
+            self.assertIn(
+                f"{GameCoordinator.BOOKED_USER_PREFIX}3:game",
+                await redis_conn.smembers(f"{GameCoordinator.GAME_KEYS}:game"),
+            )
+            self.assertEqual((await GameCoordinator.join_game("3", "missing"))["status"], 404)
+
+        self.run_redis(test)
+
+    def test_book_slot_changed_index(self):
+        """The script refuses to book against a stale read of the bookings index"""
+
+        async def test(redis_conn):
+            await redis_conn.set(f"{GameCoordinator.NUM_PLAYERS_PREFIX}:game", "2")
+            await redis_conn.sadd(f"{GameCoordinator.GAME_BOOKINGS}:game", "1")
+            book_slot = redis_conn.register_script(GameCoordinator.BOOK_SLOT_SCRIPT)
+            keys = [
+                f"{GameCoordinator.NUM_PLAYERS_PREFIX}:game",
+                "game_players:game",
+                f"{GameCoordinator.GAME_BOOKINGS}:game",
+                f"{GameCoordinator.BOOKED_USER_PREFIX}2:game",
+                f"{GameCoordinator.USER_BOOKINGS}:2",
+                f"{GameCoordinator.GAME_KEYS}:game",
+            ]
+            self.assertEqual(
+                await book_slot(keys=keys, args=["2", "game", 5]),
+                GameCoordinator.BOOKING_INDEX_CHANGED,
+            )
+            self.assertFalse(await redis_conn.exists(keys[3]))
+
+        self.run_redis(test)
+
+    def test_add_player(self):
+        """Booked or invited players take the free sides in order, the others watch"""
+        game, _ = create_test_game({"mode": "regular", "num_players": 2})
+        self.patch_game_redis()
+
+        async def test(redis_conn):
+            game.redis_conn = redis_conn
+            for user_id in ("1", "2", "3"):
+                await redis_conn.set(
+                    f"{GameCoordinator.BOOKED_USER_PREFIX}{user_id}:{game.game_id}", ""
+                )
+            first = await game.add_player("1")
+            self.assertEqual(first["role"], "player")
+            self.assertEqual(first["index"], game.settings["players_sides"][0])
+            self.assertEqual((await game.add_player("1"))["role"], "spectator")
+            self.assertEqual(
+                (await game.add_player("4"))["message"], ADD_PLAYER_ERRORS[NO_BOOKING]
+            )
+            # invited players need no booking
+            invitation = f"{GameCoordinator.INVITATION_PREFIX}5:{game.game_id}:1"
+            await redis_conn.set(invitation, "1")
+            await redis_conn.sadd(f"{GameCoordinator.USER_INVITATIONS}:5", invitation)
+            second = await game.add_player("5")
+            self.assertEqual(second["index"], game.settings["players_sides"][1])
+            self.assertEqual((await game.add_player("2"))["role"], "spectator")
+            self.assertEqual(
+                await redis_conn.get(f"{game.game_id}:side_player:{second['index']}"), b"5"
+            )
+            self.assertEqual(await redis_conn.smembers(game.players_key), {b"1", b"5"})
+            self.assertFalse(
+                await redis_conn.exists(f"{GameCoordinator.BOOKED_USER_PREFIX}1:{game.game_id}")
+            )
+
+        self.run_redis(test, decode_responses=False)
+
+    def test_forfeit(self):
+        """Forfeits go through forfeit_key, a player who joins again clears a pending one"""
+        game, state = create_test_game({"mode": "regular", "num_players": 2})
+        game.channel_layer = AsyncMock()
+        self.patch_game_redis()
+
+        async def test(redis_conn):
+            game.redis_conn = redis_conn
+            await redis_conn.set(game.forfeit_key, 1)
+            await redis_conn.set(f"{GameCoordinator.BOOKED_USER_PREFIX}1:{game.game_id}", "")
+            self.assertEqual((await game.add_player("1"))["role"], "player")
+            self.assertFalse(await redis_conn.exists(game.forfeit_key))
+
+            await redis_conn.set(game.forfeit_key, 1)
+            pipeline = redis_conn.pipeline(transaction=False)
+            game.queue_tick_reads(pipeline)
+            game.apply_tick_reads(await pipeline.execute())
+            self.assertTrue(game.apply_forfeit(state))
+            self.assertEqual(state["scores"][1], 0)
+            self.assertEqual(max(state["scores"]), 11)
+            self.assertFalse(game.apply_forfeit(state))
+
+            # before the start the stored state gets the 0, nothing is left for the loop
+            pregame_state = {"scores": [3, 4]}
+            await redis_conn.set(game.state_key, msgpack.packb(pregame_state))
+            await game._handle_tournament_pregame_leave("1", 1)
+            self.assertEqual(msgpack.unpackb(await redis_conn.get(game.state_key))["scores"], [3, 0])
+            self.assertFalse(await redis_conn.exists(game.forfeit_key))
+
+        self.run_redis(test, decode_responses=False)
+
+    def test_lock_release_by_owner_only(self):
+        """A release after the lock expired does not delete the lock of the next holder"""
+
+        async def test(redis_conn):
+            lock = RedisLock(redis_conn, "test_lock")
+            async with lock:
+                self.assertEqual(await redis_conn.get("test_lock"), lock.token)
+                await redis_conn.set("test_lock", "other_token")
+            self.assertEqual(await redis_conn.get("test_lock"), "other_token")
+            self.assertFalse(await redis_conn.exists("test_lock:wake"))
+
+        self.run_redis(test)
+
+    def test_lock_wakes_waiter(self):
+        """A waiter is woken up by the release, not by the lock expiry"""
+
+        async def test(redis_conn):
+            order = []
+
+            async def holder():
+                async with RedisLock(redis_conn, "test_lock"):
+                    order.append("holder")
+                    await asyncio.sleep(0.1)
+
+            async def waiter():
+                await asyncio.sleep(0.01)
+                async with RedisLock(redis_conn, "test_lock", timeout=2):
+                    order.append("waiter")
+
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(holder(), waiter())
+            self.assertEqual(order, ["holder", "waiter"])
+            self.assertLess(asyncio.get_running_loop().time() - start, 1)
+            self.assertFalse(await redis_conn.exists("test_lock"))
+
+        self.run_redis(test)
+
+    def test_lock_waiters_keep_a_connection_free(self):
+        """Waiters beyond half of the pool poll, the holder can still release"""
+
+        async def test(redis_conn):
+            redis_conn.connection_pool.max_connections = 2
+            order = []
+
+            async def holder():
+                async with RedisLock(redis_conn, "test_lock"):
+                    await asyncio.sleep(0.1)
+                    order.append("released")
+
+            async def waiter(name):
+                await asyncio.sleep(0.01)
+                async with RedisLock(redis_conn, "test_lock", timeout=2):
+                    order.append(name)
+
+            await asyncio.gather(holder(), waiter("first"), waiter("second"))
+            self.assertEqual(order[0], "released")
+            self.assertEqual(sorted(order[1:]), ["first", "second"])
+
+        self.run_redis(test)
+
+    def test_sync_lock_release_by_owner_only(self):
+        redis_conn = fakeredis.FakeRedis(server=self.server, decode_responses=True)
+        lock = RedisSyncLock(redis_conn, "test_lock")
+        with lock:
+            self.assertEqual(redis_conn.get("test_lock"), lock.token)
+            redis_conn.set("test_lock", "other_token")
+        self.assertEqual(redis_conn.get("test_lock"), "other_token")
+        redis_conn.delete("test_lock")
+        with RedisSyncLock(redis_conn, "test_lock"):
+            pass
+        self.assertFalse(redis_conn.exists("test_lock"))
@@ -14,6 +14,8 @@ import logging
 from channels.layers import get_channel_layer
 from ..models import Tournament, TournamentGame, TournamentGameSchedule, Player
 from ..gamecoordinator.GameCoordinator import GameCoordinator
+from ..gamecoordinator.redis_pools import RedisPools
+from ..gamecoordinator.redis_lock import RedisSyncLock
 from django.db.models import Q
 from chat.models import Notification
 
@@ -21,25 +23,6 @@ from chat.models import Notification
 logger = logging.getLogger(__name__)
 
 
-class RedisSyncLock:
-    def __init__(self, redis_conn: redis.Redis, lock_key: str, timeout: int = 10):
-        self.redis_conn = redis_conn
-        self.lock_key = lock_key
-        self.timeout = timeout
-
-    def __enter__(self):
-        start_time = time.time()
-        while True:
-            if self.redis_conn.set(self.lock_key, "1", nx=True, ex=self.timeout):
-                return self
-            if time.time() - start_time > self.timeout:
-                raise TimeoutError(f"Could not acquire lock: {self.lock_key}")
-            time.sleep(0.1)
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.redis_conn.delete(self.lock_key)
-
-
 def send_notification(user, message, url=None):
     try:
         if not url:
@@ -87,7 +70,7 @@ class TournamentManager:
 
     @classmethod
     def get_redis(cls) -> redis:
-        return redis.from_url(cls.REDIS_URL, decode_responses=True)
+        return RedisPools.sync_client(cls.REDIS_URL, decode_responses=True)
 
     @classmethod
     def create_tournament(cls, tournament_data: Dict, game_settings: Dict, creator: Player) -> Dict:
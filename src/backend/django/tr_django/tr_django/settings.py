@@ -142,6 +142,12 @@ TEMPLATES = [
 WSGI_APPLICATION = "tr_django.wsgi.application"
 
 ASGI_APPLICATION = "pong_game.asgi.application"
+# shared redis connection pools of the game app (per url and decode mode),
+# see game/gamecoordinator/redis_pools.py
+REDIS_POOL_MAX_CONNECTIONS = int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "50"))
+# seconds to wait for a free connection of an exhausted pool
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -4,6 +4,11 @@ import { showGameOver } from "./utils.js";
 import { updateGameContext, getGameContext } from "../store/index.js";
 import { updateGameInfo } from "./utils.js";
 import { websocket } from "../views/game2D.js";
+import { applyStateDelta } from "../utils/stateDelta.js";
+
+// state of the last game_state keyframe plus the deltas since, the base of
+// the game_delta messages. Deltas are dropped until the first keyframe.
+let lastGameState = null;
 
 export function handleGameMessage(message, onEvent = null) {
   try {
@@ -14,10 +19,20 @@ export function handleGameMessage(message, onEvent = null) {
 
       case "game_state":
         handleGameState(message, onEvent);
+        handleGameEvents(message.events, onEvent);
         break;
 
-      case "game_event":
-        handleGameEvent(message, onEvent);
+      case "game_delta":
+        if (lastGameState) {
+          handleGameState(
+            {
+              type: "game_state",
+              game_state: applyStateDelta(lastGameState, message.delta),
+            },
+            onEvent
+          );
+        }
+        handleGameEvents(message.events, onEvent);
         break;
 
       case "game_finished":
@@ -40,6 +55,8 @@ export function handleGameMessage(message, onEvent = null) {
 function handleInitialState(message, onEvent) {
   console.log("Initial game state received:", message);
   console.log("onEvent:", onEvent);
+  // the initial state is not a delta base, wait for the next keyframe
+  lastGameState = null;
   // Players are still missing
   updateGameContext(message);
 
@@ -111,6 +128,7 @@ function handleInitialState(message, onEvent) {
 }
 
 function handleGameState(message, onEvent) {
+  lastGameState = message.game_state;
   // Update game state
   updateGameState(message.game_state);
 
@@ -130,24 +148,17 @@ function handleGameState(message, onEvent) {
   }
 }
 
-export function handleGameEvent(message, onEvent) {
-  // Update game state if provided
-  if (message.game_state) {
-    updateGameState(message.game_state);
-  }
-
-  // Update renderer if available
-  // if (renderer?.type) {
-  //   renderer.update(message.game_state);
-  // }
-
+// collision events of a game_state or game_delta frame
+export function handleGameEvents(events = [], onEvent) {
   // Notify through callback
   if (onEvent) {
-    onEvent({
-      type: "game",
-      message: `Game Event: ${message.event_type}`,
-      details: message.details || "",
-    });
+    for (const event of events) {
+      onEvent({
+        type: "game",
+        message: `Game Event: ${event.type}`,
+        details: `ball ${event.ball_index}, side ${event.side_index}`,
+      });
+    }
   }
 }
 
@@ -186,41 +197,41 @@ export function initializeControls(debug = false) {
     console.log("Initializing controls");
   }
 
+  // held-key input: only key press and release are sent, the server
+  // moves the paddle every tick while a key is held
   document.addEventListener("keydown", (event) => {
-    let direction = null;
-    if (event.key === "ArrowLeft" || event.key === "a") {
-      direction = "left";
-    } else if (event.key === "ArrowRight" || event.key === "d") {
-      direction = "right";
+    const direction = keyDirection(event.key);
+    if (direction && direction !== heldDirection) {
+      sendPaddleInput(direction);
     }
-
-    if (direction) {
-      console.log("Sending paddle move:", direction);
-      sendPaddleMove(direction);
+  });
+  document.addEventListener("keyup", (event) => {
+    if (keyDirection(event.key) === heldDirection) {
+      sendPaddleInput("none");
     }
   });
 }
 
-let lastMoveTime = 0;
-const MOVE_COOLDOWN = 0.1; // seconds, should come from player_values
+let heldDirection = "none";
 
-function sendPaddleMove(direction, debug = false) {
-  const gameContext = getGameContext();
-  const currentTime = Date.now() / 1000; // Convert to seconds
-
-  // Check cooldown
-  if (currentTime - lastMoveTime < MOVE_COOLDOWN) {
-    return;
+function keyDirection(key) {
+  if (key === "ArrowLeft" || key === "a") {
+    return "left";
   }
+  if (key === "ArrowRight" || key === "d") {
+    return "right";
+  }
+  return null;
+}
 
-  console.log("gameContext:", gameContext);
+function sendPaddleInput(direction) {
+  const gameContext = getGameContext();
+  heldDirection = direction;
   websocket.sendMessage({
-    action: "move_paddle",
+    action: "paddle_input",
     direction,
     user_id: gameContext.player_id,
   });
-
-  lastMoveTime = currentTime;
 }
 
 // Add error handling in handleGameMessage
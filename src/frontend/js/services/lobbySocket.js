@@ -0,0 +1,59 @@
+let lobbySocket = null;
+
+/**
+ * Connects to the live game list (ws/lobby/), replaces a previous connection.
+ * The server sends a lobby_snapshot with the waiting and running games, then
+ * lobby_update events that add, update or remove one game.
+ *
+ * @param {function(Array<GameInfo>): void} onChange - Called with the current
+ *   games (see fetchWaitingGames) after the snapshot and every update
+ * @returns {WebSocket} The lobby connection
+ */
+export function connectLobby(onChange) {
+  disconnectLobby();
+  const games = new Map();
+
+  lobbySocket = new WebSocket("/ws/lobby/");
+
+  lobbySocket.onmessage = (event) => {
+    try {
+      const message = JSON.parse(event.data);
+      if (message.type === "lobby_snapshot") {
+        games.clear();
+        for (const game of message.games) {
+          games.set(game.game_id, game);
+        }
+      } else if (message.type === "lobby_update") {
+        if (message.event === "remove") {
+          games.delete(message.game_id);
+        } else {
+          games.set(message.game_id, message.game);
+        }
+      } else {
+        return;
+      }
+      // games left by all players stay joinable until expires_at
+      const now = Date.now() / 1000;
+      onChange(
+        [...games.values()].filter(
+          (game) => !game.expires_at || game.expires_at > now
+        )
+      );
+    } catch (error) {
+      console.error("Error processing lobby message:", error);
+    }
+  };
+
+  lobbySocket.onerror = (error) => {
+    console.error("Lobby WebSocket error:", error);
+  };
+
+  return lobbySocket;
+}
+
+export function disconnectLobby() {
+  if (lobbySocket) {
+    lobbySocket.close();
+    lobbySocket = null;
+  }
+}
@@ -8,6 +8,7 @@ import Drawer from "./drawer3d.js";
 import GameUI from "./gameui3d.js";
 import { LOCAL_STORAGE_KEYS } from "../config/constants.js";
 import { showToast } from "./toast.js";
+import { applyStateDelta } from "./stateDelta.js";
 
 export default class GameConstructor {
   constructor() {
@@ -32,6 +33,9 @@ export default class GameConstructor {
     this.config = {};
 
     this.balls = [];
+    // state of the last game_state keyframe plus the deltas since, the base
+    // of the game_delta messages. Deltas are dropped until the first keyframe.
+    this.lastGameState = null;
 
     this.paddles = new Map();
     this.fin1 = null;
@@ -137,14 +141,26 @@ export default class GameConstructor {
     return Math.random().toString(36).substring(2, 15);
   }
 
-  movePaddle(direction) {
+  // held-key input: "left", "right" or "none" on key press and release
+  paddleInput(direction) {
     this.websocket.sendMessage({
-      action: "move_paddle",
+      action: "paddle_input",
       direction,
       user_id: this.userId,
     });
   }
 
+  // collision events of a game_state or game_delta frame
+  playEventSounds(events = []) {
+    for (const event of events) {
+      if (event.type == "paddle_hit") {
+        this.world.audio.playSound("static/sounds/paddle.mp3", 0.3);
+      } else if (event.type == "wall_hit") {
+        this.world.audio.playSound("static/sounds/wall-hit.mp3", 0.5);
+      }
+    }
+  }
+
   handleMessage(message) {
     try {
       switch (message.type) {
@@ -158,6 +174,8 @@ export default class GameConstructor {
           console.log("playerCount: ", this.playerCount);
           this.lastWaitingMessage = Date.now();
           this.createGame(message.game_state);
+          // the initial state is not a delta base, wait for the next keyframe
+          this.lastGameState = null;
 
           if (this.type == "circular") {
             const playerAngle =
@@ -170,17 +188,22 @@ export default class GameConstructor {
           break;
 
         case "game_state":
+          this.lastGameState = message.game_state;
           this.drawer.updateGame(message.game_state);
+          this.playEventSounds(message.events);
           break;
 
-        case "game_event":
-          console.log("game_event", message);
-          if (message.game_state.type == "paddle_hit") {
-            this.world.audio.playSound("static/sounds/paddle.mp3", 0.3);
-          } else if (message.game_state.type == "wall_hit") {
-            this.world.audio.playSound("static/sounds/wall-hit.mp3", 0.5);
+        case "game_delta":
+          if (this.lastGameState) {
+            this.lastGameState = applyStateDelta(
+              this.lastGameState,
+              message.delta
+            );
+            this.drawer.updateGame(this.lastGameState);
           }
+          this.playEventSounds(message.events);
           break;
+
         case "player_joined":
           console.log("player_joined: ", message);
           this.playerNames[message.player_index] = message.player_name;
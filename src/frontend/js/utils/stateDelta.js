@@ -0,0 +1,24 @@
+/**
+ * Applies a game_delta message of the game loop to the last game state.
+ * Balls and paddles come as {index: {field: value}} with the changed fields
+ * only, all other keys as full values. Every game_state message is a
+ * keyframe that replaces the state.
+ * @param {Object} state - The last full game state (not modified)
+ * @param {Object} delta - The delta of a game_delta message
+ * @returns {Object} The new game state
+ */
+export function applyStateDelta(state, delta) {
+  const newState = { ...state };
+  for (const [key, value] of Object.entries(delta)) {
+    if (key === "balls" || key === "paddles") {
+      const items = [...state[key]];
+      for (const [index, changes] of Object.entries(value)) {
+        items[index] = { ...items[index], ...changes };
+      }
+      newState[key] = items;
+    } else {
+      newState[key] = value;
+    }
+  }
+  return newState;
+}
@@ -37,6 +37,7 @@ export default class World {
 
     this.moveUp = false;
     this.moveDown = false;
+    this.heldDirection = "none";
 
     this.mouse = new THREE.Vector2();
   }
@@ -144,12 +145,18 @@ export default class World {
       this.game.fin3.rotation.y = sharkAngle;
     }
 
-    // move paddle
-    if (this.moveDown && websocket) {
-      this.game.movePaddle("right");
-    }
-    if (this.moveUp && websocket) {
-      this.game.movePaddle("left");
+    // move paddle: send the held direction only when it changes
+    if (websocket) {
+      let direction = "none";
+      if (this.moveDown) {
+        direction = "right";
+      } else if (this.moveUp) {
+        direction = "left";
+      }
+      if (direction !== this.heldDirection) {
+        this.game.paddleInput(direction);
+        this.heldDirection = direction;
+      }
     }
 
     // UI
@@ -1,8 +1,5 @@
-import {
-  fetchWaitingGames,
-  joinGame,
-  fetchRunningGames,
-} from "../services/gameService.js";
+import { joinGame, fetchRunningGames } from "../services/gameService.js";
+import { connectLobby, disconnectLobby } from "../services/lobbySocket.js";
 import { showToast } from "../utils/toast.js";
 import { loadGame3D } from "./game3d.js";
 import { loadGameSetupPage } from "./gameSetup.js";
@@ -16,22 +13,33 @@ export async function loadGameList(addToHistory = true) {
       throw new Error("Game list template not found");
     }
 
-    const games = await fetchWaitingGames();
     // const runningGames = await fetchRunningGames();
-    console.log(games);
 
     const mainContent = document.getElementById("main-content");
     mainContent.innerHTML = "";
     mainContent.appendChild(document.importNode(template.content, true));
 
-    generateGameListHTML(games, []);
+    // live game list: snapshot on connect, then the changes
+    connectLobby((games) => {
+      if (!document.querySelector(".game-list")) {
+        // the game list page was left
+        disconnectLobby();
+        return;
+      }
+      generateGameListHTML(
+        games.filter((game) => game.status === "waiting"),
+        []
+      );
+    });
 
     document.querySelector(".create-game-btn").addEventListener("click", () => {
+      disconnectLobby();
       loadGameSetupPage();
     });
     document
       .querySelector(".offline-game-btn")
       .addEventListener("click", () => {
+        disconnectLobby();
         loadGameOffline();
       });
 
@@ -51,6 +59,7 @@ export async function loadGameList(addToHistory = true) {
 
 function generateGameListHTML(games, runningGames) {
   const gameList = document.querySelector(".game-list");
+  gameList.innerHTML = "";
   games.forEach((game, index) => {
     const gameCard = document.createElement("div");
     gameCard.className = "game-card";
@@ -70,6 +79,7 @@ function generateGameListHTML(games, runningGames) {
 `;
     gameCard.addEventListener("click", async () => {
       try {
+        disconnectLobby();
         const result = await joinGame(game.game_id);
         if (game.mode === "circular") {
           loadGame3D(result.ws_url);
@@ -104,6 +114,7 @@ function generateGameListHTML(games, runningGames) {
 `;
     gameCard.addEventListener("click", async () => {
       try {
+        disconnectLobby();
         const result = await joinGame(game.game_id);
         if (game.mode === "circular") {
           loadGame3D(result.ws_url);